@@ -1,30 +1,133 @@
 import asyncio
+import contextvars
+import hashlib
+import json
 import logging
 import os
+import queue
+import re
+import threading
 import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 
 import edge_tts
-import requests
 
+import http_client
 from config import (
+    TTS_CACHE_DIR,
+    TTS_CACHE_MAX_MB,
+    EDGE_TTS_ATTEMPT_TIMEOUT,
+    EDGE_TTS_ENABLED,
     EDGE_TTS_MAX_ATTEMPTS,
+    OPENAI_API_BASE_URL,
     OPENAI_API_KEY,
+    OPENAI_TTS_ATTEMPT_TIMEOUT,
     OPENAI_TTS_MAX_ATTEMPTS,
     OPENAI_TTS_MODEL,
     OPENAI_TTS_VOICE,
+    TTS_CHUNK_CHARS,
+    TTS_CHUNK_CONCURRENCY,
+    TTS_HEDGE_FIRST_BYTE_MS,
     TTS_PITCH,
     TTS_RATE,
     TTS_STYLE_INSTRUCTIONS,
     TTS_VOICE,
     TTS_VOLUME,
 )
+from disk_cache import DiskCache
+import tts_transcript
+from mp3_frames import frame_payload, measure
+from tracing import span
 from tts_normalizer import prepare_tts_text
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-OPENAI_TTS_URL = "https://api.openai.com/v1/audio/speech"
+OPENAI_TTS_URL = f"{OPENAI_API_BASE_URL}/audio/speech"
+# edge_tts always requests audio-24khz-48kbitrate-mono-mp3: constant bitrate, so bytes give the duration.
+EDGE_OUTPUT_BITRATE = 48000
+
+# A sentence with its closing punctuation and quotes, a bare run of punctuation, or a line break.
+_TTS_SENTENCE = re.compile(r"[^。！？；!?;\n]+(?:[。！？；!?;…]+[」』”’）)]*)?|[。！？；!?;…]+[」』”’）)]*|\n+")
+
+# ``(race, provider)`` for the provider thread a ``_ProviderRace`` started; unset outside a race.
+_RACE = contextvars.ContextVar("tts_race", default=None)
+
+
+class _LostRace(Exception):
+    """Another provider already wrote the output."""
+
+
+class _ProviderRace:
+    """
+    TTS providers synthesizing the same output at once.
+
+    The first provider to ``claim`` the output writes it; the others notice
+    ``lost`` at their next check and discard what they have. Edge runs on
+    its own event loop, so its task is also cancelled outright.
+    """
+
+    def __init__(self):
+        self.winner = None
+        self.first_byte = threading.Event()
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._tasks = {}
+
+    def claim(self, provider):
+        with self._lock:
+            if self.winner is None:
+                self.winner = provider
+            return self.winner == provider
+
+    def lost(self, provider):
+        return self.winner not in (None, provider)
+
+    def bind(self, provider, loop, task):
+        with self._lock:
+            self._tasks[provider] = (loop, task)
+
+    def cancel_losers(self):
+        with self._lock:
+            tasks = [(loop, task) for provider, (loop, task) in self._tasks.items() if provider != self.winner]
+        for loop, task in tasks:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # the loop already finished
+
+    def launch(self, provider, synthesize, *args):
+        def run():
+            _RACE.set((self, provider))
+            try:
+                succeeded = bool(synthesize(*args))
+            except Exception as error:
+                logging.error("TTS provider %s crashed: %s: %s", provider, type(error).__name__, error)
+                succeeded = False
+            self.results.put((provider, succeeded))
+
+        thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(run,), name=f"tts-{provider}", daemon=True
+        )
+        thread.start()
+
+
+def _claim_output():
+    """True when the calling provider may write the output: it is not racing, or it is the first to finish."""
+    current = _RACE.get()
+    return current is None or current[0].claim(current[1])
+
+
+def _race_lost():
+    current = _RACE.get()
+    return current is not None and current[0].lost(current[1])
+
+
+def _signal_first_byte():
+    current = _RACE.get()
+    if current is not None:
+        current[0].first_byte.set()
 
 
 def _cleanup_temp_file(temp_path):
@@ -42,8 +145,15 @@ def _cleanup_temp_file(temp_path):
         )
 
 
+def _remove_segment(audio_path):
+    """Remove an intermediate MP3 together with its transcript."""
+    _cleanup_temp_file(audio_path)
+    tts_transcript.remove(audio_path)
+
+
 def _remove_existing_output(output_path):
     """Ensure an old output cannot be mistaken for a successful new run."""
+    tts_transcript.remove(output_path)
     try:
         os.remove(output_path)
     except FileNotFoundError:
@@ -68,24 +178,75 @@ def _validate_temp_file(temp_path):
 
 
 async def _generate_edge_audio(spoken_text, output_path):
+    with span("tts.edge", voice=TTS_VOICE) as edge_span:
+        edge_span.bytes_out = len(spoken_text.encode("utf-8"))
+        succeeded = await _generate_edge_audio_attempts(spoken_text, output_path, edge_span)
+        if succeeded:
+            edge_span.bytes_in = os.path.getsize(output_path)
+        else:
+            edge_span.status = "error"
+        return succeeded
+
+
+async def _stream_edge_audio(communicate, temp_path):
+    """
+    Write Edge TTS audio to ``temp_path`` as it arrives.
+
+    Returns ``(sha256, size, words)``; ``words`` holds the WordBoundary
+    events as ``(offset_ticks, duration_ticks, text)``.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    words = []
+    with open(temp_path, "wb") as audio_file:
+        async for message in communicate.stream():
+            if _race_lost():
+                raise _LostRace()
+            if message["type"] == "audio":
+                if not size:
+                    _signal_first_byte()
+                audio_file.write(message["data"])
+                digest.update(message["data"])
+                size += len(message["data"])
+            elif message["type"] == "WordBoundary":
+                words.append((message["offset"], message["duration"], message["text"]))
+    return digest.hexdigest(), size, words
+
+
+async def _generate_edge_audio_attempts(spoken_text, output_path, edge_span):
     edge_temp_path = f"{output_path}.edge.tmp"
     _cleanup_temp_file(edge_temp_path)
 
     for attempt in range(1, EDGE_TTS_MAX_ATTEMPTS + 1):
+        edge_span.retries = attempt - 1
         try:
+            # Edge opens its own websocket, outside the shared session's request gates.
+            http_client.throttle()
             communicate = edge_tts.Communicate(
                 text=spoken_text,
                 voice=TTS_VOICE,
                 rate=TTS_RATE,
                 volume=TTS_VOLUME,
                 pitch=TTS_PITCH,
+                boundary="WordBoundary",
+            )
+            sha256, size, words = await asyncio.wait_for(
+                _stream_edge_audio(communicate, edge_temp_path), EDGE_TTS_ATTEMPT_TIMEOUT
             )
-            await communicate.save(edge_temp_path)
             _validate_temp_file(edge_temp_path)
+            if not _claim_output():
+                raise _LostRace()
             os.replace(edge_temp_path, output_path)
+            duration_ms = size * 8 * 1000 / EDGE_OUTPUT_BITRATE
+            tts_transcript.save(output_path, tts_transcript.build(spoken_text, duration_ms, words, sha256))
+            edge_span.attributes.update(sha256=sha256, words=len(words), duration_ms=round(duration_ms))
             logging.info("TTS provider used: edge")
             return True
         except Exception as error:
+            if _race_lost():
+                _cleanup_temp_file(edge_temp_path)
+                logging.info("Edge TTS stopped: OpenAI TTS finished first")
+                return False
             logging.warning(
                 "Edge TTS attempt %d/%d failed (voice=%s, rate=%s, "
                 "exception=%s, message=%s)",
@@ -134,6 +295,12 @@ def _log_openai_response_error(response):
     )
 
 
+def _close_response(response):
+    """Release a streamed response once any error body has been logged."""
+    if response is not None:
+        response.close()
+
+
 def _generate_openai_audio(spoken_text, output_path):
     openai_temp_path = f"{output_path}.openai.tmp"
     _cleanup_temp_file(openai_temp_path)
@@ -156,25 +323,45 @@ def _generate_openai_audio(spoken_text, output_path):
 
     for attempt in range(1, OPENAI_TTS_MAX_ATTEMPTS + 1):
         response = None
+        attempt_span = span("tts.openai.attempt", attempt=attempt, model=OPENAI_TTS_MODEL)
         try:
-            response = requests.post(
-                OPENAI_TTS_URL,
-                headers=headers,
-                json=request_data,
-                timeout=120,
-            )
-            response.raise_for_status()
-
-            with open(openai_temp_path, "wb") as audio_file:
-                for chunk in response.iter_content(chunk_size=1024):
-                    if chunk:
-                        audio_file.write(chunk)
-
-            _validate_temp_file(openai_temp_path)
+            with attempt_span as openai_span:
+                openai_span.bytes_out = len(spoken_text.encode("utf-8"))
+                deadline = time.monotonic() + OPENAI_TTS_ATTEMPT_TIMEOUT
+                response = http_client.post(
+                    OPENAI_TTS_URL,
+                    headers=headers,
+                    json=request_data,
+                    timeout=OPENAI_TTS_ATTEMPT_TIMEOUT,
+                    stream=True,
+                )
+                response.raise_for_status()
+
+                with open(openai_temp_path, "wb") as audio_file:
+                    for chunk in response.iter_content(chunk_size=1024):
+                        if _race_lost():
+                            raise _LostRace()
+                        if time.monotonic() > deadline:
+                            raise TimeoutError(
+                                f"OpenAI TTS exceeded its {OPENAI_TTS_ATTEMPT_TIMEOUT}s attempt deadline"
+                            )
+                        if chunk:
+                            audio_file.write(chunk)
+                            openai_span.bytes_in += len(chunk)
+                response.close()
+
+                _validate_temp_file(openai_temp_path)
+            if not _claim_output():
+                raise _LostRace()
             os.replace(openai_temp_path, output_path)
             logging.info("TTS provider used: openai")
             return True
         except Exception as error:
+            if _race_lost():
+                _close_response(response)
+                _cleanup_temp_file(openai_temp_path)
+                logging.info("OpenAI TTS stopped: Edge TTS finished first")
+                return False
             logging.warning(
                 "OpenAI TTS attempt %d/%d failed (model=%s, voice=%s, "
                 "exception=%s, message=%s)",
@@ -186,6 +373,7 @@ def _generate_openai_audio(spoken_text, output_path):
                 str(error),
             )
             _log_openai_response_error(response)
+            _close_response(response)
             _cleanup_temp_file(openai_temp_path)
 
             if attempt < OPENAI_TTS_MAX_ATTEMPTS:
@@ -195,13 +383,307 @@ def _generate_openai_audio(spoken_text, output_path):
                     OPENAI_TTS_MAX_ATTEMPTS,
                 )
                 time.sleep(2)
+                if _race_lost():
+                    return False
 
     logging.error("OpenAI TTS failed after %d attempts", OPENAI_TTS_MAX_ATTEMPTS)
     return False
 
 
-def generate_audio(text, output_path="daily_message.mp3"):
-    """Generate audio with Edge TTS first and OpenAI TTS as a final fallback."""
+def split_tts_chunks(text, max_chars=None):
+    """
+    Split ``text`` into chunks of whole sentences of at most ``max_chars`` characters.
+
+    Chunks break at sentence ends, preferring paragraph breaks; a single
+    sentence longer than ``max_chars`` stays one chunk.
+    """
+    max_chars = max_chars or TTS_CHUNK_CHARS
+    chunks = []
+    current = ""
+    for piece in _TTS_SENTENCE.findall(text):
+        if piece.startswith("\n"):
+            # A paragraph break is the preferred place to cut once a chunk is half full.
+            if current and len(current) >= max_chars // 2:
+                chunks.append(current)
+                current = ""
+            elif current:
+                current += piece
+            continue
+        if current.strip() and len(current.rstrip()) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+    chunks.append(current)
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
+
+
+def tts_cache():
+    return DiskCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024, suffix=".mp3")
+
+
+def tts_transcript_cache():
+    """Transcripts of cached segments, beside them under the same keys."""
+    return DiskCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024 // 20, suffix=tts_transcript.SUFFIX)
+
+
+def tts_cache_key(spoken_text, provider):
+    """Hash of everything that changes the synthesized audio of ``spoken_text`` for ``provider``."""
+    if provider == "edge":
+        settings = (TTS_VOICE, TTS_RATE, TTS_PITCH, TTS_VOLUME, "", "")
+    else:
+        settings = (OPENAI_TTS_VOICE, "", "", "", OPENAI_TTS_MODEL, TTS_STYLE_INSTRUCTIONS)
+    return DiskCache.key_for(spoken_text, provider, *settings)
+
+
+def _restore_cached_segment(cache, key, output_path):
+    audio = cache.get(key)
+    if not audio:
+        return False
+    temp_path = f"{output_path}.cache.tmp"
+    try:
+        with open(temp_path, "wb") as audio_file:
+            audio_file.write(audio)
+        if not _claim_output():
+            _cleanup_temp_file(temp_path)
+            return False
+        os.replace(temp_path, output_path)
+    except OSError as error:
+        logging.warning("Could not restore cached TTS segment to %s: %s", output_path, error)
+        _cleanup_temp_file(temp_path)
+        return False
+    transcript = tts_transcript_cache().get(key)
+    if transcript:
+        try:
+            tts_transcript.save(output_path, json.loads(transcript))
+        except ValueError:
+            tts_transcript.remove(output_path)
+    return True
+
+
+def _store_segment(cache, key, output_path):
+    if not cache.enabled:
+        return
+    try:
+        with open(output_path, "rb") as audio_file:
+            cache.put(key, audio_file.read())
+    except OSError as error:
+        logging.warning("Could not cache TTS segment %s: %s", output_path, error)
+        return
+    transcript = tts_transcript.load(output_path)
+    if transcript:
+        tts_transcript_cache().put(key, json.dumps(transcript, ensure_ascii=False).encode("utf-8"))
+
+
+def _generate_edge_audio_sync(spoken_text, output_path):
+    async def run():
+        current = _RACE.get()
+        if current is not None:
+            current[0].bind(current[1], asyncio.get_running_loop(), asyncio.current_task())
+        return await _generate_edge_audio(spoken_text, output_path)
+
+    try:
+        return asyncio.run(run())
+    except asyncio.CancelledError:
+        _cleanup_temp_file(f"{output_path}.edge.tmp")
+        logging.info("Edge TTS cancelled: OpenAI TTS finished first")
+        return False
+
+
+def _openai_segment(spoken_text, output_path, cache, use_cache=True):
+    if use_cache and _restore_cached_segment(cache, tts_cache_key(spoken_text, "openai"), output_path):
+        with span("tts.cache", provider="openai") as cache_span:
+            cache_span.bytes_in = os.path.getsize(output_path)
+        logging.info("TTS provider used: openai (cached segment)")
+        return True
+    return _generate_openai_audio(spoken_text, output_path)
+
+
+def _race_providers(spoken_text, output_path, cache, use_cache=True):
+    """
+    Edge TTS, hedged with OpenAI TTS; the provider that wrote ``output_path``, or None.
+
+    OpenAI starts when Edge has sent no audio within ``TTS_HEDGE_FIRST_BYTE_MS``
+    (counted across Edge's retries) or when Edge gives up. Whichever provider
+    finishes first with valid audio wins and the other is abandoned.
+    """
+    race = _ProviderRace()
+    hedge_deadline = time.monotonic() + TTS_HEDGE_FIRST_BYTE_MS / 1000
+    with span("tts.providers", first_byte_budget_ms=TTS_HEDGE_FIRST_BYTE_MS) as race_span:
+        launched = set()
+        running = set()
+
+        def start(provider, synthesize, *args):
+            race.launch(provider, synthesize, spoken_text, output_path, *args)
+            launched.add(provider)
+            running.add(provider)
+
+        start("edge", _generate_edge_audio_sync)
+        # A provider claims the output before it writes it, so only its own
+        # (provider, True) report means ``output_path`` is complete.
+        winner = None
+        while running and winner is None:
+            timeout = None
+            if (
+                "openai" not in launched
+                and OPENAI_API_KEY
+                and race.winner is None
+                and not race.first_byte.is_set()
+            ):
+                timeout = max(0.0, hedge_deadline - time.monotonic())
+            try:
+                provider, succeeded = race.results.get(timeout=timeout)
+            except queue.Empty:
+                if race.winner is None and not race.first_byte.is_set():
+                    logging.warning(
+                        "Edge TTS sent no audio within %d ms; starting OpenAI TTS alongside it",
+                        TTS_HEDGE_FIRST_BYTE_MS,
+                    )
+                    race_span.attributes["hedged"] = True
+                    start("openai", _openai_segment, cache, use_cache)
+                continue
+            running.discard(provider)
+            if succeeded and race.claim(provider):
+                winner = provider
+            elif "openai" not in launched and race.winner is None:
+                start("openai", _openai_segment, cache, use_cache)
+        race.cancel_losers()
+        race_span.attributes["winner"] = winner
+        if winner is None:
+            race_span.status = "error"
+    return winner
+
+
+def _synthesize(spoken_text, output_path, use_cache=True):
+    """
+    Synthesize ``spoken_text`` into ``output_path``; the provider that wrote it, or None.
+
+    Edge TTS is raced against OpenAI TTS (see ``_race_providers``). A cached
+    Edge segment is used straight away; a cached OpenAI segment only once
+    OpenAI would be called, so it never replaces Edge audio Edge can still
+    produce. ``use_cache=False`` skips both lookups; the fresh segment still
+    replaces the cached one.
+    """
+    cache = tts_cache()
+    if EDGE_TTS_ENABLED:
+        edge_key = tts_cache_key(spoken_text, "edge")
+        if use_cache and _restore_cached_segment(cache, edge_key, output_path):
+            with span("tts.cache", provider="edge") as cache_span:
+                cache_span.bytes_in = os.path.getsize(output_path)
+            logging.info("TTS provider used: edge (cached segment)")
+            return "edge"
+        provider = _race_providers(spoken_text, output_path, cache, use_cache)
+    else:
+        provider = "openai" if _openai_segment(spoken_text, output_path, cache, use_cache) else None
+    if provider is None:
+        return None
+    _store_segment(cache, tts_cache_key(spoken_text, provider), output_path)
+    return provider
+
+
+def _synthesize_chunk(index, chunk, chunk_path, use_cache=True):
+    """Synthesize one chunk; returns the provider that wrote ``chunk_path``."""
+    with span("tts.chunk", index=index, chars=len(chunk)) as chunk_span:
+        provider = _synthesize(chunk, chunk_path, use_cache)
+        if provider is None:
+            chunk_span.status = "error"
+            raise RuntimeError(f"TTS chunk {index} failed on every provider")
+        chunk_span.attributes["provider"] = provider
+    return provider
+
+
+def _revoice_chunk(index, chunk, chunk_path, use_cache=True):
+    """Replace an Edge chunk with OpenAI audio of the same text; True on success, else the chunk is kept."""
+    revoiced_path = f"{chunk_path}.revoice.mp3"
+    cache = tts_cache()
+    with span("tts.chunk", index=index, chars=len(chunk), provider="openai", revoiced=True) as chunk_span:
+        if not _openai_segment(chunk, revoiced_path, cache, use_cache):
+            chunk_span.status = "error"
+            _remove_segment(revoiced_path)
+            return False
+    _store_segment(cache, tts_cache_key(chunk, "openai"), revoiced_path)
+    try:
+        tts_transcript.remove(chunk_path)
+        os.replace(revoiced_path, chunk_path)
+        if os.path.exists(tts_transcript.path_for(revoiced_path)):
+            os.replace(tts_transcript.path_for(revoiced_path), tts_transcript.path_for(chunk_path))
+    except OSError as error:
+        logging.warning("Could not replace TTS chunk %d with OpenAI audio: %s", index, error)
+        _remove_segment(revoiced_path)
+        return False
+    return True
+
+
+def _generate_chunked_audio(chunks, output_path, use_cache=True):
+    """
+    Synthesize ``chunks`` concurrently and join their frames into ``output_path``.
+
+    Each chunk retries and falls back to OpenAI on its own, so one failure
+    costs one chunk; the first chunk that fails on every provider cancels
+    the chunks not yet started. Chunks already in the TTS segment cache
+    are copied instead of synthesized. Once any chunk falls back to OpenAI,
+    the Edge chunks are synthesized again with OpenAI so the file keeps one
+    voice and bitrate; if that fails, the mixed chunks are joined with a
+    warning rather than failing the audio.
+    """
+    chunk_paths = [f"{output_path}.chunk{index:03d}.mp3" for index in range(len(chunks))]
+    concurrency = min(TTS_CHUNK_CONCURRENCY, len(chunks))
+    with span("tts.chunked", chunks=len(chunks), concurrency=concurrency) as chunked_span:
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tts-chunk")
+        try:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _synthesize_chunk, index, chunk, chunk_path, use_cache)
+                for index, (chunk, chunk_path) in enumerate(zip(chunks, chunk_paths))
+            ]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = [future.exception() for future in done if future.exception()]
+            if failed:
+                for future in futures:
+                    future.cancel()
+                chunked_span.status = "error"
+                logging.error("Chunked TTS failed: %s", failed[0])
+                return False
+            providers = [future.result() for future in futures]
+            edge_chunks = [index for index, provider in enumerate(providers) if provider != "openai"]
+            if edge_chunks and len(edge_chunks) < len(providers):
+                logging.warning(
+                    "%d of %d TTS chunks fell back to OpenAI; re-synthesizing the rest with OpenAI for one voice",
+                    len(providers) - len(edge_chunks),
+                    len(providers),
+                )
+                chunked_span.attributes["revoiced"] = len(edge_chunks)
+                revoiced = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        _revoice_chunk,
+                        index,
+                        chunks[index],
+                        chunk_paths[index],
+                        use_cache,
+                    )
+                    for index in edge_chunks
+                ]
+                if not all(future.result() for future in revoiced):
+                    logging.warning("Could not re-synthesize every TTS chunk with OpenAI; the audio mixes Edge and OpenAI voices")
+            joined = concatenate_audio(chunk_paths, output_path)
+            if not joined:
+                chunked_span.status = "error"
+            return bool(joined)
+        finally:
+            executor.shutdown(wait=True)
+            for chunk_path in chunk_paths:
+                _remove_segment(chunk_path)
+
+
+def generate_audio(text, output_path="daily_message.mp3", use_cache=True):
+    """
+    Generate audio with Edge TTS, hedged by OpenAI TTS when Edge is slow or fails.
+
+    Text longer than ``TTS_CHUNK_CHARS`` is split at sentence boundaries and
+    the chunks are synthesized ``TTS_CHUNK_CONCURRENCY`` at a time, so the
+    wait is set by the longest chunk rather than the whole script.
+    ``use_cache=False`` synthesizes every segment anew instead of copying it
+    from the TTS segment cache.
+    """
     if not isinstance(text, str):
         logging.error("TTS input must be a string; received %s", type(text).__name__)
         return None
@@ -216,12 +698,15 @@ def generate_audio(text, output_path="daily_message.mp3"):
     _cleanup_temp_file(f"{output_path}.edge.tmp")
     _cleanup_temp_file(f"{output_path}.openai.tmp")
 
-    edge_succeeded = asyncio.run(_generate_edge_audio(spoken_text, output_path))
-    if edge_succeeded:
-        return output_path
+    if not EDGE_TTS_ENABLED:
+        logging.info("Edge TTS disabled (EDGE_TTS_ENABLED=false); using OpenAI TTS")
 
-    openai_succeeded = _generate_openai_audio(spoken_text, output_path)
-    if openai_succeeded:
+    chunks = split_tts_chunks(spoken_text)
+    if len(chunks) > 1:
+        succeeded = _generate_chunked_audio(chunks, output_path, use_cache)
+    else:
+        succeeded = _synthesize(spoken_text, output_path, use_cache)
+    if succeeded:
         return output_path
 
     _cleanup_temp_file(f"{output_path}.edge.tmp")
@@ -230,6 +715,154 @@ def generate_audio(text, output_path="daily_message.mp3"):
     return None
 
 
+def concatenate_audio(input_paths, output_path):
+    """
+    Join MP3 files into one file without re-encoding.
+
+    The inputs should share a voice and bitrate; ``_generate_chunked_audio``
+    only joins a mix of Edge and OpenAI audio after logging a warning.
+
+    Frames are copied as they are; ID3 tags and Xing/Info header frames,
+    which describe only their own file, are left out. When the inputs carry
+    transcripts, the joined file gets one merged transcript.
+    """
+    joined_temp_path = f"{output_path}.join.tmp"
+    try:
+        payloads = []
+        transcripts = []
+        for input_path in input_paths:
+            with open(input_path, "rb") as audio_file:
+                payloads.append(frame_payload(audio_file.read()))
+            transcripts.append(tts_transcript.load(input_path))
+        with open(joined_temp_path, "wb") as joined_file:
+            for payload in payloads:
+                joined_file.write(payload)
+        _validate_temp_file(joined_temp_path)
+        os.replace(joined_temp_path, output_path)
+    except Exception as error:
+        logging.error(
+            "Failed to join audio segments into %s: %s: %s",
+            output_path,
+            type(error).__name__,
+            str(error),
+        )
+        _cleanup_temp_file(joined_temp_path)
+        return None
+
+    if any(transcripts):
+        tts_transcript.save(output_path, tts_transcript.merge(
+            (transcript, transcript["duration_ms"] if transcript else _payload_duration_ms(payload))
+            for transcript, payload in zip(transcripts, payloads)
+        ))
+    else:
+        tts_transcript.remove(output_path)
+    return output_path
+
+
+def _payload_duration_ms(payload):
+    try:
+        return measure(payload).duration_ms
+    except ValueError:
+        return 0.0
+
+
+class SentenceAudio:
+    """
+    Synthesize text sentence by sentence while it is still being written.
+
+    ``add`` queues a finished sentence. One worker thread turns everything
+    queued since its previous call into the next segment, so a fast writer
+    yields fewer, longer segments and the worker never falls behind by more
+    than one synthesis call. ``finish`` waits for the last segment and joins
+    the segments into ``output_path``.
+    """
+
+    _DONE = object()
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.segments = []
+        self.failed = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._run,),
+            name="sentence-tts",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def add(self, sentence):
+        if sentence and sentence.strip():
+            self._queue.put(sentence)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _run(self):
+        finished = False
+        while not finished:
+            batch = self._next_batch()
+            finished = self._DONE in batch
+            sentences = [sentence for sentence in batch if sentence is not self._DONE]
+            if not sentences or self.failed:
+                continue
+            segment_path = f"{self.output_path}.part{len(self.segments):03d}.mp3"
+            try:
+                with span("tts.sentence_segment", index=len(self.segments), sentences=len(sentences)):
+                    if generate_audio("\n".join(sentences), segment_path):
+                        self.segments.append(segment_path)
+                    else:
+                        logging.error("Sentence TTS segment %d failed", len(self.segments))
+                        self.failed = True
+            except Exception as error:
+                # Keep draining the queue so ``finish`` sees the failure instead of a short exposition.
+                logging.error(
+                    "Sentence TTS segment %d failed: %s: %s", len(self.segments), type(error).__name__, str(error)
+                )
+                self.failed = True
+                _remove_segment(segment_path)
+
+    def _stop(self):
+        self._queue.put(self._DONE)
+        self._thread.join()
+
+    def _remove_segments(self):
+        for segment_path in self.segments:
+            if segment_path != self.output_path:
+                _remove_segment(segment_path)
+
+    def cancel(self):
+        """Abandon the audio: nothing more is synthesized and finished segments are removed."""
+        self.failed = True
+        self._stop()
+        self._remove_segments()
+
+    def finish(self):
+        """Wait for the remaining sentences and join every segment; returns output_path or None."""
+        self._stop()
+        if self.failed or not self.segments:
+            self._remove_segments()
+            return None
+        try:
+            if len(self.segments) == 1:
+                os.replace(self.segments[0], self.output_path)
+                if os.path.exists(tts_transcript.path_for(self.segments[0])):
+                    os.replace(tts_transcript.path_for(self.segments[0]), tts_transcript.path_for(self.output_path))
+                return self.output_path
+            return concatenate_audio(self.segments, self.output_path)
+        except OSError as error:
+            logging.error("Could not write %s: %s: %s", self.output_path, type(error).__name__, str(error))
+            return None
+        finally:
+            self._remove_segments()
+
+
 if __name__ == "__main__":
     text = """願祂在教會中，並在基督耶穌裡，得著榮耀，直到世世代代，永永遠遠。阿們。
 
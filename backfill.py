@@ -0,0 +1,205 @@
+"""Backfill daily_bible rows and R2 audio for a date range with bounded concurrency."""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import bot
+import http_client
+from config import (
+    BACKFILL_BIBLE_CONCURRENCY,
+    BACKFILL_OPENAI_CONCURRENCY,
+    BACKFILL_RATE_BURST,
+    BACKFILL_RATE_PER_SECOND,
+    BACKFILL_TTS_CONCURRENCY,
+)
+from run_store import RunStore
+from tracing import span
+
+
+class TokenBucket:
+    """Thread-safe token bucket; a backfill takes one token per outbound request."""
+
+    def __init__(self, rate_per_second: float, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate_per_second)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until one token is available, then take it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            self._sleep(wait_seconds)
+
+
+class ServiceLimits:
+    """
+    Per-service concurrency caps for the backfill stages, plus one rate limiter.
+
+    The semaphores bound stage calls; the bucket is installed as an
+    ``http_client`` request gate by ``backfill_range``, so every HTTP request
+    (hedged scrapes, TTS chunks and retries, uploads, Supabase) and every
+    Edge TTS connection takes its own token.
+    """
+
+    def __init__(
+        self,
+        bible: int = BACKFILL_BIBLE_CONCURRENCY,
+        openai: int = BACKFILL_OPENAI_CONCURRENCY,
+        tts: int = BACKFILL_TTS_CONCURRENCY,
+        bucket: TokenBucket = None,
+    ):
+        self._semaphores = {
+            "bible": threading.BoundedSemaphore(bible),
+            "openai": threading.BoundedSemaphore(openai),
+            "tts": threading.BoundedSemaphore(tts),
+        }
+        self.bucket = bucket or TokenBucket(BACKFILL_RATE_PER_SECOND, BACKFILL_RATE_BURST)
+
+    def call(self, service: str, function, *args, **kwargs):
+        with self._semaphores[service]:
+            return function(*args, **kwargs)
+
+
+def date_range(start_date: str, end_date: str) -> list:
+    """Inclusive list of YYYY-MM-DD dates from start_date to end_date."""
+    first = datetime.strptime(start_date, "%Y-%m-%d").date()
+    last = datetime.strptime(end_date, "%Y-%m-%d").date()
+    if last < first:
+        raise ValueError("end date must not be before start date")
+    return [(first + timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+
+def backfill_date(publish_date: str, limits: ServiceLimits, base_dir: str = None,
+                  regenerate: bool = False, publish: bool = True) -> str:
+    """
+    Scrape, write and synthesize one date, then upload and upsert it.
+
+    Stage artifacts are kept in the date's run directory, so rerunning a
+    backfill only repeats the stages that did not finish. ``regenerate``
+    redoes every stage and bypasses the exposition and TTS caches, so the
+    date gets a freshly written exposition and freshly synthesized audio.
+    Returns "ok" or the name of the stage that failed.
+    """
+    store = RunStore(publish_date, base_dir)
+    publish_time = bot._taipei_publish_time(publish_date)
+
+    verse_data = None if regenerate else store.load("verse")
+    if verse_data is None:
+        verse_data = limits.call("bible", bot.get_daily_verse, now=publish_time)
+        if not verse_data:
+            return "verse"
+        store.save("verse", verse_data)
+
+    exposition_artifact = None if regenerate else store.load("exposition")
+    if exposition_artifact is None:
+        exposition = limits.call("openai", bot.generate_exposition, verse_data, use_cache=not regenerate)
+        if not exposition:
+            return "exposition"
+        exposition_artifact = {"exposition": exposition}
+        store.save("exposition", exposition_artifact)
+    exposition = exposition_artifact["exposition"]
+
+    audio_artifact = None if regenerate else store.load("audio")
+    if audio_artifact is None:
+        os.makedirs(store.directory, exist_ok=True)
+        # Same preamble + exposition join as the daily run, so episodes share audio and sections.
+        preamble_path = limits.call(
+            "tts",
+            bot.generate_audio,
+            bot.build_audio_preamble(verse_data),
+            output_path=store.path("preamble.mp3"),
+            use_cache=not regenerate,
+        )
+        audio_path = None
+        if preamble_path:
+            audio_path = limits.call(
+                "tts", bot.generate_audio, exposition, output_path=store.audio_path, use_cache=not regenerate
+            )
+        audio_path, preamble_segments = bot.join_preamble_audio(preamble_path, audio_path)
+        if not audio_path:
+            return "audio"
+        try:
+            audio_artifact = bot.build_audio_artifact(audio_path, preamble_segments)
+        except Exception as e:
+            logging.error(f"{publish_date}: error processing audio: {type(e).__name__}: {e}")
+            return "audio"
+        store.save("audio", audio_artifact)
+
+    if not publish:
+        return "ok"
+
+    upload_artifact = None if regenerate else store.load("upload")
+    if upload_artifact is None:
+        audio_url = bot.upload_audio_to_r2(store.audio_path, publish_date)
+        if not audio_url:
+            return "upload"
+        upload_artifact = {
+            "audio_url": audio_url,
+            "published_at": publish_time.astimezone(timezone.utc).isoformat(),
+        }
+        store.save("upload", upload_artifact)
+
+    # on_conflict=date makes this an upsert, so regenerated dates replace their row.
+    record_id = bot.save_to_supabase(
+        verse_data,
+        exposition,
+        upload_artifact["audio_url"],
+        audio_duration_ms=audio_artifact["audio_duration_ms"],
+        audio_size_bytes=audio_artifact["audio_size_bytes"],
+        podcast_guid=f"daily-bible-{publish_date}",
+        published_at=upload_artifact["published_at"],
+        publish_date=publish_date,
+    )
+    return "ok" if record_id else "supabase"
+
+
+def backfill_range(start_date: str, end_date: str, workers: int = 8, base_dir: str = None,
+                   regenerate: bool = False, publish: bool = True, limits: ServiceLimits = None) -> dict:
+    """Backfill every date in the range concurrently; returns {date: "ok" | failed stage}."""
+    dates = date_range(start_date, end_date)
+    limits = limits or ServiceLimits()
+    logging.info(f"Backfilling {len(dates)} dates from {start_date} to {end_date} with {workers} workers")
+
+    def run_one(publish_date):
+        with span("backfill.date", publish_date=publish_date) as date_span:
+            try:
+                outcome = backfill_date(publish_date, limits, base_dir, regenerate, publish)
+            except Exception as e:
+                logging.error(f"{publish_date}: backfill failed: {type(e).__name__}: {e}")
+                outcome = "error"
+            date_span.attributes["outcome"] = outcome
+            if outcome != "ok":
+                date_span.status = "error"
+            return outcome
+
+    http_client.add_request_gate(limits.bucket.acquire)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as executor:
+            results = dict(zip(dates, executor.map(run_one, dates)))
+    finally:
+        http_client.remove_request_gate(limits.bucket.acquire)
+
+    succeeded = sum(1 for outcome in results.values() if outcome == "ok")
+    logging.info(f"Backfill complete: {succeeded}/{len(results)} dates succeeded")
+    for publish_date, outcome in results.items():
+        if outcome != "ok":
+            logging.error(f"{publish_date}: failed at stage '{outcome}'")
+    return results
@@ -0,0 +1,129 @@
+"""
+Per-page parse benchmark for the Bible.com scraper.
+
+Runs the extraction steps ``get_daily_verse`` applies to each page type —
+verse-of-the-day reference, compare-page CUNP text plus link lookup, and the
+CUNP verse page — and reports the median time and the number of
+BeautifulSoup trees built per page. Pages come from a recorded HTTP cache
+directory (``HTTP_CACHE_MODE=record``) or, without one, from built-in
+synthetic pages sized like real Next.js documents.
+
+使用方式：
+    python benchmark_scraper_parse.py
+    python benchmark_scraper_parse.py --cache-dir runs/http-cache --runs 50
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import time
+from unittest.mock import patch
+
+import scraper
+
+
+# Roughly the size of a live verse-of-the-day document: most of it is __NEXT_DATA__ and markup.
+_FILLER = "".join(
+    f'<div class="ChapterContent_verse__{index}"><span class="label">{index}</span>'
+    f'<span class="content">In the beginning was the Word 太初有道</span></div>'
+    for index in range(1500)
+)
+
+
+def synthetic_pages() -> list:
+    next_data = json.dumps({
+        "props": {"pageProps": {
+            "referenceTitle": {"title": "Ephesians 3:20-21"},
+            "images": [{"renditions": [{"url": f"//imageproxy.youversion.com/{size}.jpg"} for size in range(12)]}],
+            "padding": ["x" * 200] * 400,
+        }}
+    })
+    verse_page = (
+        "<html><head><title>Verse of the Day</title></head><body>"
+        f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+        '<a href="/bible/111/EPH.3.20-21.NIV">Ephesians 3:20-21 (NIV)</a>'
+        f"{_FILLER}</body></html>"
+    )
+    compare_page = (
+        "<html><body><main>"
+        + "".join(f'<a href="/zh-TW/bible/{v}/EPH.3.20-21.V{v}">譯本 {v}</a>' for v in range(60))
+        + '<a href="/zh-TW/bible/46/EPH.3.20-21.CUNP-%E7%A5%9E">新標點和合本，神版</a>'
+        + f"{_FILLER}</main></body></html>"
+    )
+    cunp_page = (
+        '<html><head><meta property="og:description" content="神能照着運行在我們心裏的大力充充足足地成就一切。"></head>'
+        f'<body>{_FILLER}<span data-usfm="EPH.3.20">20 神能照着運行在我們心裏的大力充充足足地成就一切，</span>'
+        '<span data-usfm="EPH.3.21">21 但願他在教會中，並在基督耶穌裏，得着榮耀。</span></body></html>'
+    )
+    return [("verse", verse_page), ("compare", compare_page), ("cunp", cunp_page)]
+
+
+def recorded_pages(cache_dir: str) -> list:
+    pages = []
+    for meta_path in sorted(glob.glob(os.path.join(cache_dir, "*", "*.json"))):
+        with open(meta_path, "r", encoding="utf-8") as meta_file:
+            url = json.load(meta_file)["url"]
+        with open(meta_path[:-len(".json")] + ".body", "rb") as body_file:
+            body = body_file.read().decode("utf-8", errors="replace")
+        if "verse-of-the-day" in url:
+            pages.append(("verse", body))
+        elif "/compare/" in url:
+            pages.append(("compare", body))
+        elif "/bible/" in url:
+            pages.append(("cunp", body))
+    return pages
+
+
+def parse_page(kind: str, html_text: str) -> None:
+    if kind == "verse":
+        scraper._extract_reference_and_data(html_text)
+    elif kind == "compare":
+        page = scraper.ParsedPage(html_text)
+        scraper._extract_cunp_from_compare_page(page)
+        scraper._find_cunp_url(page, "https://www.bible.com/zh-TW/bible/compare/EPH.3.20-21")
+    else:
+        scraper._extract_cunp_text(html_text)
+
+
+def measure(kind: str, html_text: str, runs: int) -> tuple:
+    """Median milliseconds per parse and BeautifulSoup trees built for one parse."""
+    original = scraper.BeautifulSoup
+    builds = []
+
+    def counting_soup(*args, **kwargs):
+        builds.append(1)
+        return original(*args, **kwargs)
+
+    with patch.object(scraper, "BeautifulSoup", counting_soup):
+        parse_page(kind, html_text)
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        parse_page(kind, html_text)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), len(builds)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cache-dir", help="Recorded HTTP cache directory to use as the corpus.")
+    parser.add_argument("--runs", type=int, default=20, help="Timed parses per page (default: 20).")
+    args = parser.parse_args(argv)
+
+    pages = recorded_pages(args.cache_dir) if args.cache_dir else synthetic_pages()
+    if not pages:
+        print(f"No recorded Bible.com pages in {args.cache_dir}")
+        return 1
+
+    print(f"{'page':<10}{'KiB':>8}{'median ms':>12}{'soup builds':>13}")
+    for kind, html_text in pages:
+        median, builds = measure(kind, html_text, args.runs)
+        print(f"{kind:<10}{len(html_text.encode('utf-8')) / 1024:>8.0f}{median:>12.2f}{builds:>13}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""
+Import-time benchmark for the CLI entry points.
+
+Runs each module import in a fresh interpreter with ``python -X importtime``
+and reports the median cumulative import time, so a startup regression shows
+up as a number.
+
+使用方式：
+    python benchmark_startup.py
+    python benchmark_startup.py --runs 9 --max-ms bot=250
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = ("config", "bot", "scraper", "content_gen", "audio_gen")
+_IMPORTTIME_LINE = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s?(\S.*)$")
+
+
+def measure_import_ms(module: str) -> float:
+    """Cumulative import time of ``module`` in a new interpreter, in milliseconds."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (default: 5).")
+    parser.add_argument(
+        "--max-ms",
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="Fail when a module's median import time exceeds this budget.",
+    )
+    args = parser.parse_args(argv)
+    budgets = {name: float(limit) for name, limit in (item.split("=", 1) for item in args.max_ms)}
+
+    exit_code = 0
+    print(f"{'module':<14}{'median ms':>10}{'min ms':>10}{'max ms':>10}")
+    for module in args.modules:
+        samples = [measure_import_ms(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        print(f"{module:<14}{median:>10.1f}{min(samples):>10.1f}{max(samples):>10.1f}")
+        if module in budgets and median > budgets[module]:
+            print(f"❌ {module} import took {median:.1f}ms, budget is {budgets[module]:.1f}ms")
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
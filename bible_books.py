@@ -0,0 +1,110 @@
+"""
+The 66 books of the Protestant canon with the identifiers each source uses.
+
+Book numbers (1-66) are the integer keys of the local verse store; the
+three-letter codes are the USFM/OSIS-style ids Bible.com puts in its URLs
+(``EPH.3.20-21``).
+"""
+
+import re
+
+
+# (number, Bible.com code, English name, Traditional Chinese name, chapters)
+BOOKS = (
+    (1, "GEN", "Genesis", "創世記", 50),
+    (2, "EXO", "Exodus", "出埃及記", 40),
+    (3, "LEV", "Leviticus", "利未記", 27),
+    (4, "NUM", "Numbers", "民數記", 36),
+    (5, "DEU", "Deuteronomy", "申命記", 34),
+    (6, "JOS", "Joshua", "約書亞記", 24),
+    (7, "JDG", "Judges", "士師記", 21),
+    (8, "RUT", "Ruth", "路得記", 4),
+    (9, "1SA", "1 Samuel", "撒母耳記上", 31),
+    (10, "2SA", "2 Samuel", "撒母耳記下", 24),
+    (11, "1KI", "1 Kings", "列王紀上", 22),
+    (12, "2KI", "2 Kings", "列王紀下", 25),
+    (13, "1CH", "1 Chronicles", "歷代志上", 29),
+    (14, "2CH", "2 Chronicles", "歷代志下", 36),
+    (15, "EZR", "Ezra", "以斯拉記", 10),
+    (16, "NEH", "Nehemiah", "尼希米記", 13),
+    (17, "EST", "Esther", "以斯帖記", 10),
+    (18, "JOB", "Job", "約伯記", 42),
+    (19, "PSA", "Psalms", "詩篇", 150),
+    (20, "PRO", "Proverbs", "箴言", 31),
+    (21, "ECC", "Ecclesiastes", "傳道書", 12),
+    (22, "SNG", "Song of Solomon", "雅歌", 8),
+    (23, "ISA", "Isaiah", "以賽亞書", 66),
+    (24, "JER", "Jeremiah", "耶利米書", 52),
+    (25, "LAM", "Lamentations", "耶利米哀歌", 5),
+    (26, "EZK", "Ezekiel", "以西結書", 48),
+    (27, "DAN", "Daniel", "但以理書", 12),
+    (28, "HOS", "Hosea", "何西阿書", 14),
+    (29, "JOL", "Joel", "約珥書", 3),
+    (30, "AMO", "Amos", "阿摩司書", 9),
+    (31, "OBA", "Obadiah", "俄巴底亞書", 1),
+    (32, "JON", "Jonah", "約拿書", 4),
+    (33, "MIC", "Micah", "彌迦書", 7),
+    (34, "NAM", "Nahum", "那鴻書", 3),
+    (35, "HAB", "Habakkuk", "哈巴谷書", 3),
+    (36, "ZEP", "Zephaniah", "西番雅書", 3),
+    (37, "HAG", "Haggai", "哈該書", 2),
+    (38, "ZEC", "Zechariah", "撒迦利亞書", 14),
+    (39, "MAL", "Malachi", "瑪拉基書", 4),
+    (40, "MAT", "Matthew", "馬太福音", 28),
+    (41, "MRK", "Mark", "馬可福音", 16),
+    (42, "LUK", "Luke", "路加福音", 24),
+    (43, "JHN", "John", "約翰福音", 21),
+    (44, "ACT", "Acts", "使徒行傳", 28),
+    (45, "ROM", "Romans", "羅馬書", 16),
+    (46, "1CO", "1 Corinthians", "哥林多前書", 16),
+    (47, "2CO", "2 Corinthians", "哥林多後書", 13),
+    (48, "GAL", "Galatians", "加拉太書", 6),
+    (49, "EPH", "Ephesians", "以弗所書", 6),
+    (50, "PHP", "Philippians", "腓立比書", 4),
+    (51, "COL", "Colossians", "歌羅西書", 4),
+    (52, "1TH", "1 Thessalonians", "帖撒羅尼迦前書", 5),
+    (53, "2TH", "2 Thessalonians", "帖撒羅尼迦後書", 3),
+    (54, "1TI", "1 Timothy", "提摩太前書", 6),
+    (55, "2TI", "2 Timothy", "提摩太後書", 4),
+    (56, "TIT", "Titus", "提多書", 3),
+    (57, "PHM", "Philemon", "腓利門書", 1),
+    (58, "HEB", "Hebrews", "希伯來書", 13),
+    (59, "JAS", "James", "雅各書", 5),
+    (60, "1PE", "1 Peter", "彼得前書", 5),
+    (61, "2PE", "2 Peter", "彼得後書", 3),
+    (62, "1JN", "1 John", "約翰一書", 5),
+    (63, "2JN", "2 John", "約翰二書", 1),
+    (64, "3JN", "3 John", "約翰三書", 1),
+    (65, "JUD", "Jude", "猶大書", 1),
+    (66, "REV", "Revelation", "啟示錄", 22),
+)
+
+BOOK_BY_CODE = {code: number for number, code, _, _, _ in BOOKS}
+CODE_BY_BOOK = {number: code for number, code, _, _, _ in BOOKS}
+BOOK_BY_ENGLISH = {english.lower(): number for number, _, english, _, _ in BOOKS}
+BOOK_BY_ENGLISH["psalm"] = 19
+
+_OSIS = re.compile(r"(?P<code>[1-3A-Z]{3})\.(?P<chapter>\d+)\.(?P<first>\d+)(?:-(?P<last>\d+))?")
+_VERSES = re.compile(r"(?P<chapter>\d+):(?P<first>\d+)(?:-(?P<last>\d+))?")
+
+
+def parse_osis(osis_reference: str):
+    """``"EPH.3.20-21"`` → ``(49, 3, 20, 21)``; None for unknown books or cross-chapter ranges."""
+    match = _OSIS.fullmatch((osis_reference or "").strip().upper())
+    if not match or match.group("code") not in BOOK_BY_CODE:
+        return None
+    first = int(match.group("first"))
+    last = int(match.group("last") or first)
+    if last < first:
+        return None
+    return BOOK_BY_CODE[match.group("code")], int(match.group("chapter")), first, last
+
+
+def osis_from_reference(english_book: str, verses_ref: str) -> str:
+    """``("Ephesians", "3:20-21")`` → ``"EPH.3.20-21"``; empty when it cannot be expressed."""
+    number = BOOK_BY_ENGLISH.get(english_book.strip().lower())
+    match = _VERSES.fullmatch(verses_ref.strip())
+    if not number or not match:
+        return ""
+    osis = f"{CODE_BY_BOOK[number]}.{match.group('chapter')}.{match.group('first')}"
+    return f"{osis}-{match.group('last')}" if match.group("last") else osis
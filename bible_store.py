@@ -0,0 +1,129 @@
+"""
+Local SQLite verse store keyed by integer (translation, book, chapter, verse).
+
+``get_daily_verse`` reads the verse text from here as soon as the OSIS
+reference is known, so a normal run needs no request for the text itself.
+The store is filled in bulk by ``build_bible_store.py`` and learns single
+verses from successful network lookups.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+
+from bible_books import parse_osis
+import config
+
+
+# Preferred translation first; mirrors the CUNP-over-CUV order of the network sources.
+TRANSLATIONS = ("CUNP", "CUV")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verses (
+    translation TEXT NOT NULL,
+    book INTEGER NOT NULL,
+    chapter INTEGER NOT NULL,
+    verse INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (translation, book, chapter, verse)
+) WITHOUT ROWID
+"""
+
+_write_lock = threading.Lock()
+
+
+class BibleStore:
+    """Verse lookups and writes against one SQLite file; safe to share between threads."""
+
+    def __init__(self, path: str = None):
+        self.path = config.BIBLE_STORE_PATH if path is None else path
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self, create: bool = False):
+        if not self.enabled or (not create and not os.path.isfile(self.path)):
+            return None
+        if create:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        if create:
+            connection.execute(_SCHEMA)
+        return connection
+
+    def lookup(self, osis_reference: str, translation: str = "CUNP") -> str:
+        """Text of the whole reference, verses joined by a space; empty unless every verse is stored."""
+        parsed = parse_osis(osis_reference)
+        connection = self._connect() if parsed else None
+        if connection is None:
+            return ""
+        book, chapter, first, last = parsed
+        try:
+            with connection:
+                rows = connection.execute(
+                    "SELECT verse, text FROM verses WHERE translation = ? AND book = ? AND chapter = ?"
+                    " AND verse BETWEEN ? AND ? ORDER BY verse",
+                    (translation, book, chapter, first, last),
+                ).fetchall()
+        except sqlite3.Error as error:
+            logging.warning("Bible store lookup failed for %s: %s", osis_reference, error)
+            return ""
+        finally:
+            connection.close()
+        if len(rows) != last - first + 1:
+            return ""
+        return " ".join(text for _, text in rows)
+
+    def lookup_preferred(self, osis_reference: str) -> tuple:
+        """First stored translation in preference order: (text, translation) or ("", "")."""
+        for translation in TRANSLATIONS:
+            text = self.lookup(osis_reference, translation)
+            if text:
+                return text, translation
+        return "", ""
+
+    def add_verses(self, rows, translation: str) -> int:
+        """Insert or replace ``(book, chapter, verse, text)`` rows; returns the number written."""
+        rows = [(translation, book, chapter, verse, text.strip()) for book, chapter, verse, text in rows if text.strip()]
+        if not rows:
+            return 0
+        with _write_lock:
+            connection = self._connect(create=True)
+            if connection is None:
+                return 0
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO verses (translation, book, chapter, verse, text) VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            finally:
+                connection.close()
+        return len(rows)
+
+    def learn(self, osis_reference: str, text: str, translation: str) -> bool:
+        """Store network text for a single-verse reference; ranges cannot be split reliably and are skipped."""
+        parsed = parse_osis(osis_reference)
+        if not parsed or parsed[2] != parsed[3]:
+            return False
+        book, chapter, verse, _ = parsed
+        try:
+            return self.add_verses([(book, chapter, verse, text)], translation) == 1
+        except (OSError, sqlite3.Error) as error:
+            logging.warning("Could not store %s in the Bible store: %s", osis_reference, error)
+            return False
+
+    def count(self, translation: str = None) -> int:
+        connection = self._connect()
+        if connection is None:
+            return 0
+        try:
+            if translation:
+                query = ("SELECT COUNT(*) FROM verses WHERE translation = ?", (translation,))
+            else:
+                query = ("SELECT COUNT(*) FROM verses", ())
+            return connection.execute(*query).fetchone()[0]
+        finally:
+            connection.close()
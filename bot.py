@@ -1,45 +1,81 @@
-import requests
+import argparse
+import http_client
 import logging
 import json
 import os
+import sys
 import uuid
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from urllib.parse import quote
-from config import (
-    LINE_CHANNEL_ACCESS_TOKEN, 
-    TELEGRAM_BOT_TOKEN, 
-    TELEGRAM_CHAT_IDS,
-    SUPABASE_URL,
-    SUPABASE_SERVICE_KEY,
-    VAPID_PRIVATE_KEY,
-    VAPID_PUBLIC_KEY,
-    AUDIO_UPLOAD_URL,
-    AUDIO_UPLOAD_SECRET,
-    R2_PUBLIC_BASE_URL,
-    DRY_RUN,
-    RUN_MODE,
-    TELEGRAM_TEST_CHAT_ID,
-)
-from scraper import get_daily_verse
-from content_gen import generate_exposition
-from audio_gen import generate_audio
+# Settings are read as config.<NAME> at call time, so importing bot reads no .env
+# and reload_settings() is seen by the next call.
+import config
+from config import warn_missing_settings
+from run_store import PIPELINE_STAGES, RunStore
+import tracing
+import tts_transcript
+from tracing import span, traced
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+# Stage entry points. The scraper (bs4), content and audio (edge_tts) modules
+# are imported on first use so CLI helpers and delivery-only runs skip them.
+def get_daily_verse(now=None):
+    from scraper import get_daily_verse as scrape_daily_verse
+    return scrape_daily_verse(now=now)
+
+
+def refresh_verse_calendar(now=None):
+    from scraper import refresh_calendar_day
+    return refresh_calendar_day(now)
+
+
+def generate_exposition(verse_data, use_cache=None):
+    from content_gen import generate_exposition as write_exposition
+    return write_exposition(verse_data, use_cache=use_cache)
+
+
+def generate_expositions_in_batch(verses):
+    from exposition_batch import run_batch
+    return run_batch(verses)
+
+
+def stream_exposition(verse_data, on_sentence):
+    from content_gen import stream_exposition as write_exposition_streaming
+    return write_exposition_streaming(verse_data, on_sentence)
+
+
+def start_sentence_audio(output_path):
+    from audio_gen import SentenceAudio
+    return SentenceAudio(output_path)
+
+
+def generate_audio(text, output_path="daily_message.mp3", use_cache=True):
+    from audio_gen import generate_audio as synthesize_audio
+    return synthesize_audio(text, output_path, use_cache=use_cache)
+
+
+def concatenate_audio(input_paths, output_path):
+    from audio_gen import concatenate_audio as join_audio
+    return join_audio(input_paths, output_path)
+
+
 def broadcast_message(messages):
     """
     Broadcasts messages to all users using LINE Messaging API.
     """
-    if not LINE_CHANNEL_ACCESS_TOKEN:
+    if not config.LINE_CHANNEL_ACCESS_TOKEN:
         logging.error("LINE_CHANNEL_ACCESS_TOKEN is not set.")
         return False
 
-    url = "https://api.line.me/v2/bot/message/broadcast"
+    url = f"{config.LINE_API_BASE_URL}/v2/bot/message/broadcast"
     headers = {
         "Content-Type": "application/json",
-        "Authorization": f"Bearer {LINE_CHANNEL_ACCESS_TOKEN}",
+        "Authorization": f"Bearer {config.LINE_CHANNEL_ACCESS_TOKEN}",
         "X-Line-Retry-Key": str(uuid.uuid4())
     }
     data = {
@@ -47,7 +83,7 @@ def broadcast_message(messages):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        response = http_client.post(url, headers=headers, json=data, timeout=30)
         response.raise_for_status()
         logging.info("Successfully broadcasted messages.")
         return True
@@ -69,11 +105,11 @@ def push_to_telegram_chat(chat_id: str, text: str, audio_url: str = None) -> boo
     Returns:
         True if successful, False otherwise
     """
-    if not TELEGRAM_BOT_TOKEN:
+    if not config.TELEGRAM_BOT_TOKEN:
         logging.error("TELEGRAM_BOT_TOKEN is not set.")
         return False
 
-    base_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
+    base_url = f"{config.TELEGRAM_API_BASE_URL}/bot{config.TELEGRAM_BOT_TOKEN}"
     
     try:
         # Send text message with Markdown formatting
@@ -83,7 +119,7 @@ def push_to_telegram_chat(chat_id: str, text: str, audio_url: str = None) -> boo
             "text": text,
             "parse_mode": "Markdown"
         }
-        response = requests.post(text_url, json=text_data, timeout=30)
+        response = http_client.post(text_url, json=text_data, timeout=30)
         response.raise_for_status()
         logging.info(f"Successfully sent text to Telegram chat: {chat_id}")
         
@@ -95,7 +131,7 @@ def push_to_telegram_chat(chat_id: str, text: str, audio_url: str = None) -> boo
                 "audio": audio_url,
                 "title": "每日靈修"
             }
-            audio_response = requests.post(audio_url_endpoint, json=audio_data, timeout=60)
+            audio_response = http_client.post(audio_url_endpoint, json=audio_data, timeout=60)
             audio_response.raise_for_status()
             logging.info(f"Successfully sent audio to Telegram chat: {chat_id}")
         
@@ -109,18 +145,18 @@ def push_to_telegram_chat(chat_id: str, text: str, audio_url: str = None) -> boo
 
 def send_full_test_to_telegram(chat_id: str, text: str, audio_path: str) -> bool:
     """Send full-flow test text and a local MP3 only to the configured test chat."""
-    if not TELEGRAM_TEST_CHAT_ID:
+    if not config.TELEGRAM_TEST_CHAT_ID:
         logging.error("Full test Telegram send refused: TELEGRAM_TEST_CHAT_ID is not set.")
         return False
 
-    if chat_id.strip() != TELEGRAM_TEST_CHAT_ID:
+    if chat_id.strip() != config.TELEGRAM_TEST_CHAT_ID:
         logging.error(
             "Full test Telegram send refused: the destination must match "
             "TELEGRAM_TEST_CHAT_ID."
         )
         return False
 
-    if not TELEGRAM_BOT_TOKEN:
+    if not config.TELEGRAM_BOT_TOKEN:
         logging.error("Full test Telegram send refused: TELEGRAM_BOT_TOKEN is not set.")
         return False
 
@@ -131,10 +167,10 @@ def send_full_test_to_telegram(chat_id: str, text: str, audio_path: str) -> bool
         )
         return False
 
-    base_url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
+    base_url = f"{config.TELEGRAM_API_BASE_URL}/bot{config.TELEGRAM_BOT_TOKEN}"
 
     try:
-        message_response = requests.post(
+        message_response = http_client.post(
             f"{base_url}/sendMessage",
             data={
                 "chat_id": chat_id,
@@ -163,7 +199,7 @@ def send_full_test_to_telegram(chat_id: str, text: str, audio_path: str) -> bool
             return False
 
         with open(audio_path, "rb") as audio_file:
-            audio_response = requests.post(
+            audio_response = http_client.post(
                 f"{base_url}/sendAudio",
                 data={
                     "chat_id": chat_id,
@@ -211,43 +247,56 @@ def send_full_test_to_telegram(chat_id: str, text: str, audio_path: str) -> bool
         return False
 
 
-def push_to_all_telegram_chats(text: str, audio_url: str = None) -> dict:
+def push_to_all_telegram_chats(text: str, audio_url: str = None, chat_ids: list = None) -> dict:
     """
     Push messages to all configured Telegram chats.
+
+    Chats are sent concurrently, at most TELEGRAM_PUSH_CONCURRENCY at a time.
+    Pass chat_ids to send to a subset, e.g. only the chats that failed before.
     
     Returns:
         Dictionary with chat_id as key and success status as value
     """
     results = {}
+    chat_ids = config.TELEGRAM_CHAT_IDS if chat_ids is None else chat_ids
     
-    if not TELEGRAM_CHAT_IDS:
+    if not chat_ids:
         logging.warning("No Telegram chat IDs configured. Set TELEGRAM_CHAT_IDS in .env file.")
         return results
     
-    for chat_id in TELEGRAM_CHAT_IDS:
-        success = push_to_telegram_chat(chat_id, text, audio_url)
-        results[chat_id] = success
+    with ThreadPoolExecutor(
+        max_workers=config.TELEGRAM_PUSH_CONCURRENCY,
+        thread_name_prefix="telegram",
+    ) as executor:
+        successes = executor.map(
+            lambda chat_id: push_to_telegram_chat(chat_id, text, audio_url),
+            chat_ids,
+        )
+        for chat_id, success in zip(chat_ids, successes):
+            results[chat_id] = success
     
     return results
 
 
+@traced("r2.upload")
 def upload_audio_to_r2(audio_path: str, publish_date: str) -> str:
     """
     Uploads the generated MP3 through the Cloudflare Worker R2 upload endpoint.
     """
-    if not all([AUDIO_UPLOAD_URL, AUDIO_UPLOAD_SECRET, R2_PUBLIC_BASE_URL]):
+    if not all([config.AUDIO_UPLOAD_URL, config.AUDIO_UPLOAD_SECRET, config.R2_PUBLIC_BASE_URL]):
         logging.error("Audio upload configuration is not fully set. Skipping audio upload.")
         return None
 
     object_key = f"daily-bible/{publish_date.replace('-', '/')}/daily-message.mp3"
-    upload_url = f"{AUDIO_UPLOAD_URL.rstrip('/')}/{quote(object_key, safe='/')}"
+    upload_url = f"{config.AUDIO_UPLOAD_URL.rstrip('/')}/{quote(object_key, safe='/')}"
 
     try:
+        tracing.current_span().bytes_out = os.path.getsize(audio_path)
         with open(audio_path, "rb") as audio_file:
-            response = requests.put(
+            response = http_client.put(
                 upload_url,
                 headers={
-                    "Authorization": f"Bearer {AUDIO_UPLOAD_SECRET}",
+                    "Authorization": f"Bearer {config.AUDIO_UPLOAD_SECRET}",
                     "Content-Type": "audio/mpeg",
                 },
                 data=audio_file,
@@ -257,7 +306,7 @@ def upload_audio_to_r2(audio_path: str, publish_date: str) -> str:
         result = response.json()
         public_url = result.get(
             "url",
-            f"{R2_PUBLIC_BASE_URL.rstrip('/')}/{quote(object_key, safe='/')}",
+            f"{config.R2_PUBLIC_BASE_URL.rstrip('/')}/{quote(object_key, safe='/')}",
         )
         logging.info(f"Audio uploaded to R2: {public_url}")
         return public_url
@@ -282,7 +331,7 @@ def save_to_supabase(
     儲存每日內容至 Supabase
     Returns: 新建立的記錄 ID，失敗則返回 None
     """
-    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+    if not config.SUPABASE_URL or not config.SUPABASE_SERVICE_KEY:
         logging.warning("Supabase credentials not set. Skipping save.")
         return None
     
@@ -300,11 +349,11 @@ def save_to_supabase(
     }
     
     try:
-        response = requests.post(
-            f"{SUPABASE_URL}/rest/v1/daily_bible?on_conflict=date",
+        response = http_client.post(
+            f"{config.SUPABASE_URL}/rest/v1/daily_bible?on_conflict=date",
             headers={
-                "apikey": SUPABASE_SERVICE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+                "apikey": config.SUPABASE_SERVICE_KEY,
+                "Authorization": f"Bearer {config.SUPABASE_SERVICE_KEY}",
                 "Content-Type": "application/json",
                 "Prefer": "resolution=merge-duplicates,return=representation"
             },
@@ -325,40 +374,46 @@ def save_to_supabase(
         return None
 
 
-def send_web_push_notifications(title: str, body: str, url: str = None):
+# Push services are always HTTPS; plain HTTP is only accepted on loopback so
+# the local stand-in push service can be load-tested.
+_WEB_PUSH_ENDPOINT_PREFIXES = ("https://", "http://127.0.0.1:", "http://localhost:")
+
+
+def send_web_push_notifications(title: str, body: str, url: str = None) -> int:
     """
     發送 Web Push 通知給所有訂閱者
+    Returns: 成功送出的通知數量
     """
-    if not all([SUPABASE_URL, SUPABASE_SERVICE_KEY, VAPID_PRIVATE_KEY]):
+    if not all([config.SUPABASE_URL, config.SUPABASE_SERVICE_KEY, config.VAPID_PRIVATE_KEY]):
         logging.warning("Web Push credentials not set. Skipping push notifications.")
-        return
+        return 0
     
     try:
         from pywebpush import webpush, WebPushException
     except ImportError:
         logging.warning("pywebpush not installed. Skipping push notifications.")
-        return
+        return 0
     
     # 從 Supabase 取得所有訂閱者
     try:
-        response = requests.get(
-            f"{SUPABASE_URL}/rest/v1/push_subscribers?select=subscription",
+        response = http_client.get(
+            f"{config.SUPABASE_URL}/rest/v1/push_subscribers?select=subscription",
             headers={
-                "apikey": SUPABASE_SERVICE_KEY,
-                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}"
+                "apikey": config.SUPABASE_SERVICE_KEY,
+                "Authorization": f"Bearer {config.SUPABASE_SERVICE_KEY}"
             },
             timeout=30
         )
         
         if response.status_code != 200:
             logging.error(f"Failed to get subscribers: {response.text}")
-            return
+            return 0
         
         subscribers = response.json()
         
         if not subscribers:
             logging.info("No push subscribers found.")
-            return
+            return 0
         
         logging.info(f"Sending push notifications to {len(subscribers)} subscribers")
         
@@ -369,13 +424,12 @@ def send_web_push_notifications(title: str, body: str, url: str = None):
             "body": body[:100] + "..." if len(body) > 100 else body,
             "url": url or "https://tokpmpm.github.io/daily-bible-bot/"
         })
-        
-        success_count = 0
-        for sub in subscribers:
+
+        def send_one(sub) -> bool:
             subscription = sub['subscription']
             endpoint = subscription.get('endpoint', '')
-            if not endpoint or not endpoint.startswith('https://'):
-                continue
+            if not endpoint or not endpoint.startswith(_WEB_PUSH_ENDPOINT_PREFIXES):
+                return False
             
             parsed = urlparse(endpoint)
             aud = f'{parsed.scheme}://{parsed.netloc}'
@@ -384,86 +438,392 @@ def send_web_push_notifications(title: str, body: str, url: str = None):
                 webpush(
                     subscription_info=subscription,
                     data=payload,
-                    vapid_private_key=VAPID_PRIVATE_KEY,
+                    vapid_private_key=config.VAPID_PRIVATE_KEY,
                     vapid_claims={
                         "sub": "mailto:daily-bible@example.com",
                         "aud": aud
-                    }
+                    },
+                    requests_session=http_client.get_session(),
                 )
-                success_count += 1
+                return True
             except WebPushException as e:
                 logging.warning(f"Failed to send push: {e}")
                 # 如果訂閱已失效，可以從資料庫刪除
                 if e.response and e.response.status_code in [404, 410]:
                     logging.info("Subscription expired, should be removed")
+                return False
+
+        with ThreadPoolExecutor(
+            max_workers=config.WEB_PUSH_CONCURRENCY,
+            thread_name_prefix="web-push",
+        ) as executor:
+            success_count = sum(executor.map(send_one, subscribers))
         
         logging.info(f"Web Push complete: {success_count}/{len(subscribers)} succeeded")
+        return success_count
         
     except Exception as e:
         logging.error(f"Error sending web push: {e}")
+        return 0
+
+
+def deliver_to_channels(
+    verse_data: dict,
+    exposition: str,
+    messages: list,
+    audio_url: str,
+    audio_duration: int = 0,
+    audio_size_bytes: int = 0,
+    podcast_guid: str = "",
+    published_at: str = "",
+    publish_date: str = "",
+    previous_receipts: dict = None,
+) -> dict:
+    """
+    Fan out the finished content to every delivery channel concurrently.
+
+    LINE, Telegram and the Supabase record are independent and run side by
+    side; Web Push is chained after Supabase because subscribers are only
+    notified once the record exists. Per-channel limits are applied inside
+    push_to_all_telegram_chats and send_web_push_notifications.
+
+    previous_receipts comes from an earlier, partially failed run: channels
+    (and Telegram chats) that already succeeded are not sent again.
+
+    Returns:
+        Dictionary of delivery receipts keyed by channel name
+    """
+    previous_receipts = previous_receipts or {}
+    receipts = {}
+
+    @traced("deliver.line")
+    def deliver_line():
+        if previous_receipts.get("line") is True:
+            logging.info("LINE broadcast already delivered for this run. Skipping.")
+            return True
+        if config.LINE_CHANNEL_ACCESS_TOKEN and config.LINE_CHANNEL_ACCESS_TOKEN != "your_line_channel_access_token":
+            return broadcast_message(messages)
+        logging.info("LINE_CHANNEL_ACCESS_TOKEN not set or invalid. Messages not sent.")
+        print("=== Message Content ===")
+        print(json.dumps(messages, indent=2, ensure_ascii=False))
+        return None
+
+    @traced("deliver.telegram")
+    def deliver_telegram():
+        if not config.TELEGRAM_CHAT_IDS:
+            logging.info("No Telegram chats configured.")
+            return {}
+        delivered = previous_receipts.get("telegram") or {}
+        pending = [chat_id for chat_id in config.TELEGRAM_CHAT_IDS if delivered.get(chat_id) is not True]
+        telegram_results = {chat_id: True for chat_id in config.TELEGRAM_CHAT_IDS if chat_id not in pending}
+        if not pending:
+            logging.info("Telegram push already delivered to all chats for this run. Skipping.")
+            return telegram_results
+        # Format text for Telegram (Markdown)
+        telegram_text = f"📖 *每日靈修*\n\n{verse_data['text']}\n\n{exposition}"
+        telegram_results.update(push_to_all_telegram_chats(telegram_text, audio_url, pending))
+        telegram_success_count = sum(1 for v in telegram_results.values() if v)
+        logging.info(f"Telegram push complete: {telegram_success_count}/{len(telegram_results)} chats succeeded")
+        return telegram_results
+
+    def deliver_supabase_then_web_push():
+        record_id = previous_receipts.get("supabase")
+        saved_audio_url = previous_receipts.get("supabase_audio_url")
+        if record_id and (saved_audio_url or not audio_url):
+            logging.info(f"Content already saved to Supabase with ID: {record_id}. Skipping.")
+        else:
+            if record_id:
+                logging.info(f"Supabase record {record_id} was saved without audio. Saving it again with {audio_url}.")
+            with span("deliver.supabase"):
+                record_id = save_to_supabase(
+                    verse_data,
+                    exposition,
+                    audio_url,
+                    audio_duration_ms=audio_duration,
+                    audio_size_bytes=audio_size_bytes,
+                    podcast_guid=podcast_guid,
+                    published_at=published_at,
+                    publish_date=publish_date,
+                )
+            if not record_id:
+                return record_id, None, None
+            saved_audio_url = audio_url
+            logging.info(f"Content saved to Supabase with ID: {record_id}")
+        # A count of 0 also covers a failed subscriber lookup, so only a sent push counts as delivered.
+        if previous_receipts.get("web_push"):
+            logging.info("Web Push already sent for this run. Skipping.")
+            return record_id, previous_receipts["web_push"], saved_audio_url
+        with span("deliver.web_push") as web_push_span:
+            web_push_count = send_web_push_notifications(
+                title="📖 今日靈修",
+                body=f"{verse_data['reference']}: {verse_data['text'][:50]}...",
+                url="https://tokpmpm.github.io/daily-bible-bot/"
+            )
+            web_push_span.attributes["sent"] = web_push_count
+        return record_id, web_push_count, saved_audio_url
+
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="delivery") as executor:
+        futures = {
+            "line": executor.submit(deliver_line),
+            "telegram": executor.submit(deliver_telegram),
+            "supabase": executor.submit(deliver_supabase_then_web_push),
+        }
+        for channel, future in futures.items():
+            try:
+                receipts[channel] = future.result()
+            except Exception as e:
+                logging.error(f"Error delivering to {channel}: {type(e).__name__}: {e}")
+                receipts[channel] = None
+
+    supabase_result = receipts.pop("supabase") or (None, None, None)
+    receipts["supabase"], receipts["web_push"], receipts["supabase_audio_url"] = supabase_result
+    return receipts
+
+
+def measure_audio(audio_path: str) -> tuple:
+    """Return (duration in milliseconds, size in bytes) of an MP3 file, read from its frame headers."""
+    import mp3_frames
+    info = mp3_frames.probe(audio_path)
+    return round(info.duration_ms), os.path.getsize(audio_path)
+
+
+PRAYER_OPENING = "我們一起來禱告"
+
+
+def transcript_segment_count(audio_path: str) -> int:
+    """Segments ``audio_path`` adds to a joined transcript: one per synthesized chunk, one without a transcript."""
+    transcript = tts_transcript.load(audio_path)
+    return len(transcript["segments"]) if transcript else 1
+
+
+def audio_sections(audio_path: str, preamble_segments: int = 1) -> list:
+    """
+    Where the verse, reflection and prayer start in the joined audio.
+
+    Read from the word timings Edge TTS reported during synthesis; empty
+    when the audio has no transcript (e.g. OpenAI TTS produced it). The
+    reflection starts at segment ``preamble_segments``, since a long
+    preamble is itself synthesized in several chunks.
+    """
+    transcript = tts_transcript.load(audio_path)
+    if not transcript:
+        return []
+    segments = transcript["segments"]
+    sections = [{"title": "經文", "start_ms": 0}]
+    body_char = 0
+    if len(segments) > preamble_segments:
+        body_char = segments[preamble_segments]["start_char"]
+        sections.append({"title": "靈修", "start_ms": round(segments[preamble_segments]["start_ms"])})
+
+    text = transcript["text"]
+    prayer_char = text.find(PRAYER_OPENING, body_char)
+    if prayer_char < 0:
+        prayer_char = text.rfind("禱告", body_char)
+    if prayer_char >= 0:
+        paragraph_char = max(text.rfind("\n", 0, prayer_char) + 1, body_char)
+        prayer_ms = tts_transcript.offset_at(transcript, paragraph_char)
+        if prayer_ms is not None:
+            sections.append({"title": "禱告", "start_ms": round(prayer_ms)})
+    return sections
+
+
+def build_audio_preamble(verse_data: dict) -> str:
+    """Spoken intro known as soon as the verse is scraped; the exposition follows it."""
+    return f"今日靈修。{verse_data['reference']}。{verse_data['text']}。"
 
 
-def run_daily_task() -> bool:
+def join_preamble_audio(preamble_audio_path, audio_path) -> tuple:
+    """
+    Put the preamble audio in front of the exposition audio, in place.
+
+    Returns (joined path or None, preamble transcript segments) for
+    ``build_audio_artifact``; the preamble file is removed afterwards.
+    """
+    if not preamble_audio_path:
+        logging.error("Preamble audio generation failed.")
+        return None, 1
+    if not audio_path:
+        return None, 1
+    preamble_segments = transcript_segment_count(preamble_audio_path)
+    joined_path = concatenate_audio([preamble_audio_path, audio_path], audio_path)
+    if preamble_audio_path != joined_path:
+        os.remove(preamble_audio_path)
+        tts_transcript.remove(preamble_audio_path)
+    return joined_path, preamble_segments
+
+
+def build_audio_artifact(audio_path: str, preamble_segments: int = 1) -> dict:
+    """Duration, size and section starts of the finished episode audio, as stored in the audio artifact."""
+    audio_duration, audio_size_bytes = measure_audio(audio_path)
+    sections = audio_sections(audio_path, preamble_segments)
+    if sections:
+        logging.info("Audio sections: " + ", ".join(
+            f"{section['title']} {section['start_ms'] / 1000:.1f}s" for section in sections
+        ))
+    return {
+        "audio_duration_ms": audio_duration,
+        "audio_size_bytes": audio_size_bytes,
+        "sections": sections,
+    }
+
+
+def _stream_exposition_with_audio(verse_data: dict, output_path: str) -> tuple:
+    """
+    Write the exposition and synthesize it sentence by sentence as it streams in.
+
+    Returns (exposition, audio_path); audio_path is None when sentence-level
+    synthesis failed, so the caller can synthesize the finished text instead.
+    """
+    speech = start_sentence_audio(output_path)
+    try:
+        exposition = stream_exposition(verse_data, speech.add)
+    except Exception:
+        speech.cancel()
+        raise
+    if not exposition:
+        speech.cancel()
+        return None, None
+    audio_path = speech.finish()
+    if not audio_path:
+        logging.warning("Sentence-level TTS failed; synthesizing the whole exposition instead.")
+    return exposition, audio_path
+
+
+def _load_artifact(store, stage: str, stages):
+    """Return a completed stage's artifact unless the stage was explicitly chosen to rerun."""
+    if store is None or (stages is not None and stage in stages):
+        return None
+    artifact = store.load(stage)
+    if artifact is not None:
+        logging.info(f"Resuming with stored {stage} artifact from {store.directory}")
+    return artifact
+
+
+def _stage_allowed(stage: str, stages) -> bool:
+    if stages is None or stage in stages:
+        return True
+    logging.error(f"Stage '{stage}' was not selected and has no stored artifact. Aborting.")
+    return False
+
+
+def run_daily_task(
+    publish_date: str = None,
+    store=None,
+    stages=None,
+    now: datetime = None,
+    stop_after: str = None,
+) -> bool:
+    """
+    Run the daily pipeline: verse → exposition → audio → upload → deliver.
+
+    When a RunStore is given, every completed stage is checkpointed to the run
+    directory and stages that already have an artifact are resumed instead of
+    rerun. ``stages`` restricts the run to the named stages; all other stages
+    must then already be stored. ``now`` selects the verse-of-the-day date and
+    ``stop_after="audio"`` returns once content is staged (pregeneration).
+    """
     logging.info("Starting daily task...")
-    effective_dry_run = DRY_RUN or RUN_MODE == "dry_run"
-    publish_date = datetime.now().strftime("%Y-%m-%d")
+    effective_dry_run = config.DRY_RUN or config.RUN_MODE == "dry_run"
+    publish_date = publish_date or datetime.now().strftime("%Y-%m-%d")
     published_at = datetime.now(timezone.utc).isoformat()
     podcast_guid = f"daily-bible-{publish_date}"
 
     # 1. Scrape Verse
-    verse_data = get_daily_verse()
-    if not verse_data:
-        logging.error("Failed to get daily verse. Aborting.")
-        return False
+    verse_data = _load_artifact(store, "verse", stages)
+    if verse_data is None:
+        if not _stage_allowed("verse", stages):
+            return False
+        verse_data = get_daily_verse(now=now)
+        if not verse_data:
+            logging.error("Failed to get daily verse. Aborting.")
+            return False
+        if store:
+            store.save("verse", verse_data)
 
     logging.info(f"Verse fetched: {verse_data['reference']}")
 
-    # 2. Generate Content
-    exposition = generate_exposition(verse_data)
-    if not exposition:
-        logging.error("Failed to generate exposition. Aborting.")
-        return False
+    # 3a. Start synthesizing the verse preamble while the exposition is written
+    audio_artifact = _load_artifact(store, "audio", stages)
+    preamble_future = None
+    streamed_audio_path = None
+    tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-preamble")
+    try:
+        if audio_artifact is None and (stages is None or "audio" in stages):
+            preamble_path = store.path("preamble.mp3") if store else "daily_message.preamble.mp3"
+            if store:
+                os.makedirs(store.directory, exist_ok=True)
+            preamble_future = tts_executor.submit(
+                generate_audio,
+                build_audio_preamble(verse_data),
+                output_path=preamble_path,
+            )
 
-    logging.info("Exposition generated.")
+        # 2. Generate Content
+        exposition_artifact = _load_artifact(store, "exposition", stages)
+        if exposition_artifact is not None:
+            exposition = exposition_artifact["exposition"]
+        else:
+            if not _stage_allowed("exposition", stages):
+                return False
+            if config.EXPOSITION_STREAMING and preamble_future is not None:
+                exposition, streamed_audio_path = _stream_exposition_with_audio(
+                    verse_data,
+                    store.audio_path if store else "daily_message.mp3",
+                )
+            else:
+                exposition = generate_exposition(verse_data)
+            if not exposition:
+                logging.error("Failed to generate exposition. Aborting.")
+                return False
+            if store:
+                store.save("exposition", {"exposition": exposition})
 
-    # 3. Generate Audio
-    audio_text = f"今日靈修。{verse_data['reference']}。{verse_data['text']}。{exposition}"
-    audio_path = generate_audio(audio_text)
-    
-    if audio_path:
-        logging.info(f"Audio generated at {audio_path}")
-    else:
-        logging.error("Audio generation failed. Aborting.")
-        return False
+        logging.info("Exposition generated.")
 
-    # 4. Prepare podcast-ready audio metadata and upload to R2
-    audio_url = None
-    audio_duration = 0
-    audio_size_bytes = 0
-    
-    if audio_path:
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_mp3(audio_path)
-            audio_duration = len(audio) # Duration in milliseconds
-            logging.info(f"Audio duration: {audio_duration}ms")
-
-            audio_size_bytes = os.path.getsize(audio_path)
-            logging.info(f"Audio size: {audio_size_bytes} bytes")
-
-            if RUN_MODE == "full_test":
-                logging.info("Full test mode: deferring external publication decisions.")
-            elif effective_dry_run:
-                logging.info("DRY_RUN enabled. Skipping R2 audio upload.")
+        # 3b. Synthesize the exposition, join it after the preamble and collect metadata
+        if audio_artifact is not None:
+            audio_path = store.audio_path
+            audio_duration = audio_artifact["audio_duration_ms"]
+            audio_size_bytes = audio_artifact["audio_size_bytes"]
+        else:
+            if not _stage_allowed("audio", stages):
+                return False
+            if streamed_audio_path:
+                audio_path = streamed_audio_path
+            elif store:
+                audio_path = generate_audio(exposition, output_path=store.audio_path)
             else:
-                audio_url = upload_audio_to_r2(audio_path, publish_date)
-                if not audio_url:
-                    logging.error("Failed to upload audio to R2. Proceeding without audio URL.")
-        except Exception as e:
-            logging.error(f"Error processing audio: {type(e).__name__}: {e}")
-            return False
+                audio_path = generate_audio(exposition)
+            preamble_audio_path = preamble_future.result()
 
-    if RUN_MODE == "full_test":
+            audio_path, preamble_segments = join_preamble_audio(preamble_audio_path, audio_path)
+            if audio_path:
+                logging.info(f"Audio generated at {audio_path}")
+            else:
+                logging.error("Audio generation failed. Aborting.")
+                return False
+
+            try:
+                audio_artifact = build_audio_artifact(audio_path, preamble_segments)
+            except Exception as e:
+                logging.error(f"Error processing audio: {type(e).__name__}: {e}")
+                return False
+            audio_duration = audio_artifact["audio_duration_ms"]
+            audio_size_bytes = audio_artifact["audio_size_bytes"]
+            if store:
+                store.save("audio", audio_artifact)
+    finally:
+        # Never block on an abandoned preamble; it only writes its own file.
+        tts_executor.shutdown(wait=False)
+
+    logging.info(f"Audio duration: {audio_duration}ms")
+    logging.info(f"Audio size: {audio_size_bytes} bytes")
+
+    if stop_after == "audio":
+        logging.info(f"Content staged for {publish_date}.")
+        return True
+
+    if config.RUN_MODE == "full_test":
         logging.info("FULL TEST MODE ENABLED")
         logging.info("Skipping Cloudflare R2 upload")
         logging.info("Skipping LINE broadcast")
@@ -472,10 +832,10 @@ def run_daily_task() -> bool:
         logging.info("Skipping Podcast publication")
         logging.info("Skipping Web Push")
 
-        if not TELEGRAM_TEST_CHAT_ID:
+        if not config.TELEGRAM_TEST_CHAT_ID:
             logging.error("Full test requires TELEGRAM_TEST_CHAT_ID.")
             return False
-        if not TELEGRAM_BOT_TOKEN:
+        if not config.TELEGRAM_BOT_TOKEN:
             logging.error("Full test requires TELEGRAM_BOT_TOKEN.")
             return False
         if not os.path.exists(audio_path) or os.path.getsize(audio_path) <= 0:
@@ -489,7 +849,7 @@ def run_daily_task() -> bool:
             f"{exposition}"
         )
         telegram_sent = send_full_test_to_telegram(
-            TELEGRAM_TEST_CHAT_ID,
+            config.TELEGRAM_TEST_CHAT_ID,
             telegram_text,
             audio_path,
         )
@@ -507,6 +867,23 @@ def run_daily_task() -> bool:
             return False
         return True
 
+    # 4. Upload to R2
+    audio_url = None
+    upload_artifact = _load_artifact(store, "upload", stages)
+    if upload_artifact is not None:
+        audio_url = upload_artifact["audio_url"]
+        published_at = upload_artifact.get("published_at") or published_at
+    elif effective_dry_run:
+        logging.info("DRY_RUN enabled. Skipping R2 audio upload.")
+    elif stages is not None and "upload" not in stages:
+        logging.info("Upload stage not selected and not stored. Proceeding without audio URL.")
+    else:
+        audio_url = upload_audio_to_r2(audio_path, publish_date)
+        if not audio_url:
+            logging.error("Failed to upload audio to R2. Proceeding without audio URL.")
+        elif store:
+            store.save("upload", {"audio_url": audio_url, "published_at": published_at})
+
     # 5. Construct LINE Messages
     messages = [
         {
@@ -523,64 +900,339 @@ def run_daily_task() -> bool:
             "duration": audio_duration
         })
 
-    # 6. Send via LINE
-    # Only send if we are in production or have tokens.
+    # 6-9. Deliver via LINE, Telegram, Supabase and Web Push concurrently
     if effective_dry_run:
         logging.info("DRY_RUN enabled. Skipping LINE broadcast.")
         print("=== Message Content ===")
         print(json.dumps(messages, indent=2, ensure_ascii=False))
-    elif LINE_CHANNEL_ACCESS_TOKEN and LINE_CHANNEL_ACCESS_TOKEN != "your_line_channel_access_token":
-        broadcast_message(messages)
-    else:
-        logging.info("LINE_CHANNEL_ACCESS_TOKEN not set or invalid. Messages not sent.")
-        print("=== Message Content ===")
-        print(json.dumps(messages, indent=2, ensure_ascii=False))
-
-    # 7. Push to all configured Telegram chats
-    if effective_dry_run:
         logging.info("DRY_RUN enabled. Skipping Telegram push.")
-    elif TELEGRAM_CHAT_IDS:
-        # Format text for Telegram (Markdown)
-        telegram_text = f"📖 *每日靈修*\n\n{verse_data['text']}\n\n{exposition}"
-        telegram_results = push_to_all_telegram_chats(telegram_text, audio_url)
-        telegram_success_count = sum(1 for v in telegram_results.values() if v)
-        logging.info(f"Telegram push complete: {telegram_success_count}/{len(telegram_results)} chats succeeded")
-    else:
-        logging.info("No Telegram chats configured.")
-
-    # 8. 儲存至 Supabase
-    record_id = None
-    if effective_dry_run:
         logging.info("DRY_RUN enabled. Skipping Supabase save.")
+        logging.info("DRY_RUN enabled. Skipping Web Push notifications.")
+    elif stages is not None and "deliver" not in stages:
+        logging.info("Deliver stage not selected. Skipping delivery.")
     else:
-        record_id = save_to_supabase(
+        # Delivery receipts are always consulted so a rerun never sends twice.
+        previous_receipts = store.load("deliver") if store else None
+        receipts = deliver_to_channels(
             verse_data,
             exposition,
+            messages,
             audio_url,
-            audio_duration_ms=audio_duration,
+            audio_duration=audio_duration,
             audio_size_bytes=audio_size_bytes,
             podcast_guid=podcast_guid,
             published_at=published_at,
             publish_date=publish_date,
+            previous_receipts=previous_receipts,
         )
-        if record_id:
-            logging.info(f"Content saved to Supabase with ID: {record_id}")
-    
-    # 9. 發送 Web Push 通知
-    if effective_dry_run:
-        logging.info("DRY_RUN enabled. Skipping Web Push notifications.")
-    elif record_id:
-        send_web_push_notifications(
-            title="📖 今日靈修",
-            body=f"{verse_data['reference']}: {verse_data['text'][:50]}...",
-            url="https://tokpmpm.github.io/daily-bible-bot/"
-        )
+        if store:
+            store.save("deliver", receipts)
     
     logging.info("Daily task completed successfully!")
     return True
 
 
+CLI_COMMANDS = ("run", "pregenerate", "backfill")
+
+
+def _publish_date_arg(value: str) -> str:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError("dates must use YYYY-MM-DD")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Daily Bible Bot pipeline")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--run-dir",
+        help="Base directory for run artifacts (default: RUN_ARTIFACTS_DIR).",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser(
+        "run",
+        parents=[common],
+        help="Run (or resume) the pipeline for one date (default).",
+    )
+    run_parser.add_argument(
+        "--date",
+        type=_publish_date_arg,
+        help="Publish date (YYYY-MM-DD) whose run directory is used; defaults to today.",
+    )
+    run_parser.add_argument(
+        "--stages",
+        help=(
+            "Comma-separated stages to (re)run, e.g. 'deliver' or 'audio,upload,deliver'. "
+            f"Choices: {', '.join(PIPELINE_STAGES)}. Other stages are loaded from artifacts."
+        ),
+    )
+    run_parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore stored artifacts and rerun every stage.",
+    )
+    run_parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not read or write run artifacts.",
+    )
+
+    pregenerate_parser = commands.add_parser(
+        "pregenerate",
+        parents=[common],
+        help="Stage verse, exposition and audio for upcoming days so the daily run only uploads and delivers.",
+    )
+    pregenerate_parser.add_argument(
+        "--days",
+        type=int,
+        default=7,
+        help="Number of days to stage (default: 7).",
+    )
+    pregenerate_parser.add_argument(
+        "--start",
+        type=_publish_date_arg,
+        help="First date to stage (default: tomorrow in Asia/Taipei).",
+    )
+    pregenerate_parser.add_argument(
+        "--keep-days",
+        type=int,
+        default=14,
+        help="Delete run directories older than this many days (default: 14).",
+    )
+    pregenerate_parser.add_argument(
+        "--batch-expositions",
+        action="store_true",
+        help="Write every missing exposition in one batch job (EXPOSITION_BATCH_BACKEND) before synthesizing audio.",
+    )
+
+    backfill_parser = commands.add_parser(
+        "backfill",
+        parents=[common],
+        help="Regenerate or backfill daily_bible rows and R2 audio for a date range.",
+    )
+    backfill_parser.add_argument("--start", type=_publish_date_arg, required=True, help="First date (YYYY-MM-DD).")
+    backfill_parser.add_argument("--end", type=_publish_date_arg, required=True, help="Last date, inclusive.")
+    backfill_parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Dates processed at once (default: 8); per-service limits still apply.",
+    )
+    backfill_parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="Ignore stored artifacts and redo every stage.",
+    )
+    backfill_parser.add_argument(
+        "--no-publish",
+        action="store_true",
+        help="Only scrape, write and synthesize; skip R2 upload and Supabase upsert.",
+    )
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in CLI_COMMANDS + ("-h", "--help"):
+        # Plain `python bot.py [--stages ...]` keeps meaning "run".
+        argv.insert(0, "run")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.stages:
+            args.stages = {stage.strip() for stage in args.stages.split(",") if stage.strip()}
+            unknown = args.stages - set(PIPELINE_STAGES)
+            if unknown:
+                parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+        elif args.fresh:
+            args.stages = set(PIPELINE_STAGES)
+        else:
+            args.stages = None
+    elif args.command == "pregenerate" and args.days <= 0:
+        parser.error("--days must be positive")
+    elif args.command == "backfill":
+        if args.workers <= 0:
+            parser.error("--workers must be positive")
+        if args.end < args.start:
+            parser.error("--end must not be before --start")
+    return args
+
+
+def _taipei_publish_time(publish_date: str) -> datetime:
+    """Morning publish time in Asia/Taipei, used to pick that day's verse of the day."""
+    return datetime.strptime(publish_date, "%Y-%m-%d").replace(
+        hour=9, minute=30, tzinfo=ZoneInfo("Asia/Taipei")
+    )
+
+
+def _write_timing_report(path: str) -> None:
+    if not path:
+        return
+    try:
+        tracing.write_report(path)
+    except OSError as e:
+        logging.error(f"Could not write run timing report: {type(e).__name__}: {e}")
+
+
+def _stage_expositions_in_batch(dates: list, base_dir: str = None) -> int:
+    """
+    Stage the verse of each date, then write every missing exposition in one batch job.
+
+    Returns how many expositions were staged. Dates the batch could not
+    cover keep only their verse artifact and are written one by one later.
+    """
+    pending = []
+    for publish_date in dates:
+        store = RunStore(publish_date, base_dir)
+        if store.has("exposition"):
+            continue
+        verse_data = store.load("verse") if store.has("verse") else None
+        if verse_data is None:
+            with span("pipeline.pregenerate.verse", publish_date=publish_date):
+                verse_data = get_daily_verse(now=_taipei_publish_time(publish_date))
+            if not verse_data:
+                logging.error(f"{publish_date}: failed to get the daily verse for the batch.")
+                continue
+            store.save("verse", verse_data)
+        pending.append((store, verse_data))
+
+    if not pending:
+        return 0
+    try:
+        expositions = generate_expositions_in_batch([verse_data for _, verse_data in pending])
+    except Exception as e:
+        logging.error(f"Exposition batch failed; writing expositions one by one: {e}")
+        return 0
+
+    staged = 0
+    for (store, _), exposition in zip(pending, expositions):
+        if exposition:
+            store.save("exposition", {"exposition": exposition})
+            staged += 1
+    logging.info(f"Exposition batch staged {staged} of {len(pending)} dates.")
+    return staged
+
+
+def pregenerate_content(
+    days: int,
+    start_date: str = None,
+    base_dir: str = None,
+    keep_days: int = 14,
+    batch_expositions: bool = False,
+) -> bool:
+    """
+    Stage verse, exposition and audio for the next ``days`` publish dates.
+
+    The daily run then resumes from these artifacts and only uploads and
+    delivers. Dates that already have staged audio are left untouched.
+    Each date's verse-of-the-day calendar entry is checked against
+    Bible.com first, so a stale entry is fixed before the daily run reads it.
+    With ``batch_expositions`` the expositions of all remaining dates are
+    written up front in one batch job, and each date then resumes from them.
+    """
+    taipei_today = datetime.now(ZoneInfo("Asia/Taipei")).date()
+    first_date = (
+        datetime.strptime(start_date, "%Y-%m-%d").date()
+        if start_date
+        else taipei_today + timedelta(days=1)
+    )
+
+    removed = RunStore.prune(
+        (taipei_today - timedelta(days=keep_days)).isoformat(),
+        base_dir,
+    )
+    if removed:
+        logging.info(f"Pruned {len(removed)} old run directories: {', '.join(removed)}")
+
+    dates = [(first_date + timedelta(days=offset)).isoformat() for offset in range(days)]
+    # Correct the verse-of-the-day calendar here so the daily run can trust it without a request.
+    for publish_date in dates:
+        if refresh_verse_calendar(now=_taipei_publish_time(publish_date)):
+            logging.info(f"{publish_date}: verse-of-the-day calendar updated from Bible.com")
+    if batch_expositions:
+        tracing.reset()
+        _stage_expositions_in_batch(
+            [publish_date for publish_date in dates if not RunStore(publish_date, base_dir).has("audio")],
+            base_dir,
+        )
+
+    all_succeeded = True
+    for publish_date in dates:
+        store = RunStore(publish_date, base_dir)
+        if store.has("audio"):
+            logging.info(f"{publish_date}: content already staged in {store.directory}")
+            continue
+
+        logging.info(f"{publish_date}: pregenerating content")
+        tracing.reset()
+        with span("pipeline.pregenerate", publish_date=publish_date):
+            staged = run_daily_task(
+                publish_date=publish_date,
+                store=store,
+                now=_taipei_publish_time(publish_date),
+                stop_after="audio",
+            )
+        _write_timing_report(store.path("timing-pregenerate.json"))
+        if not staged:
+            logging.error(f"{publish_date}: pregeneration failed; the daily run will generate it live.")
+            all_succeeded = False
+    return all_succeeded
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    warn_missing_settings()
+    if args.command == "pregenerate":
+        return pregenerate_content(
+            args.days,
+            args.start,
+            args.run_dir,
+            args.keep_days,
+            batch_expositions=args.batch_expositions,
+        )
+    if args.command == "backfill":
+        from backfill import backfill_range
+
+        tracing.reset()
+        results = backfill_range(
+            args.start,
+            args.end,
+            workers=args.workers,
+            base_dir=args.run_dir,
+            regenerate=args.regenerate,
+            publish=not (args.no_publish or config.DRY_RUN or config.RUN_MODE != "production"),
+        )
+        _write_timing_report(config.RUN_TIMING_REPORT)
+        return all(outcome == "ok" for outcome in results.values())
+
+    publish_date = args.date or datetime.now().strftime("%Y-%m-%d")
+
+    store = None
+    if config.RUN_MODE == "full_test":
+        # Full tests must never leave artifacts that a production run could resume.
+        logging.info("Full test mode: run artifacts disabled.")
+    elif not args.no_checkpoint:
+        store = RunStore(publish_date, args.run_dir)
+        completed = store.completed_stages()
+        if completed and args.stages is None:
+            logging.info(f"Completed stages in {store.directory}: {', '.join(completed)}")
+
+    tracing.reset()
+    try:
+        with span("pipeline.run", publish_date=publish_date) as run_span:
+            success = run_daily_task(
+                publish_date=publish_date,
+                store=store,
+                stages=args.stages,
+                now=_taipei_publish_time(args.date) if args.date else None,
+            )
+            run_span.attributes["success"] = success
+    finally:
+        _write_timing_report(config.RUN_TIMING_REPORT or (store.path("timing.json") if store else ""))
+    return success
+
+
 if __name__ == "__main__":
-    success = run_daily_task()
+    success = main()
     if not success:
         raise SystemExit(1)
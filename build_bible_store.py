@@ -0,0 +1,102 @@
+"""
+Fill the local Bible verse store used by ``get_daily_verse``.
+
+Imports a CSV of ``book,chapter,verse,text`` rows (book as 1-66, a
+Bible.com code such as ``EPH`` or an English name), or downloads the CUV
+chapter by chapter from bible-api.com.
+
+使用方式：
+    python build_bible_store.py --csv cunp.csv --translation CUNP
+    python build_bible_store.py --from-bible-api --translation CUV --delay 2
+    python build_bible_store.py --stats
+"""
+
+import argparse
+import csv
+import logging
+import sys
+import time
+from urllib.parse import quote
+
+from bible_books import BOOK_BY_CODE, BOOK_BY_ENGLISH, BOOKS
+from bible_store import TRANSLATIONS, BibleStore
+from config import BIBLE_API_BASE_URL
+import http_client
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def _book_number(value: str) -> int:
+    value = value.strip()
+    if value.isdigit() and 1 <= int(value) <= len(BOOKS):
+        return int(value)
+    number = BOOK_BY_CODE.get(value.upper()) or BOOK_BY_ENGLISH.get(value.lower())
+    if not number:
+        raise ValueError(f"Unknown book: {value!r}")
+    return number
+
+
+def read_csv_rows(path: str):
+    with open(path, "r", encoding="utf-8-sig", newline="") as csv_file:
+        for row in csv.DictReader(csv_file):
+            yield _book_number(row["book"]), int(row["chapter"]), int(row["verse"]), row["text"]
+
+
+def fetch_bible_api_chapters(delay: float, books=None):
+    """Yield verse rows for every chapter of the selected books from bible-api.com (CUV)."""
+    for number, _, english, _, chapters in BOOKS:
+        if books and number not in books:
+            continue
+        for chapter in range(1, chapters + 1):
+            url = f"{BIBLE_API_BASE_URL}/{quote(f'{english} {chapter}')}?translation=cuv"
+            response = http_client.get(url, timeout=30)
+            response.raise_for_status()
+            verses = response.json().get("verses", [])
+            logging.info("%s %d: %d verses", english, chapter, len(verses))
+            for verse in verses:
+                yield number, chapter, int(verse["verse"]), verse.get("text", "")
+            time.sleep(delay)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV file with book,chapter,verse,text columns.")
+    source.add_argument("--from-bible-api", action="store_true", help="Download the CUV from bible-api.com.")
+    source.add_argument("--stats", action="store_true", help="Print verse counts per translation.")
+    parser.add_argument("--translation", choices=TRANSLATIONS, default="CUNP")
+    parser.add_argument("--books", help="Comma-separated books to download, e.g. EPH,JHN (default: all).")
+    parser.add_argument("--delay", type=float, default=2.0, help="Seconds between bible-api.com requests.")
+    parser.add_argument("--store", help="SQLite path (default: BIBLE_STORE_PATH).")
+    args = parser.parse_args(argv)
+
+    store = BibleStore(args.store)
+    if not store.enabled:
+        print("❌ BIBLE_STORE_PATH is empty; set it or pass --store.")
+        return 1
+
+    if args.stats:
+        for translation in TRANSLATIONS:
+            print(f"{translation}: {store.count(translation)} verses")
+        return 0
+
+    if args.csv:
+        rows = read_csv_rows(args.csv)
+    else:
+        books = {_book_number(book) for book in args.books.split(",")} if args.books else None
+        rows = fetch_bible_api_chapters(args.delay, books)
+
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= 1000:
+            written += store.add_verses(batch, args.translation)
+            batch = []
+    written += store.add_verses(batch, args.translation)
+    print(f"✅ Stored {written} {args.translation} verses in {store.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,8 +25,6 @@ def load_env_manual():
                         value = value[1:-1]
                     os.environ[key.strip()] = value
 
-load_env_manual()
-
 
 def positive_int_env(name, default):
     """Read a positive integer environment variable without breaking imports."""
@@ -47,9 +45,6 @@ def positive_int_env(name, default):
     return value
 
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_TTS_MODEL = os.getenv("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
-OPENAI_TTS_VOICE = os.getenv("OPENAI_TTS_VOICE", "nova")
 TTS_STYLE_INSTRUCTIONS = (
     "請使用自然、溫暖的台灣華語女聲朗讀。"
     "語速穩定、清楚，像每日靈修 Podcast 的旁白。"
@@ -57,47 +52,166 @@ TTS_STYLE_INSTRUCTIONS = (
     "忠實朗讀內容，不可摘要、改寫、加字或省略。"
     "注意中文破音字、聖經用語與數字段落的自然停頓。"
 )
-RUN_MODE = os.getenv("RUN_MODE", "production").strip().lower()
-TTS_VOICE = os.getenv("TTS_VOICE", "zh-TW-HsiaoChenNeural")
-TTS_RATE = os.getenv("TTS_RATE", "-5%")
-TTS_VOLUME = os.getenv("TTS_VOLUME", "+0%")
-TTS_PITCH = os.getenv("TTS_PITCH", "+0Hz")
-EDGE_TTS_MAX_ATTEMPTS = positive_int_env("EDGE_TTS_MAX_ATTEMPTS", 3)
-OPENAI_TTS_MAX_ATTEMPTS = positive_int_env("OPENAI_TTS_MAX_ATTEMPTS", 3)
-LINE_CHANNEL_ACCESS_TOKEN = os.getenv("LINE_CHANNEL_ACCESS_TOKEN")
-LINE_CHANNEL_SECRET = os.getenv("LINE_CHANNEL_SECRET")
-
-# Telegram Bot API
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_TEST_CHAT_ID = os.getenv("TELEGRAM_TEST_CHAT_ID", "").strip()
-TELEGRAM_CHAT_IDS = [cid.strip() for cid in os.getenv("TELEGRAM_CHAT_IDS", "").split(",") if cid.strip()]
-
-# Supabase Configuration
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY", "")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
-
-# Web Push VAPID Keys
-VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY", "")
-VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
-
-# Cloudflare Worker audio upload
-AUDIO_UPLOAD_URL = os.getenv("AUDIO_UPLOAD_URL", "")
-AUDIO_UPLOAD_SECRET = os.getenv("AUDIO_UPLOAD_SECRET", "")
-R2_PUBLIC_BASE_URL = os.getenv("R2_PUBLIC_BASE_URL", "")
-
-# Testing
-DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
-
-if not OPENAI_API_KEY:
-    print("Warning: OPENAI_API_KEY is not set.")
-if not LINE_CHANNEL_ACCESS_TOKEN:
-    print("Warning: LINE_CHANNEL_ACCESS_TOKEN is not set.")
-if not LINE_CHANNEL_SECRET:
-    print("Warning: LINE_CHANNEL_SECRET is not set.")
-if not TELEGRAM_BOT_TOKEN:
-    print("Warning: TELEGRAM_BOT_TOKEN is not set.")
-if not TELEGRAM_CHAT_IDS:
-    print("Warning: TELEGRAM_CHAT_IDS is not set.")
-if not SUPABASE_URL:
-    print("Info: SUPABASE_URL is not set. Web features disabled.")
+
+
+class Settings:
+    """Environment-backed settings, read once on first use instead of at import time."""
+
+    def __init__(self):
+        self.OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+        self.OPENAI_TTS_MODEL = os.getenv("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
+        self.OPENAI_TTS_VOICE = os.getenv("OPENAI_TTS_VOICE", "nova")
+        self.RUN_MODE = os.getenv("RUN_MODE", "production").strip().lower()
+        self.TTS_VOICE = os.getenv("TTS_VOICE", "zh-TW-HsiaoChenNeural")
+        self.TTS_RATE = os.getenv("TTS_RATE", "-5%")
+        self.TTS_VOLUME = os.getenv("TTS_VOLUME", "+0%")
+        self.TTS_PITCH = os.getenv("TTS_PITCH", "+0Hz")
+        self.EDGE_TTS_MAX_ATTEMPTS = positive_int_env("EDGE_TTS_MAX_ATTEMPTS", 3)
+        self.OPENAI_TTS_MAX_ATTEMPTS = positive_int_env("OPENAI_TTS_MAX_ATTEMPTS", 3)
+        # Deadlines for a single provider attempt, in seconds
+        self.EDGE_TTS_ATTEMPT_TIMEOUT = positive_int_env("EDGE_TTS_ATTEMPT_TIMEOUT", 60)
+        self.OPENAI_TTS_ATTEMPT_TIMEOUT = positive_int_env("OPENAI_TTS_ATTEMPT_TIMEOUT", 120)
+        # OpenAI TTS starts alongside Edge when Edge has sent no audio within this budget
+        self.TTS_HEDGE_FIRST_BYTE_MS = positive_int_env("TTS_HEDGE_FIRST_BYTE_MS", 4000)
+        # Longer scripts are split at sentence boundaries into chunks synthesized in parallel
+        self.TTS_CHUNK_CHARS = positive_int_env("TTS_CHUNK_CHARS", 150)
+        self.TTS_CHUNK_CONCURRENCY = positive_int_env("TTS_CHUNK_CONCURRENCY", 3)
+        self.LINE_CHANNEL_ACCESS_TOKEN = os.getenv("LINE_CHANNEL_ACCESS_TOKEN")
+        self.LINE_CHANNEL_SECRET = os.getenv("LINE_CHANNEL_SECRET")
+
+        # Service base URLs, overridable to point the pipeline at local stand-ins
+        self.LINE_API_BASE_URL = os.getenv("LINE_API_BASE_URL", "https://api.line.me").rstrip("/")
+        self.TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL", "https://api.telegram.org").rstrip("/")
+        self.OPENAI_API_BASE_URL = os.getenv("OPENAI_API_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        self.BIBLE_COM_BASE_URL = os.getenv("BIBLE_COM_BASE_URL", "https://www.bible.com").rstrip("/")
+        self.BIBLE_API_BASE_URL = os.getenv("BIBLE_API_BASE_URL", "https://bible-api.com").rstrip("/")
+        # Edge TTS talks to a fixed Microsoft websocket; disable it to run offline
+        self.EDGE_TTS_ENABLED = os.getenv("EDGE_TTS_ENABLED", "true").lower() != "false"
+
+        # Telegram Bot API
+        self.TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+        self.TELEGRAM_TEST_CHAT_ID = os.getenv("TELEGRAM_TEST_CHAT_ID", "").strip()
+        self.TELEGRAM_CHAT_IDS = [cid.strip() for cid in os.getenv("TELEGRAM_CHAT_IDS", "").split(",") if cid.strip()]
+
+        # Delivery fan-out: maximum in-flight requests per channel
+        self.TELEGRAM_PUSH_CONCURRENCY = positive_int_env("TELEGRAM_PUSH_CONCURRENCY", 8)
+        self.WEB_PUSH_CONCURRENCY = positive_int_env("WEB_PUSH_CONCURRENCY", 16)
+
+        # Shared HTTP client: connections kept per host, default timeout and retry budget
+        self.HTTP_POOL_MAXSIZE = positive_int_env("HTTP_POOL_MAXSIZE", 32)
+        self.HTTP_DEFAULT_TIMEOUT = positive_int_env("HTTP_DEFAULT_TIMEOUT", 30)
+        self.HTTP_MAX_RETRIES = positive_int_env("HTTP_MAX_RETRIES", 2)
+
+        # Supabase Configuration
+        self.SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+        self.SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY", "")
+        self.SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
+
+        # Web Push VAPID Keys
+        self.VAPID_PUBLIC_KEY = os.getenv("VAPID_PUBLIC_KEY", "")
+        self.VAPID_PRIVATE_KEY = os.getenv("VAPID_PRIVATE_KEY", "")
+
+        # Cloudflare Worker audio upload
+        self.AUDIO_UPLOAD_URL = os.getenv("AUDIO_UPLOAD_URL", "")
+        self.AUDIO_UPLOAD_SECRET = os.getenv("AUDIO_UPLOAD_SECRET", "")
+        self.R2_PUBLIC_BASE_URL = os.getenv("R2_PUBLIC_BASE_URL", "")
+
+        # Local run directory for per-stage pipeline artifacts, keyed by publish date
+        self.RUN_ARTIFACTS_DIR = os.getenv("RUN_ARTIFACTS_DIR", os.path.join(os.path.dirname(__file__), "runs"))
+
+        # Scraper: race the verse-of-the-day mirrors, adding one every hedge delay
+        self.SCRAPER_HEDGED_FETCH = os.getenv("SCRAPER_HEDGED_FETCH", "true").lower() != "false"
+        self.SCRAPER_HEDGE_DELAY_MS = positive_int_env("SCRAPER_HEDGE_DELAY_MS", 1500)
+        # Stream Bible.com pages and stop reading once the extractor has what it needs
+        self.SCRAPER_STREAMING = os.getenv("SCRAPER_STREAMING", "true").lower() != "false"
+        self.SCRAPER_STREAM_CHUNK_BYTES = positive_int_env("SCRAPER_STREAM_CHUNK_BYTES", 16384)
+
+        # Scraper HTTP cache: on | record | replay | off, keyed by URL and Taipei date
+        self.HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "on").strip().lower()
+        self.HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(self.RUN_ARTIFACTS_DIR, "http-cache"))
+        self.HTTP_CACHE_MAX_AGE = positive_int_env("HTTP_CACHE_MAX_AGE", 3600)
+
+        # Local verse store (SQLite); empty path disables it. VERIFY cross-checks local text in the background.
+        self.BIBLE_STORE_PATH = os.getenv("BIBLE_STORE_PATH", os.path.join(self.RUN_ARTIFACTS_DIR, "bible.sqlite3"))
+        self.BIBLE_STORE_VERIFY = os.getenv("BIBLE_STORE_VERIFY", "false").lower() == "true"
+
+        # Verse-of-the-day calendar: day of year → reference; empty path disables it
+        self.VOTD_CALENDAR_PATH = os.getenv("VOTD_CALENDAR_PATH", os.path.join(self.RUN_ARTIFACTS_DIR, "votd_calendar.json"))
+        # REFRESH re-scrapes a calendar hit in the background; off so a normal day makes no Bible.com request
+        self.VOTD_CALENDAR_REFRESH = os.getenv("VOTD_CALENDAR_REFRESH", "false").lower() == "true"
+
+        # Exposition cache keyed by (model, prompts, temperature); empty dir disables it, BYPASS forces a fresh call
+        self.EXPOSITION_CACHE_DIR = os.getenv("EXPOSITION_CACHE_DIR", os.path.join(self.RUN_ARTIFACTS_DIR, "exposition-cache"))
+        self.EXPOSITION_CACHE_MAX_ENTRIES = positive_int_env("EXPOSITION_CACHE_MAX_ENTRIES", 500)
+        self.EXPOSITION_CACHE_BYPASS = os.getenv("EXPOSITION_CACHE_BYPASS", "false").lower() == "true"
+        # Stream the exposition and synthesize each finished sentence while the rest is written
+        self.EXPOSITION_STREAMING = os.getenv("EXPOSITION_STREAMING", "false").lower() == "true"
+        # Synthesized TTS segments keyed by (text, provider, voice settings); empty dir disables it
+        self.TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(self.RUN_ARTIFACTS_DIR, "tts-cache"))
+        self.TTS_CACHE_MAX_MB = positive_int_env("TTS_CACHE_MAX_MB", 200)
+        # Batch exposition jobs (pregenerate --batch-expositions): backend is "openai" or "local"
+        self.EXPOSITION_BATCH_BACKEND = os.getenv("EXPOSITION_BATCH_BACKEND", "openai")
+        self.EXPOSITION_BATCH_CONCURRENCY = positive_int_env("EXPOSITION_BATCH_CONCURRENCY", 4)
+        self.EXPOSITION_BATCH_POLL_SECONDS = positive_int_env("EXPOSITION_BATCH_POLL_SECONDS", 30)
+        self.EXPOSITION_BATCH_TIMEOUT = positive_int_env("EXPOSITION_BATCH_TIMEOUT", 3600)
+
+        # Backfill: per-service concurrency plus one shared request rate limit
+        self.BACKFILL_BIBLE_CONCURRENCY = positive_int_env("BACKFILL_BIBLE_CONCURRENCY", 2)
+        self.BACKFILL_OPENAI_CONCURRENCY = positive_int_env("BACKFILL_OPENAI_CONCURRENCY", 4)
+        self.BACKFILL_TTS_CONCURRENCY = positive_int_env("BACKFILL_TTS_CONCURRENCY", 3)
+        self.BACKFILL_RATE_PER_SECOND = positive_int_env("BACKFILL_RATE_PER_SECOND", 2)
+        self.BACKFILL_RATE_BURST = positive_int_env("BACKFILL_RATE_BURST", 4)
+
+        # JSON timing report path; defaults to timing.json inside the run directory
+        self.RUN_TIMING_REPORT = os.getenv("RUN_TIMING_REPORT", "")
+
+        # Testing
+        self.DRY_RUN = os.getenv("DRY_RUN", "false").lower() == "true"
+
+    def validate(self) -> list:
+        """Return human-readable warnings for settings the production pipeline needs."""
+        warnings = []
+        for name in (
+            "OPENAI_API_KEY",
+            "LINE_CHANNEL_ACCESS_TOKEN",
+            "LINE_CHANNEL_SECRET",
+            "TELEGRAM_BOT_TOKEN",
+            "TELEGRAM_CHAT_IDS",
+        ):
+            if not getattr(self, name):
+                warnings.append(f"Warning: {name} is not set.")
+        if not self.SUPABASE_URL:
+            warnings.append("Info: SUPABASE_URL is not set. Web features disabled.")
+        return warnings
+
+
+_settings = None
+
+
+def get_settings() -> Settings:
+    """Load .env and build the settings on first call; later calls reuse them."""
+    global _settings
+    if _settings is None:
+        load_env_manual()
+        _settings = Settings()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    global _settings
+    _settings = None
+    return get_settings()
+
+
+def warn_missing_settings() -> None:
+    for message in get_settings().validate():
+        print(message)
+
+
+def __getattr__(name):
+    # `from config import TELEGRAM_BOT_TOKEN` keeps working, resolved lazily.
+    if name.isupper():
+        settings = get_settings()
+        if name in vars(settings):
+            return getattr(settings, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
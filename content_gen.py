@@ -1,19 +1,27 @@
-import requests
 import json
 import logging
-from config import OPENAI_API_KEY
+import re
+import time
+import http_client
+from config import (
+    EXPOSITION_CACHE_BYPASS,
+    EXPOSITION_CACHE_DIR,
+    EXPOSITION_CACHE_MAX_ENTRIES,
+    OPENAI_API_BASE_URL,
+    OPENAI_API_KEY,
+)
+from disk_cache import DiskCache
+from tracing import span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def generate_exposition(verse_data):
-    """
-    Generates a 350-word exposition for the given verse using OpenAI API.
-    """
-    if not OPENAI_API_KEY:
-        logging.error("OPENAI_API_KEY is not set.")
-        return None
+EXPOSITION_MODEL = "gpt-4o"
+EXPOSITION_SYSTEM_PROMPT = "你是一位資深的聖經教師，擅長用溫暖的語氣講解聖經真理。"
 
+
+def build_exposition_request(verse_data):
+    """Chat completions request body for one verse; the same verse always yields the same body."""
     verse_text = verse_data['text']
     verse_ref = verse_data['reference']
 
@@ -42,33 +50,221 @@ def generate_exposition(verse_data):
     ⚠️ 重要提醒：請務必精簡內容，確保總字數不超過 350 字。請先估算字數再撰寫。
     """
 
-    url = "https://api.openai.com/v1/chat/completions"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {OPENAI_API_KEY}"
-    }
-    data = {
-        "model": "gpt-4o",
+    return {
+        "model": EXPOSITION_MODEL,
         "messages": [
-            {"role": "system", "content": "你是一位資深的聖經教師，擅長用溫暖的語氣講解聖經真理。"},
+            {"role": "system", "content": EXPOSITION_SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
         "temperature": 0.7,
         "max_tokens": 800
     }
 
+
+def exposition_cache():
+    return DiskCache(EXPOSITION_CACHE_DIR, max_entries=EXPOSITION_CACHE_MAX_ENTRIES, suffix=".json")
+
+
+def exposition_cache_key(request):
+    """Content hash of everything that shapes the answer: model, system prompt, user prompt, temperature."""
+    prompts = {message["role"]: message["content"] for message in request["messages"]}
+    return DiskCache.key_for(request["model"], prompts.get("system", ""), prompts.get("user", ""), request["temperature"])
+
+
+def read_cached_exposition(cache, key):
+    cached = cache.get(key)
+    if cached is None:
+        return None
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=60)
-        response.raise_for_status()
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        logging.info("Successfully generated exposition.")
-        return content
-    except Exception as e:
-        logging.error(f"Error generating content: {e}")
-        if 'response' in locals():
-             logging.error(f"Response: {response.text}")
+        return json.loads(cached)["content"]
+    except (ValueError, KeyError, TypeError) as e:
+        logging.warning(f"Ignoring unreadable exposition cache entry {key}: {e}")
+        cache.delete(key)
+        return None
+
+
+def store_cached_exposition(cache, key, request, content, reference=""):
+    entry = {"model": request["model"], "reference": reference, "created_at": time.time(), "content": content}
+    return cache.put(key, json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def _cached_exposition(data, use_cache, exposition_span):
+    """
+    Look ``data`` up in the exposition cache and record hit, miss or bypass on the span.
+
+    Returns (cache, key, content); content is None unless the lookup hit.
+    """
+    if use_cache is None:
+        use_cache = not EXPOSITION_CACHE_BYPASS
+    cache = exposition_cache()
+    cache_key = exposition_cache_key(data)
+    content = read_cached_exposition(cache, cache_key) if use_cache else None
+    if content:
+        exposition_span.attributes["cache"] = "hit"
+        logging.info("Exposition served from cache (%s).", cache_key[:12])
+    else:
+        exposition_span.attributes["cache"] = "miss" if use_cache else "bypass"
+    return cache, cache_key, content
+
+
+def _chat_completions_endpoint():
+    """URL and headers for the chat completions API, or None when OPENAI_API_KEY is not set."""
+    if not OPENAI_API_KEY:
+        logging.error("OPENAI_API_KEY is not set.")
         return None
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {OPENAI_API_KEY}"
+    }
+    return f"{OPENAI_API_BASE_URL}/chat/completions", headers
+
+
+# A sentence ends at Chinese (or ASCII) terminal punctuation plus any closing quotes, or at a line break.
+_SENTENCE_END = re.compile(r"[。！？；!?…]+[」』”’）)]*|\n+")
+
+
+class SentenceSplitter:
+    """Cut text arriving in arbitrary pieces into finished sentences."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text):
+        """Add streamed text; returns the sentences it completed."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() == len(self._buffer):
+                # A closing quote or another line break may still follow in the next piece.
+                break
+            sentence = self._buffer[start:match.end()].strip()
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        sentence, self._buffer = self._buffer.strip(), ""
+        return [sentence] if sentence else []
+
+
+def split_sentences(text):
+    splitter = SentenceSplitter()
+    return splitter.feed(text) + splitter.flush()
+
+
+def _completion_deltas(response):
+    """Content pieces of a streamed chat completion (server-sent events)."""
+    for line in response.iter_lines():
+        line = line.decode("utf-8") if isinstance(line, bytes) else line
+        if not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+        choices = json.loads(payload).get("choices") or []
+        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+        if delta:
+            yield delta
+
+
+def stream_exposition(verse_data, on_sentence, use_cache=None):
+    """
+    Like ``generate_exposition``, but streams the completion and calls
+    ``on_sentence`` with each sentence as soon as it is finished.
+
+    A cache hit replays the cached exposition sentence by sentence. Returns
+    the whole exposition, or None when the completion failed (sentences sent
+    before the failure are not taken back).
+    """
+    data = build_exposition_request(verse_data)
+
+    with span("content_gen.stream_exposition", model=data["model"]) as exposition_span:
+        cache, cache_key, content = _cached_exposition(data, use_cache, exposition_span)
+        if content:
+            for sentence in split_sentences(content):
+                on_sentence(sentence)
+            return content
+
+        endpoint = _chat_completions_endpoint()
+        if endpoint is None:
+            return None
+        url, headers = endpoint
+        streamed_data = dict(data, stream=True)
+        exposition_span.bytes_out = len(json.dumps(streamed_data, ensure_ascii=False).encode("utf-8"))
+        started = time.perf_counter()
+        pieces = []
+        splitter = SentenceSplitter()
+        sentence_count = 0
+        try:
+            response = http_client.post(url, headers=headers, json=streamed_data, timeout=60, stream=True)
+            try:
+                response.raise_for_status()
+                for delta in _completion_deltas(response):
+                    pieces.append(delta)
+                    for sentence in splitter.feed(delta):
+                        if not sentence_count:
+                            exposition_span.attributes["first_sentence_ms"] = round((time.perf_counter() - started) * 1000, 3)
+                        sentence_count += 1
+                        on_sentence(sentence)
+            finally:
+                response.close()
+            for sentence in splitter.flush():
+                sentence_count += 1
+                on_sentence(sentence)
+            content = "".join(pieces)
+            if not content.strip():
+                raise ValueError("streamed completion was empty")
+        except Exception as e:
+            exposition_span.status = "error"
+            exposition_span.error = f"{type(e).__name__}: {e}"
+            logging.error(f"Error streaming content: {e}")
+            return None
+        exposition_span.bytes_in = len(content.encode("utf-8"))
+        exposition_span.attributes["sentences"] = sentence_count
+        logging.info("Successfully streamed exposition.")
+        store_cached_exposition(cache, cache_key, data, content, verse_data['reference'])
+        return content
+
+
+def generate_exposition(verse_data, use_cache=None):
+    """
+    Generates a 350-word exposition for the given verse using OpenAI API.
+
+    Identical requests are answered from the on-disk exposition cache
+    (EXPOSITION_CACHE_DIR). ``use_cache=False`` or EXPOSITION_CACHE_BYPASS
+    skips the lookup; the fresh answer still replaces the cached one.
+    """
+    data = build_exposition_request(verse_data)
+
+    with span("content_gen.generate_exposition", model=data["model"]) as exposition_span:
+        cache, cache_key, content = _cached_exposition(data, use_cache, exposition_span)
+        if content:
+            return content
+
+        endpoint = _chat_completions_endpoint()
+        if endpoint is None:
+            return None
+        url, headers = endpoint
+        exposition_span.bytes_out = len(json.dumps(data, ensure_ascii=False).encode("utf-8"))
+        try:
+            response = http_client.post(url, headers=headers, json=data, timeout=60)
+            exposition_span.add_response(response)
+            response.raise_for_status()
+            result = response.json()
+            content = result['choices'][0]['message']['content']
+            logging.info("Successfully generated exposition.")
+        except Exception as e:
+            exposition_span.status = "error"
+            exposition_span.error = f"{type(e).__name__}: {e}"
+            logging.error(f"Error generating content: {e}")
+            if 'response' in locals():
+                 logging.error(f"Response: {response.text}")
+            return None
+        store_cached_exposition(cache, cache_key, data, content, verse_data['reference'])
+        return content
 
 if __name__ == "__main__":
     # Manual test
@@ -0,0 +1,117 @@
+"""
+Persistent key/value cache on disk with least-recently-used eviction.
+
+One file per entry under a single directory, named by a content hash of
+whatever the caller keys on (``key_for``). Reads refresh the file's mtime,
+so eviction — run after every write, bounded by entry count and/or total
+bytes — drops the entries read longest ago. Writes are atomic, so several
+processes may share a directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+
+class DiskCache:
+    """Bytes values keyed by hex digests; an empty ``directory`` disables the cache."""
+
+    def __init__(self, directory: str, max_entries: int = None, max_bytes: int = None, suffix: str = ".bin"):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @staticmethod
+    def key_for(*parts) -> str:
+        """Stable sha256 of JSON-serializable ``parts``."""
+        payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str):
+        """Stored bytes, or None on a miss; a hit becomes the most recently used entry."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as entry_file:
+                value = entry_file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            logging.warning("Could not read cache entry %s: %s", path, error)
+            return None
+        return value
+
+    def put(self, key: str, value: bytes) -> bool:
+        """Store ``value`` under ``key`` and evict past the limits; False when it could not be written."""
+        if not self.enabled:
+            return False
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as entry_file:
+                entry_file.write(value)
+            os.replace(temp_path, path)
+        except OSError as error:
+            logging.warning("Could not write cache entry %s: %s", path, error)
+            return False
+        self.evict()
+        return True
+
+    def delete(self, key: str) -> bool:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            return False
+        return True
+
+    def _entries(self) -> list:
+        """``(mtime, size, path)`` of every entry, least recently used first."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as scanner:
+                for entry in scanner:
+                    if entry.name.endswith(self.suffix) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return []
+        return sorted(entries)
+
+    def evict(self) -> list:
+        """Delete least recently used entries until both limits hold; returns the removed paths."""
+        if not self.enabled or (self.max_entries is None and self.max_bytes is None):
+            return []
+        entries = self._entries()
+        count = len(entries)
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in entries:
+            over_count = self.max_entries is not None and count > self.max_entries
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            if not (over_count or over_bytes):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            count -= 1
+            total -= size
+            removed.append(path)
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._entries() if self.enabled else []
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries)}
@@ -0,0 +1,253 @@
+"""
+Batch exposition generation: many verses in one submitted job.
+
+Pregeneration and backfills otherwise call ``generate_exposition`` once per
+date. Here every verse becomes one line of a JSONL job (``custom_id`` is the
+exposition cache key, the ``body`` is the same chat completions request),
+the job is submitted once, polled until it finishes, and each answer is
+written into the exposition cache — so a later ``generate_exposition`` for
+the same verse is a cache hit.
+
+Backends (``EXPOSITION_BATCH_BACKEND``):
+
+    openai  the OpenAI Batch API: upload the JSONL, create a batch, poll it,
+            download the output file (or cancel the batch on timeout)
+    local   run the lines in-process against the chat completions endpoint
+            with bounded concurrency; a stand-in for tests and fake services
+"""
+
+import contextvars
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+from config import (
+    EXPOSITION_BATCH_BACKEND,
+    EXPOSITION_BATCH_CONCURRENCY,
+    EXPOSITION_BATCH_POLL_SECONDS,
+    EXPOSITION_BATCH_TIMEOUT,
+    OPENAI_API_BASE_URL,
+    OPENAI_API_KEY,
+)
+from content_gen import (
+    build_exposition_request,
+    exposition_cache,
+    exposition_cache_key,
+    read_cached_exposition,
+    store_cached_exposition,
+)
+from tracing import span
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+
+def _auth_headers() -> dict:
+    return {"Authorization": f"Bearer {OPENAI_API_KEY}"}
+
+
+class OpenAIBatchBackend:
+    """Submit through the OpenAI Files and Batches endpoints."""
+
+    name = "openai"
+
+    def __init__(self, completion_window: str = "24h"):
+        self.completion_window = completion_window
+        self._batches = {}
+
+    def submit(self, payload: bytes) -> str:
+        upload = http_client.post(
+            f"{OPENAI_API_BASE_URL}/files",
+            headers=_auth_headers(),
+            data={"purpose": "batch"},
+            files={"file": ("expositions.jsonl", payload, "application/jsonl")},
+            timeout=60,
+        )
+        upload.raise_for_status()
+        response = http_client.post(
+            f"{OPENAI_API_BASE_URL}/batches",
+            headers=_auth_headers(),
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": BATCH_ENDPOINT,
+                "completion_window": self.completion_window,
+            },
+            timeout=60,
+        )
+        response.raise_for_status()
+        batch = response.json()
+        self._batches[batch["id"]] = batch
+        return batch["id"]
+
+    def poll(self, job_id: str) -> str:
+        response = http_client.get(f"{OPENAI_API_BASE_URL}/batches/{job_id}", headers=_auth_headers(), timeout=30)
+        response.raise_for_status()
+        self._batches[job_id] = response.json()
+        return self._batches[job_id]["status"]
+
+    def cancel(self, job_id: str) -> None:
+        response = http_client.post(f"{OPENAI_API_BASE_URL}/batches/{job_id}/cancel", headers=_auth_headers(), timeout=30)
+        response.raise_for_status()
+        self._batches[job_id] = response.json()
+
+    def output(self, job_id: str) -> bytes:
+        file_id = self._batches.get(job_id, {}).get("output_file_id")
+        if not file_id:
+            return b""
+        response = http_client.get(f"{OPENAI_API_BASE_URL}/files/{file_id}/content", headers=_auth_headers(), timeout=60)
+        response.raise_for_status()
+        return response.content
+
+
+def _post_chat_completion(body: dict) -> dict:
+    response = http_client.post(
+        f"{OPENAI_API_BASE_URL}/chat/completions",
+        headers={**_auth_headers(), "Content-Type": "application/json"},
+        json=body,
+        timeout=60,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+class LocalBatchBackend:
+    """Run a batch in-process; ``complete(body) -> completion`` defaults to the chat completions endpoint."""
+
+    name = "local"
+
+    def __init__(self, complete=None, concurrency: int = None):
+        self.complete = complete or _post_chat_completion
+        self.concurrency = concurrency or EXPOSITION_BATCH_CONCURRENCY
+        self._jobs = {}
+
+    def submit(self, payload: bytes) -> str:
+        lines = [json.loads(line) for line in payload.decode("utf-8").splitlines() if line.strip()]
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="exposition-batch")
+        self._jobs[job_id] = [
+            (line["custom_id"], executor.submit(contextvars.copy_context().run, self.complete, line["body"]))
+            for line in lines
+        ]
+        executor.shutdown(wait=False)
+        return job_id
+
+    def poll(self, job_id: str) -> str:
+        return "completed" if all(future.done() for _, future in self._jobs[job_id]) else "in_progress"
+
+    def cancel(self, job_id: str) -> None:
+        """Drop requests that have not started; those already running finish unobserved."""
+        for _, future in self._jobs.pop(job_id, ()):
+            future.cancel()
+
+    def output(self, job_id: str) -> bytes:
+        lines = []
+        for custom_id, future in self._jobs.pop(job_id):
+            try:
+                line = {"custom_id": custom_id, "response": {"status_code": 200, "body": future.result()}, "error": None}
+            except Exception as error:
+                line = {"custom_id": custom_id, "response": None, "error": {"message": f"{type(error).__name__}: {error}"}}
+            lines.append(json.dumps(line, ensure_ascii=False))
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+BACKENDS = {"openai": OpenAIBatchBackend, "local": LocalBatchBackend}
+
+
+def get_backend(name: str = None):
+    name = name or EXPOSITION_BATCH_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown EXPOSITION_BATCH_BACKEND={name!r}; choose one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def build_batch_input(requests_by_key: dict) -> bytes:
+    """One JSONL line per request, keyed by its exposition cache key."""
+    lines = [
+        json.dumps({"custom_id": key, "method": "POST", "url": BATCH_ENDPOINT, "body": request}, ensure_ascii=False)
+        for key, request in requests_by_key.items()
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse_batch_output(payload: bytes) -> dict:
+    """``custom_id`` → exposition text for every successful line; failed lines are logged and left out."""
+    results = {}
+    for line in payload.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        try:
+            if entry.get("error") or response.get("status_code") != 200:
+                raise ValueError(entry.get("error") or f"HTTP {response.get('status_code')}")
+            results[entry["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError, ValueError) as error:
+            logging.error("Batch exposition %s failed: %s", entry.get("custom_id", "?")[:12], error)
+    return results
+
+
+def run_batch(verses: list, backend=None, poll_seconds: float = None, timeout: float = None,
+              sleep=time.sleep, clock=time.monotonic) -> list:
+    """
+    Expositions for ``verses`` in input order, None where generation failed.
+
+    Verses already in the exposition cache are answered from it and left
+    out of the job; the rest go out as one submission.
+    """
+    backend = backend or get_backend()
+    poll_seconds = EXPOSITION_BATCH_POLL_SECONDS if poll_seconds is None else poll_seconds
+    timeout = EXPOSITION_BATCH_TIMEOUT if timeout is None else timeout
+    cache = exposition_cache()
+
+    keys = []
+    contents = {}
+    pending = {}
+    references = {}
+    for verse in verses:
+        request = build_exposition_request(verse)
+        key = exposition_cache_key(request)
+        keys.append(key)
+        if key in contents or key in pending:
+            continue
+        cached = read_cached_exposition(cache, key)
+        if cached:
+            contents[key] = cached
+        else:
+            pending[key] = request
+            references[key] = verse["reference"]
+
+    with span("exposition_batch.run", backend=backend.name, verses=len(verses), submitted=len(pending)) as batch_span:
+        if pending:
+            job_id = backend.submit(build_batch_input(pending))
+            batch_span.attributes["job_id"] = job_id
+            logging.info("Submitted %d expositions as batch %s (%s).", len(pending), job_id, backend.name)
+            deadline = clock() + timeout
+            state = backend.poll(job_id)
+            while state not in FINAL_STATES and clock() < deadline:
+                sleep(poll_seconds)
+                state = backend.poll(job_id)
+            batch_span.attributes["state"] = state
+
+            if state == "completed":
+                for key, content in parse_batch_output(backend.output(job_id)).items():
+                    if key in pending and content:
+                        contents[key] = content
+                        store_cached_exposition(cache, key, pending[key], content, references[key])
+            elif state in FINAL_STATES:
+                batch_span.status = "error"
+                logging.error("Exposition batch %s ended as %s.", job_id, state)
+            else:
+                batch_span.status = "error"
+                logging.error("Exposition batch %s still %s after %ss; cancelling it.", job_id, state, timeout)
+                # The dates fall back to live generation; a batch left running would be paid for twice.
+                try:
+                    backend.cancel(job_id)
+                except Exception as error:
+                    logging.warning("Could not cancel exposition batch %s: %s: %s", job_id, type(error).__name__, error)
+        batch_span.attributes["generated"] = sum(key in contents for key in pending)
+
+    return [contents.get(key) for key in keys]
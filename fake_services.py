@@ -0,0 +1,333 @@
+"""
+Local stand-ins for every outbound service the pipeline calls.
+
+One threaded HTTP server answers for LINE, Telegram, OpenAI (chat, speech
+and batches), bible.com, bible-api.com, Supabase REST, the R2 upload Worker and
+Web Push endpoints, each under its own path prefix. Every service has
+configurable latency, error rate and rate limit so ``run_daily_task`` can be
+load-tested end to end without network access.
+
+    with FakeServices(subscribers=1000) as services:
+        os.environ.update(services.environment())
+        ...
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+SERVICES = ("line", "telegram", "openai", "bible-com", "bible-api", "supabase", "upload", "push")
+
+FAKE_EXPOSITION = (
+    "這段經文提醒我們，神的能力遠超過我們所求所想。"
+    "\n\n在忙碌的日子裡，我們常以為一切要靠自己完成。今天試著把計畫交託給神。"
+    "\n\n我們一起來禱告：親愛的天父，求你照著運行在我們心裡的大力，引導我們今天的腳步。奉主耶穌的名禱告，阿們。"
+)
+
+# The P-256 generator point: a valid public key, so pywebpush can encrypt payloads.
+FAKE_PUSH_KEYS = {
+    "p256dh": "BGsX0fLhLEJH-Lzm5WOkQPJ3A32BLeszoPShOUXYmMKWT-NC4v4af5uOfrSnwPnhYrzjNXazFezsu7ZAaDe_UfU",
+    "auth": "ZGFpbHktYmlibGUtZmFrZQ",
+}
+
+_VERSE_TEXT = "神能照着運行在我們心裏的大力充充足足地成就一切，超過我們所求所想的。"
+
+_VERSE_OF_THE_DAY_HTML = """<html><head><title>Verse of the Day</title></head><body>
+<script id="__NEXT_DATA__" type="application/json">{next_data}</script>
+<a href="/bible/111/EPH.3.20-21.NIV">Ephesians 3:20-21 (NIV)</a>
+</body></html>"""
+
+_COMPARE_HTML = """<html><body><main>
+<section>以弗所書 3:20-21 CUNP-神 (新標點和合本, 神版) {text} 分享 閱讀 以弗所書 3</section>
+<section>以弗所書 3:20-21 RCUV 和合本修訂版</section>
+</main></body></html>"""
+
+_CUNP_HTML = """<html><head><meta property="og:description" content="{text}"></head>
+<body><span data-usfm="EPH.3.20">20 {text}</span></body></html>"""
+
+
+def silent_mp3(frames: int = 250) -> bytes:
+    """MPEG-2 Layer III, 24 kHz, 48 kbps mono silence; each 144-byte frame lasts 24 ms."""
+    header = bytes((0xFF, 0xF3, 0x64, 0xC0))
+    return (header + bytes(140)) * frames
+
+
+class ServiceBehavior:
+    """Latency, failure injection and rate limiting for one fake service."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 rate_limit_per_second: float = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_second = rate_limit_per_second
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        latency = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def rate_limited(self) -> bool:
+        """Fixed one-second window limiter; True means answer 429."""
+        if not self.rate_limit_per_second:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.rate_limit_per_second
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DailyBibleFake/1.0"
+
+    def setup(self):
+        super().setup()
+        self.server.services.count_connection()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body=b"", content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        elif isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self):
+        services = self.server.services
+        parts = urlsplit(self.path)
+        service, _, rest = parts.path.lstrip("/").partition("/")
+        body = self._read_body()
+        if service not in SERVICES:
+            return self._send(404, {"error": f"unknown service {service}"})
+
+        services.count(service)
+        behavior = services.behaviors[service]
+        behavior.delay()
+        if behavior.rate_limited():
+            return self._send(429, {"error": "rate limited"}, headers={"Retry-After": "1"})
+        if behavior.should_fail():
+            return self._send(503, {"error": "injected failure"})
+
+        handler = getattr(self, "_handle_" + service.replace("-", "_"))
+        return handler("/" + rest, parse_qs(parts.query), body)
+
+    do_GET = do_POST = do_PUT = do_HEAD = _dispatch
+
+    def _handle_line(self, path, query, body):
+        return self._send(200, {})
+
+    def _handle_telegram(self, path, query, body):
+        if path.endswith("/getUpdates"):
+            return self._send(200, {"ok": True, "result": []})
+        return self._send(200, {"ok": True, "result": {"message_id": 1}})
+
+    def _send_event_stream(self, pieces):
+        events = [
+            f"data: {json.dumps({'choices': [{'delta': {'content': piece}}]}, ensure_ascii=False)}\n\n".encode("utf-8")
+            for piece in pieces
+        ] + [b"data: [DONE]\n\n"]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(sum(len(event) for event in events)))
+        self.end_headers()
+        for event in events:
+            self.wfile.write(event)
+            self.wfile.flush()
+
+    def _handle_openai(self, path, query, body):
+        if path.endswith("/chat/completions"):
+            if json.loads(body or b"{}").get("stream"):
+                return self._send_event_stream(FAKE_EXPOSITION[index:index + 8] for index in range(0, len(FAKE_EXPOSITION), 8))
+            return self._send(200, {"choices": [{"message": {"content": FAKE_EXPOSITION}}]})
+        if path.endswith("/audio/speech"):
+            return self._send(200, self.server.services.speech_audio, content_type="audio/mpeg")
+        if path.startswith("/v1/files") or path.startswith("/v1/batches"):
+            return self._handle_openai_batch(path, body)
+        return self._send(404, {"error": "unknown OpenAI endpoint"})
+
+    def _handle_openai_batch(self, path, body):
+        """Files and Batches API: every batch completes at once with one FAKE_EXPOSITION per input line."""
+        services = self.server.services
+        if path == "/v1/files" and self.command == "POST":
+            # The multipart upload carries the JSONL verbatim; keep its request lines.
+            lines = [line for line in body.decode("utf-8", "replace").splitlines() if line.startswith('{"custom_id"')]
+            return self._send(200, {"id": services.store_file("\n".join(lines).encode("utf-8")), "purpose": "batch"})
+        if path == "/v1/batches" and self.command == "POST":
+            request = json.loads(body or b"{}")
+            input_file = services.files.get(request.get("input_file_id"))
+            if input_file is None:
+                return self._send(400, {"error": "unknown input_file_id"})
+            output = "".join(
+                json.dumps({
+                    "custom_id": json.loads(line)["custom_id"],
+                    "response": {"status_code": 200, "body": {"choices": [{"message": {"content": FAKE_EXPOSITION}}]}},
+                    "error": None,
+                }, ensure_ascii=False) + "\n"
+                for line in input_file.decode("utf-8").splitlines()
+                if line.strip()
+            )
+            batch = {
+                "id": f"batch_{len(services.batches) + 1}",
+                "status": "completed",
+                "endpoint": request.get("endpoint"),
+                "output_file_id": services.store_file(output.encode("utf-8")),
+            }
+            services.batches[batch["id"]] = batch
+            return self._send(200, batch)
+        match = re.fullmatch(r"/v1/batches/([\w-]+)/cancel", path)
+        if match and match.group(1) in services.batches and self.command == "POST":
+            services.batches[match.group(1)]["status"] = "cancelled"
+            return self._send(200, services.batches[match.group(1)])
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", path)
+        if match and match.group(1) in services.batches:
+            return self._send(200, services.batches[match.group(1)])
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", path)
+        if match and match.group(1) in services.files:
+            return self._send(200, services.files[match.group(1)], content_type="application/jsonl")
+        return self._send(404, {"error": "unknown batch or file"})
+
+    def _handle_bible_com(self, path, query, body):
+        if "verse-of-the-day" in path:
+            next_data = json.dumps({
+                "props": {"pageProps": {"referenceTitle": {"title": "Ephesians 3:20-21"}, "images": []}}
+            })
+            return self._send(200, _VERSE_OF_THE_DAY_HTML.format(next_data=next_data), "text/html; charset=utf-8")
+        if "/bible/compare/" in path:
+            return self._send(200, _COMPARE_HTML.format(text=_VERSE_TEXT), "text/html; charset=utf-8")
+        if "/bible/" in path:
+            return self._send(200, _CUNP_HTML.format(text=_VERSE_TEXT), "text/html; charset=utf-8")
+        return self._send(404, "not found", "text/html")
+
+    def _handle_bible_api(self, path, query, body):
+        return self._send(200, {"text": _VERSE_TEXT})
+
+    def _handle_supabase(self, path, query, body):
+        if path.startswith("/rest/v1/push_subscribers"):
+            return self._send(200, self.server.services.subscriber_rows)
+        if path.startswith("/rest/v1/daily_bible"):
+            return self._send(201, [{"id": f"fake-{self.server.services.counts['supabase']}"}])
+        return self._send(404, {"error": "unknown table"})
+
+    def _handle_upload(self, path, query, body):
+        return self._send(200, {"url": f"{self.server.services.base_url}/upload{path}"})
+
+    def _handle_push(self, path, query, body):
+        return self._send(201, b"")
+
+
+class FakeServices:
+    """Run every fake service on one loopback port; use as a context manager."""
+
+    def __init__(self, behaviors: dict = None, subscribers: int = 0, speech_frames: int = 250,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.behaviors = {service: ServiceBehavior() for service in SERVICES}
+        self.behaviors.update(behaviors or {})
+        self.speech_audio = silent_mp3(speech_frames)
+        self.counts = {service: 0 for service in SERVICES}
+        self.connections = 0
+        self.files = {}
+        self.batches = {}
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.services = self
+        self._thread = None
+        self.subscriber_rows = [self._subscription(index) for index in range(subscribers)]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _subscription(self, index: int) -> dict:
+        return {
+            "subscription": {
+                "endpoint": f"{self.base_url}/push/{index}",
+                "keys": dict(FAKE_PUSH_KEYS),
+            }
+        }
+
+    def count(self, service: str) -> None:
+        with self._counts_lock:
+            self.counts[service] += 1
+
+    def count_connection(self) -> None:
+        with self._counts_lock:
+            self.connections += 1
+
+    def store_file(self, content: bytes) -> str:
+        with self._counts_lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content
+        return file_id
+
+    def environment(self) -> dict:
+        """Environment variables that point the pipeline at these fakes."""
+        base = self.base_url
+        return {
+            "LINE_API_BASE_URL": f"{base}/line",
+            "TELEGRAM_API_BASE_URL": f"{base}/telegram",
+            "OPENAI_API_BASE_URL": f"{base}/openai/v1",
+            "BIBLE_COM_BASE_URL": f"{base}/bible-com",
+            "BIBLE_API_BASE_URL": f"{base}/bible-api",
+            "SUPABASE_URL": f"{base}/supabase",
+            "AUDIO_UPLOAD_URL": f"{base}/upload",
+            "R2_PUBLIC_BASE_URL": f"{base}/upload",
+            "EDGE_TTS_ENABLED": "false",
+        }
+
+    def start(self) -> "FakeServices":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+
+def parse_behavior(spec: str) -> tuple:
+    """Parse ``service:latency_ms[:error_rate[:rate_limit]]`` from the command line."""
+    match = re.fullmatch(r"([\w-]+):(\d+(?:\.\d+)?)(?::(\d*(?:\.\d+)?))?(?::(\d+))?", spec)
+    if not match or match.group(1) not in SERVICES:
+        raise ValueError(f"invalid service behavior: {spec}")
+    return match.group(1), ServiceBehavior(
+        latency_ms=float(match.group(2)),
+        error_rate=float(match.group(3) or 0),
+        rate_limit_per_second=int(match.group(4) or 0),
+    )
@@ -9,10 +9,10 @@ Telegram Chat ID 取得工具
 5. 將 Chat ID 複製到 .env 的 TELEGRAM_CHAT_IDS
 """
 
-import requests
 import time
 import logging
-from config import TELEGRAM_BOT_TOKEN
+import http_client
+from config import TELEGRAM_API_BASE_URL, TELEGRAM_BOT_TOKEN
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -25,13 +25,13 @@ def get_updates(offset=None):
         logging.error("TELEGRAM_BOT_TOKEN is not set in .env file.")
         return None
     
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
+    url = f"{TELEGRAM_API_BASE_URL}/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
     params = {"timeout": 30}
     if offset:
         params["offset"] = offset
     
     try:
-        response = requests.get(url, params=params, timeout=35)
+        response = http_client.get(url, params=params, timeout=35)
         response.raise_for_status()
         return response.json()
     except Exception as e:
@@ -0,0 +1,177 @@
+"""
+On-disk record/replay cache for scraper GET requests.
+
+Entries are keyed by URL and the Asia/Taipei date the page was fetched on and
+live under ``<HTTP_CACHE_DIR>/<YYYY-MM-DD>/``, so a same-day rerun or retry
+reads bible.com pages from disk. Modes (``HTTP_CACHE_MODE``):
+
+    on      serve same-day entries; revalidate with ETag / If-Modified-Since
+            once they are older than HTTP_CACHE_MAX_AGE seconds
+    record  always fetch and overwrite the stored entry
+    replay  never touch the network; a missing entry raises CacheMiss
+    off     bypass the cache entirely
+
+The recorded pages double as an offline corpus for parser benchmarks.
+Responses marked with ``TRUNCATED_HEADER`` (a streamed download that
+stopped early) are never stored.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import config
+
+
+CACHE_MODES = ("on", "record", "replay", "off")
+KEEP_DAYS = 7
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+TRUNCATED_HEADER = "X-Truncated"
+_DATE_DIRECTORY = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class CacheMiss(requests.ConnectionError):
+    """Raised in replay mode for a URL that was never recorded; scraper fallbacks treat it as a failed request."""
+
+
+def _taipei_date() -> str:
+    return datetime.now(ZoneInfo("Asia/Taipei")).strftime("%Y-%m-%d")
+
+
+def _entry_paths(url: str, cache_date: str, cache_dir: str) -> tuple:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+    directory = os.path.join(cache_dir, cache_date)
+    return os.path.join(directory, f"{digest}.json"), os.path.join(directory, f"{digest}.body")
+
+
+def _load(url: str, cache_date: str, cache_dir: str):
+    meta_path, body_path = _entry_paths(url, cache_date, cache_dir)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        with open(body_path, "rb") as body_file:
+            body = body_file.read()
+    except (OSError, ValueError):
+        return None
+    return meta, body
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as cache_file:
+        cache_file.write(payload)
+    os.replace(temp_path, path)
+
+
+def _encode_meta(meta: dict) -> bytes:
+    return json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+
+def _store(url: str, cache_date: str, cache_dir: str, response) -> None:
+    meta_path, body_path = _entry_paths(url, cache_date, cache_dir)
+    if not os.path.isdir(os.path.dirname(meta_path)):
+        # First entry of a new day: drop days nobody will revalidate against again.
+        cutoff = datetime.strptime(cache_date, "%Y-%m-%d") - timedelta(days=KEEP_DAYS)
+        prune(cutoff.strftime("%Y-%m-%d"), cache_dir)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {
+        "url": url,
+        "final_url": response.url,
+        "status_code": response.status_code,
+        "encoding": response.encoding,
+        "headers": {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers},
+        "fetched_at": time.time(),
+    }
+    # Body first, then metadata: a reader never sees metadata pointing at a half-written body.
+    _write_atomic(body_path, response.content)
+    _write_atomic(meta_path, _encode_meta(meta))
+
+
+def _touch(url: str, cache_date: str, cache_dir: str, meta: dict) -> None:
+    meta_path, _ = _entry_paths(url, cache_date, cache_dir)
+    meta["fetched_at"] = time.time()
+    _write_atomic(meta_path, _encode_meta(meta))
+
+
+def _to_response(meta: dict, body: bytes):
+    response = requests.Response()
+    response.status_code = meta["status_code"]
+    response.url = meta.get("final_url") or meta["url"]
+    response.encoding = meta.get("encoding")
+    response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    response.headers["X-Cache"] = "HIT"
+    response._content = body
+    return response
+
+
+def cached_get(url: str, fetch, mode: str = None, cache_dir: str = None, **kwargs):
+    """
+    GET ``url`` through the cache, calling ``fetch(url, **kwargs)`` on a miss.
+
+    Only complete 200 responses are stored; anything else is returned uncached.
+    """
+    mode = mode or config.HTTP_CACHE_MODE
+    if mode not in CACHE_MODES:
+        logging.warning("Unknown HTTP_CACHE_MODE=%r; bypassing the HTTP cache.", mode)
+        mode = "off"
+    if mode == "off":
+        return fetch(url, **kwargs)
+
+    cache_dir = cache_dir or config.HTTP_CACHE_DIR
+    cache_date = _taipei_date()
+    cached = None if mode == "record" else _load(url, cache_date, cache_dir)
+
+    if mode == "replay":
+        if cached is None:
+            raise CacheMiss(f"No recorded response for {url} on {cache_date}")
+        return _to_response(*cached)
+
+    if cached is not None:
+        meta, body = cached
+        if time.time() - meta.get("fetched_at", 0) < config.HTTP_CACHE_MAX_AGE:
+            return _to_response(meta, body)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if meta["headers"].get("ETag"):
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        response = fetch(url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            _touch(url, cache_date, cache_dir, meta)
+            return _to_response(meta, body)
+    else:
+        response = fetch(url, **kwargs)
+
+    if response.status_code == 200 and not response.headers.get(TRUNCATED_HEADER):
+        try:
+            _store(url, cache_date, cache_dir, response)
+        except OSError as error:
+            logging.warning("Could not write HTTP cache entry for %s: %s", url, error)
+    return response
+
+
+def prune(before_date: str, cache_dir: str = None) -> list:
+    """Delete cached days earlier than ``before_date``."""
+    cache_dir = cache_dir or config.HTTP_CACHE_DIR
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return []
+
+    removed = []
+    for name in sorted(names):
+        if _DATE_DIRECTORY.fullmatch(name) and name < before_date:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+            removed.append(name)
+    return removed
@@ -0,0 +1,151 @@
+"""
+Shared HTTP client for every outbound call.
+
+One ``requests.Session`` per process keeps a keep-alive connection pool per
+host, so a Telegram fan-out or a series of bible.com fetches pays for the
+TCP/TLS handshake once instead of once per request. The session also applies
+a default timeout and a retry policy, and reports every response to the
+registered metrics hooks.
+
+Registered request gates run before every request is sent, which lets a
+batch job such as the backfill rate-limit each outbound request.
+
+Retries are limited to connection failures for every method and to
+429/5xx responses for idempotent GET/HEAD requests; POSTs such as
+``sendMessage`` are never resent after the server may have acted on them.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import config
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+_metrics_hooks = []
+_request_gates = []
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {"requests": 0, "errors": 0, "elapsed_ms": 0.0, "bytes_in": 0})
+
+
+def _build_session():
+    # requests is imported here so `import http_client` stays cheap for entry points that never call out.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        connect=config.HTTP_MAX_RETRIES,
+        read=config.HTTP_MAX_RETRIES,
+        status=config.HTTP_MAX_RETRIES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        status_forcelist=RETRY_STATUS_CODES,
+        backoff_factor=0.5,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=config.HTTP_POOL_MAXSIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(_record_response)
+    return session
+
+
+def get_session():
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close() -> None:
+    """Close pooled connections; the next request opens a fresh session."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def add_metrics_hook(hook) -> None:
+    """Register ``hook(method, url, status_code, elapsed_ms, bytes_in)``, called after every response."""
+    _metrics_hooks.append(hook)
+
+
+def remove_metrics_hook(hook) -> None:
+    if hook in _metrics_hooks:
+        _metrics_hooks.remove(hook)
+
+
+def add_request_gate(gate) -> None:
+    """Register ``gate()``, called before every outbound request; it may block to throttle the caller."""
+    _request_gates.append(gate)
+
+
+def remove_request_gate(gate) -> None:
+    if gate in _request_gates:
+        _request_gates.remove(gate)
+
+
+def throttle() -> None:
+    """Pass every request gate; also called for connections opened outside the shared session."""
+    for gate in list(_request_gates):
+        gate()
+
+
+def _record_response(response, *args, **kwargs):
+    elapsed_ms = response.elapsed.total_seconds() * 1000
+    content_length = response.headers.get("Content-Length", "")
+    bytes_in = int(content_length) if content_length.isdigit() else 0
+    host = urlsplit(response.url).netloc
+    with _stats_lock:
+        entry = _stats[host]
+        entry["requests"] += 1
+        entry["errors"] += response.status_code >= 400
+        entry["elapsed_ms"] = round(entry["elapsed_ms"] + elapsed_ms, 3)
+        entry["bytes_in"] += bytes_in
+    for hook in list(_metrics_hooks):
+        try:
+            hook(response.request.method, response.url, response.status_code, elapsed_ms, bytes_in)
+        except Exception as error:
+            logging.warning("HTTP metrics hook failed: %s: %s", type(error).__name__, error)
+    return response
+
+
+def stats() -> dict:
+    """Per-host request counts, error counts, server time and response bytes since the last reset."""
+    with _stats_lock:
+        return {host: dict(entry) for host, entry in _stats.items()}
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def request(method: str, url: str, timeout=None, **kwargs):
+    """Send a request through the shared session with the default timeout applied."""
+    throttle()
+    return get_session().request(method, url, timeout=timeout or config.HTTP_DEFAULT_TIMEOUT, **kwargs)
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs):
+    return request("PUT", url, **kwargs)
@@ -0,0 +1,96 @@
+"""
+End-to-end load test against the local fake services.
+
+Starts ``fake_services.FakeServices``, points every base URL at it, then runs
+the full daily pipeline with a temporary run directory and prints the per-span
+timing summary alongside the request count each fake service received.
+
+使用方式：
+    python load_test.py
+    python load_test.py --telegram-chats 10000 --subscribers 100000
+    python load_test.py --service openai:800 --service telegram:40:0.01:30 --report load.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from fake_services import FakeServices, parse_behavior
+
+
+def _configure_environment(services: FakeServices, telegram_chats: int) -> None:
+    os.environ.update(services.environment())
+    os.environ.update({
+        "OPENAI_API_KEY": "fake-openai-key",
+        "LINE_CHANNEL_ACCESS_TOKEN": "fake-line-token",
+        "LINE_CHANNEL_SECRET": "fake-line-secret",
+        "TELEGRAM_BOT_TOKEN": "fake-telegram-token",
+        "TELEGRAM_CHAT_IDS": ",".join(str(100000 + index) for index in range(telegram_chats)),
+        "SUPABASE_SERVICE_KEY": "fake-service-key",
+        "AUDIO_UPLOAD_SECRET": "fake-upload-secret",
+        "HTTP_CACHE_MODE": "off",
+        "BIBLE_STORE_PATH": "",
+        "VOTD_CALENDAR_PATH": "",
+        "EXPOSITION_CACHE_DIR": "",
+        "TTS_CACHE_DIR": "",
+        "DRY_RUN": "false",
+        "RUN_MODE": "production",
+    })
+    # VAPID_PRIVATE_KEY must be a real key for pywebpush; leave Web Push off unless one is exported.
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--telegram-chats", type=int, default=100, help="Number of Telegram chat IDs.")
+    parser.add_argument("--subscribers", type=int, default=100, help="Number of Web Push subscribers.")
+    parser.add_argument(
+        "--service",
+        action="append",
+        default=[],
+        metavar="NAME:LATENCY_MS[:ERROR_RATE[:RATE_LIMIT]]",
+        help="Latency, error rate and requests-per-second limit for one fake service.",
+    )
+    parser.add_argument("--report", help="Write the JSON timing report to this path.")
+    args = parser.parse_args(argv)
+
+    behaviors = dict(parse_behavior(spec) for spec in args.service)
+    with FakeServices(behaviors=behaviors, subscribers=args.subscribers) as services, \
+            tempfile.TemporaryDirectory(prefix="daily-bible-load-") as run_dir:
+        _configure_environment(services, args.telegram_chats)
+
+        # Import after the environment is set so module-level config picks up the fakes.
+        import bot
+        import tracing
+        from run_store import RunStore
+
+        tracing.reset()
+        store = RunStore(datetime.now().strftime("%Y-%m-%d"), run_dir)
+        started = time.perf_counter()
+        with tracing.span("pipeline.run"):
+            succeeded = bot.run_daily_task(publish_date=store.publish_date, store=store)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        report = tracing.build_report()
+        print(f"{'span':<32}{'count':>8}{'total ms':>12}{'max ms':>10}{'errors':>8}")
+        for name, summary in sorted(report["summary"].items()):
+            print(
+                f"{name:<32}{summary['count']:>8}{summary['total_ms']:>12.1f}"
+                f"{summary['max_ms']:>10.1f}{summary['errors']:>8}"
+            )
+        print(f"\nWall clock: {wall_ms:.1f}ms  result: {'ok' if succeeded else 'failed'}")
+        print("Requests per fake service:", json.dumps(services.counts, sort_keys=True))
+        print(f"TCP connections opened: {services.connections}")
+
+        if args.report:
+            tracing.write_report(args.report)
+            print(f"Timing report written to {args.report}")
+
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
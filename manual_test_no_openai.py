@@ -2,9 +2,10 @@ import unittest
 from unittest.mock import patch
 import bot
 import logging
-from pydub import AudioSegment
 import os
 
+from fake_services import silent_mp3
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -12,8 +13,8 @@ def create_dummy_mp3(filename="dummy.mp3"):
     """Creates a 1-second silent MP3 file for testing."""
     if not os.path.exists(filename):
         logging.info(f"Creating dummy audio file: {filename}")
-        silent = AudioSegment.silent(duration=1000) # 1 second
-        silent.export(filename, format="mp3")
+        with open(filename, "wb") as audio_file:
+            audio_file.write(silent_mp3(42))  # 42 frames of 24 ms ≈ 1 second
     return filename
 
 def run_integration_test():
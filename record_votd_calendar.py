@@ -0,0 +1,83 @@
+"""
+Fill the verse-of-the-day calendar used by ``get_daily_verse``.
+
+Crawls Bible.com's ``verse-of-the-day?day=N`` pages once and stores each
+day's reference, OSIS id and image, so daily runs can skip the reference
+request entirely. Days already in the index are skipped unless ``--force``.
+
+使用方式：
+    python record_votd_calendar.py
+    python record_votd_calendar.py --days 1-31 --delay 2
+    python record_votd_calendar.py --days 45,46 --force --calendar /tmp/votd_calendar.json
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+import scraper
+import config
+from votd_calendar import VotdCalendar
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def parse_days(value: str) -> list:
+    """``"1-3,10"`` → ``[1, 2, 3, 10]``; days are 1-366."""
+    days = set()
+    for part in value.split(","):
+        first, _, last = part.strip().partition("-")
+        days.update(range(int(first), int(last or first) + 1))
+    if not days or min(days) < 1 or max(days) > 366:
+        raise argparse.ArgumentTypeError(f"Days must be between 1 and 366: {value!r}")
+    return sorted(days)
+
+
+def record_day(calendar: VotdCalendar, day_of_year: int) -> bool:
+    """Scrape one day and store it; False when no page yielded a reference."""
+    for url in (
+        f"{config.BIBLE_COM_BASE_URL}/zh-TW/verse-of-the-day?day={day_of_year}",
+        f"{config.BIBLE_COM_BASE_URL}/verse-of-the-day?day={day_of_year}",
+    ):
+        result = scraper._fetch_reference(url)
+        if result:
+            ref_title, data, osis_reference = result
+            calendar.put(day_of_year, ref_title, osis_reference, scraper._image_url(data))
+            logging.info("Day %d: %s", day_of_year, ref_title)
+            return True
+    logging.warning("Day %d: no reference found", day_of_year)
+    return False
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=parse_days, default=list(range(1, 367)), help="Days to record, e.g. 1-31,60.")
+    parser.add_argument("--delay", type=float, default=1.0, help="Seconds between days.")
+    parser.add_argument("--force", action="store_true", help="Re-scrape days already in the index.")
+    parser.add_argument("--calendar", help="Calendar path (default: VOTD_CALENDAR_PATH).")
+    args = parser.parse_args(argv)
+
+    calendar = VotdCalendar(args.calendar)
+    if not calendar.path:
+        print("❌ VOTD_CALENDAR_PATH is empty; set it or pass --calendar.")
+        return 1
+
+    failed = []
+    for index, day_of_year in enumerate(args.days):
+        if not args.force and calendar.get(day_of_year):
+            continue
+        if index and args.delay:
+            time.sleep(args.delay)
+        if not record_day(calendar, day_of_year):
+            failed.append(day_of_year)
+
+    print(f"✅ {len(calendar)} days in {calendar.path}")
+    if failed:
+        print(f"❌ No reference for days: {', '.join(map(str, failed))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
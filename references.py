@@ -0,0 +1,206 @@
+"""
+Bible reference parsing for English and Traditional Chinese book names.
+
+Every book name and alias from ``bible_books`` is compiled once into a
+prefix trie, and the trie is emitted as a single factored regular
+expression, so a scan costs one pass of the regex engine however many
+names there are. References parse into integers — book number 1-66,
+chapter and verse ranges — which is the key form the verse store uses.
+
+``parse_many`` normalizes a whole column of stored ``verse_reference``
+values in one scan over the joined, de-duplicated text.
+
+使用方式：
+    python references.py "以弗所書 3章20-21節" "1 John 4:16"
+    python references.py < references.txt
+"""
+
+import re
+import sys
+from bisect import bisect_right
+from typing import NamedTuple
+
+from bible_books import BOOKS, CODE_BY_BOOK
+
+
+# Spellings Bible.com and older rows use besides the canonical English name.
+ALIASES = {"Psalm": 19}
+
+_ENGLISH_BY_BOOK = {number: english for number, _, english, _, _ in BOOKS}
+_CHINESE_BY_BOOK = {number: chinese for number, _, _, chinese, _ in BOOKS}
+_VERSE_SEPARATOR = re.compile(r"\s*([-–—,，、])\s*")
+_SEGMENT_SEPARATOR = "\x00"
+
+
+class Reference(NamedTuple):
+    """``Ephesians 3:20-21`` → ``Reference(49, 3, ((20, 21),))``."""
+
+    book: int
+    chapter: int
+    verses: tuple
+
+    @property
+    def first(self) -> int:
+        return self.verses[0][0]
+
+    @property
+    def last(self) -> int:
+        return self.verses[-1][1]
+
+    @property
+    def osis(self) -> str:
+        """``"EPH.3.20-21"``; empty for discontiguous verse lists, which OSIS ids cannot express."""
+        if len(self.verses) != 1:
+            return ""
+        osis = f"{CODE_BY_BOOK[self.book]}.{self.chapter}.{self.first}"
+        return f"{osis}-{self.last}" if self.last != self.first else osis
+
+    def verses_text(self) -> str:
+        return ",".join(f"{first}-{last}" if last != first else str(first) for first, last in self.verses)
+
+    def english(self) -> str:
+        return f"{_ENGLISH_BY_BOOK[self.book]} {self.chapter}:{self.verses_text()}"
+
+    def chinese(self) -> str:
+        return f"{_CHINESE_BY_BOOK[self.book]} {self.chapter}章{self.verses_text()}節"
+
+
+class ReferenceMatch(NamedTuple):
+    reference: Reference
+    name: str  # the matched book name in its canonical spelling, e.g. "Psalm" or "詩篇"
+    verses: str  # chapter and verses as written, separators normalized: "3:20-21" or "3:20,22"
+    start: int
+    end: int
+
+    @property
+    def text(self) -> str:
+        return f"{self.name} {self.verses}"
+
+
+def _trie_pattern(names) -> str:
+    """Factor ``names`` into one regex that walks a prefix trie and prefers the longest name."""
+    trie = {}
+    for name in names:
+        node = trie
+        for char in name.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class ReferenceParser:
+    """One compiled matcher over a fixed set of book names."""
+
+    def __init__(self, english: bool = True, chinese: bool = True):
+        names = {}
+        for number, _, english_name, chinese_name, _ in BOOKS:
+            if english:
+                names[english_name] = number
+            if chinese:
+                names[chinese_name] = number
+        if english:
+            names.update(ALIASES)
+        self._books = {name.lower(): (number, name) for name, number in names.items()}
+        self._pattern = re.compile(
+            rf"(?<![A-Za-z0-9])(?P<book>{_trie_pattern(names)})\s*"
+            r"(?P<chapter>\d+)\s*(?:[:：]|章)\s*"
+            r"(?P<verses>\d+(?:\s*[-–—,，、]\s*\d+)*)\s*節?",
+            re.IGNORECASE,
+        )
+
+    def _to_match(self, match) -> ReferenceMatch:
+        number, name = self._books[re.sub(r"\s+", " ", match.group("book")).lower()]
+        chapter = int(match.group("chapter"))
+        verses, dash = [], False
+        for token in _VERSE_SEPARATOR.split(match.group("verses")):
+            if token in ("-", "–", "—"):
+                dash = True
+            elif token.isdigit():
+                if dash and verses:
+                    # "3:16-4:2" crosses a chapter; keep the verses of the first chapter only.
+                    if int(token) >= verses[-1][0]:
+                        verses[-1] = (verses[-1][0], int(token))
+                else:
+                    verses.append((int(token), int(token)))
+                dash = False
+        verses_text = _VERSE_SEPARATOR.sub(
+            lambda separator: "," if separator.group(1) in ",，、" else "-", match.group("verses")
+        )
+        return ReferenceMatch(
+            Reference(number, chapter, tuple(verses)),
+            name,
+            f"{chapter}:{verses_text}",
+            match.start(),
+            match.end(),
+        )
+
+    def find(self, text: str):
+        """First reference in ``text`` as a ``ReferenceMatch``, or None."""
+        match = self._pattern.search(text) if text else None
+        return self._to_match(match) if match else None
+
+    def parse(self, text: str):
+        found = self.find(text)
+        return found.reference if found else None
+
+    def parse_many(self, texts) -> list:
+        """First reference of each text (or None), in input order, from a single scan."""
+        texts = list(texts)
+        unique = list(dict.fromkeys(text or "" for text in texts))
+        starts, offset = [], 0
+        for text in unique:
+            starts.append(offset)
+            offset += len(text) + 1
+        joined = _SEGMENT_SEPARATOR.join(text.replace(_SEGMENT_SEPARATOR, " ") for text in unique)
+
+        parsed = {}
+        for match in self._pattern.finditer(joined):
+            text = unique[bisect_right(starts, match.start()) - 1]
+            if text not in parsed:
+                parsed[text] = self._to_match(match).reference
+        return [parsed.get(text or "") for text in texts]
+
+
+PARSER = ReferenceParser()
+ENGLISH_PARSER = ReferenceParser(chinese=False)
+
+
+def find(text: str):
+    return PARSER.find(text)
+
+
+def parse(text: str):
+    return PARSER.parse(text)
+
+
+def parse_many(texts) -> list:
+    return PARSER.parse_many(texts)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    texts = argv or [line.rstrip("\n") for line in sys.stdin]
+    failed = 0
+    for text, reference in zip(texts, parse_many(texts)):
+        if reference:
+            print(f"{text}\t{reference.osis or reference.english()}\t{reference.chinese()}")
+        else:
+            failed += 1
+            print(f"{text}\t-")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Per-date run directory holding the artifacts of each pipeline stage."""
+
+import json
+import logging
+import os
+import re
+import shutil
+
+import config
+
+
+PIPELINE_STAGES = ("verse", "exposition", "audio", "upload", "deliver")
+
+# Artifact file written when each stage completes.
+_STAGE_FILES = {
+    "verse": "verse.json",
+    "exposition": "exposition.json",
+    "audio": "audio.json",
+    "upload": "upload.json",
+    "deliver": "delivery.json",
+}
+
+AUDIO_FILENAME = "daily_message.mp3"
+_DATE_DIRECTORY = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class RunStore:
+    """Read and write stage artifacts under ``<base_dir>/<publish_date>/``."""
+
+    def __init__(self, publish_date: str, base_dir: str = None):
+        self.publish_date = publish_date
+        self.directory = os.path.join(base_dir or config.RUN_ARTIFACTS_DIR, publish_date)
+
+    @property
+    def audio_path(self) -> str:
+        return os.path.join(self.directory, AUDIO_FILENAME)
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def has(self, stage: str) -> bool:
+        if not os.path.isfile(self.path(_STAGE_FILES[stage])):
+            return False
+        if stage == "audio":
+            return os.path.isfile(self.audio_path) and os.path.getsize(self.audio_path) > 0
+        return True
+
+    def load(self, stage: str):
+        """Return the stored artifact for a stage, or None when it is missing or unreadable."""
+        if not self.has(stage):
+            return None
+        try:
+            with open(self.path(_STAGE_FILES[stage]), "r", encoding="utf-8") as artifact_file:
+                return json.load(artifact_file)
+        except (OSError, ValueError) as error:
+            logging.warning(
+                "Ignoring unreadable %s artifact in %s: %s: %s",
+                stage,
+                self.directory,
+                type(error).__name__,
+                str(error),
+            )
+            return None
+
+    def save(self, stage: str, data) -> None:
+        """Atomically write a stage artifact so a crash never leaves half a file behind."""
+        os.makedirs(self.directory, exist_ok=True)
+        target_path = self.path(_STAGE_FILES[stage])
+        temp_path = f"{target_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as artifact_file:
+            json.dump(data, artifact_file, ensure_ascii=False, indent=2)
+        os.replace(temp_path, target_path)
+
+    def completed_stages(self) -> list:
+        return [stage for stage in PIPELINE_STAGES if self.has(stage)]
+
+    @staticmethod
+    def prune(before_date: str, base_dir: str = None) -> list:
+        """Delete run directories for publish dates earlier than ``before_date``."""
+        base_dir = base_dir or config.RUN_ARTIFACTS_DIR
+        try:
+            names = os.listdir(base_dir)
+        except FileNotFoundError:
+            return []
+
+        removed = []
+        for name in sorted(names):
+            if _DATE_DIRECTORY.fullmatch(name) and name < before_date:
+                shutil.rmtree(os.path.join(base_dir, name), ignore_errors=True)
+                removed.append(name)
+        return removed
@@ -1,13 +1,28 @@
+import contextvars
 import html
 import json
 import logging
 import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
 from datetime import datetime
+from functools import cached_property, partial
 from urllib.parse import quote, urljoin
 from zoneinfo import ZoneInfo
 
 import requests
 from bs4 import BeautifulSoup
+from requests.structures import CaseInsensitiveDict
+
+from bible_books import CODE_BY_BOOK, osis_from_reference, parse_osis
+from bible_store import BibleStore
+import http_cache
+import http_client
+import config
+from references import ENGLISH_PARSER
+from tracing import span
+from votd_calendar import VotdCalendar
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
@@ -28,14 +43,6 @@ book_mapping = {
     "1 John": "約翰一書", "2 John": "約翰二書", "3 John": "約翰三書", "Jude": "猶大書", "Revelation": "啟示錄",
 }
 
-_BOOK_LOOKUP = {book.lower(): book for book in book_mapping}
-_BOOK_PATTERN = "|".join(re.escape(book) for book in sorted(book_mapping, key=len, reverse=True))
-_REFERENCE_PATTERN = re.compile(
-    rf"(?<![A-Za-z0-9])(?P<book>{_BOOK_PATTERN})\s+"
-    rf"(?P<verses>\d+:\d+(?:\s*[-–—,]\s*\d+)*)"
-    rf"\s*(?:\([^)]+\))?",
-    re.IGNORECASE,
-)
 _OSIS_PATTERN = re.compile(r"/(?:bible|compare)/(?:\d+/)?(?P<osis>[1-3A-Z]{3}\.\d+\.\d+(?:-\d+)?)", re.I)
 _CUNP_LINK_PATTERN = re.compile(r"/zh-TW/bible/\d+/[^\"']*CUNP", re.I)
 
@@ -50,36 +57,185 @@ HEADERS = {
 }
 
 
-def _normalize_reference(book: str, verses: str) -> str:
-    canonical_book = _BOOK_LOOKUP.get(book.lower(), book.strip())
-    normalized_verses = re.sub(r"\s*[–—]\s*", "-", verses)
-    normalized_verses = re.sub(r"\s*,\s*", ",", normalized_verses)
-    return f"{canonical_book} {normalized_verses.strip()}"
+_HREF_PATTERN = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+
+
+class ParsedPage:
+    """
+    One fetched HTML document shared by every extraction strategy.
+
+    Links are scanned straight from the raw HTML with a regex; the
+    BeautifulSoup tree and the flattened page text are built at most once,
+    and only when a strategy actually needs them.
+    """
+
+    def __init__(self, html_text: str, url: str = ""):
+        self.html = html_text or ""
+        self.url = url
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    @cached_property
+    def text(self) -> str:
+        return re.sub(r"\s+", " ", self.soup.get_text(" ", strip=True))
+
+    @cached_property
+    def hrefs(self) -> list:
+        return [html.unescape(double or single) for double, single in _HREF_PATTERN.findall(self.html)]
+
+
+def _as_page(document) -> ParsedPage:
+    return document if isinstance(document, ParsedPage) else ParsedPage(document)
+
+
+# Stream overlap: a marker split across two chunks is still found on the next scan.
+_STREAM_OVERLAP = 256
+
+
+class StreamStop:
+    """
+    Incremental stop condition for a streamed page download.
+
+    Each requirement is a sequence of byte patterns that must appear in order.
+    ``feed`` rescans only the newly arrived bytes and returns True once every
+    requirement is met; ``end`` is then the offset the body is cut at — the end
+    of the furthest final match, so a lookahead marker cuts just before the
+    element that follows what the extractor needs.
+    """
+
+    def __init__(self, *requirements):
+        self.requirements = [[re.compile(pattern, re.I) for pattern in requirement] for requirement in requirements]
+        self._stages = [0] * len(self.requirements)
+        self._positions = [0] * len(self.requirements)
+        self.end = 0
+
+    def feed(self, body) -> bool:
+        for index, patterns in enumerate(self.requirements):
+            while self._stages[index] < len(patterns):
+                match = patterns[self._stages[index]].search(body, self._positions[index])
+                if not match:
+                    self._positions[index] = max(self._positions[index], len(body) - _STREAM_OVERLAP)
+                    break
+                self._stages[index] += 1
+                self._positions[index] = match.end()
+        if all(stage == len(patterns) for stage, patterns in zip(self._stages, self.requirements)):
+            self.end = max(self._positions)
+            return True
+        return False
+
+
+def _votd_stream_stop() -> StreamStop:
+    """The verse-of-the-day page is complete once __NEXT_DATA__ has closed and an OSIS link has been seen."""
+    return StreamStop(
+        (rb'<script id="__NEXT_DATA__"', rb"</script>"),
+        (rb"""href\s*=\s*["'][^"']*/(?:bible|compare)/(?:\d+/)?[1-3A-Z]{3}\.\d+\.\d+""",),
+    )
+
+
+def _cunp_stream_stop(cunp_url: str):
+    """The CUNP page is complete at the first element after the last verse of the reference; None when unknown."""
+    match = _OSIS_PATTERN.search(cunp_url)
+    parsed = parse_osis(match.group("osis")) if match else None
+    if not parsed:
+        return None
+    book, chapter, _, last = parsed
+    last_usfm = re.escape(f"{CODE_BY_BOOK[book]}.{chapter}.{last}".encode("ascii"))
+    return StreamStop(
+        (
+            rb'data-usfm="' + last_usfm + rb'"',
+            rb'(?=<[a-z][^<>]*\bdata-usfm="(?!' + last_usfm + rb'")|</main>|</body>)',
+        ),
+    )
+
+
+def _streaming_get(url: str, stop: StreamStop, **kwargs):
+    """GET ``url`` in chunks and close the connection as soon as ``stop`` is satisfied."""
+    response = http_client.get(url, stream=True, **kwargs)
+    with closing(response):
+        if response.status_code != 200:
+            response.content
+            return response
+        body = bytearray()
+        stopped = False
+        for chunk in response.iter_content(chunk_size=config.SCRAPER_STREAM_CHUNK_BYTES):
+            body += chunk
+            if stop.feed(body):
+                stopped = True
+                break
+
+    streamed = requests.Response()
+    streamed.status_code = response.status_code
+    streamed.url = response.url
+    streamed.encoding = response.encoding
+    streamed.headers = CaseInsensitiveDict(response.headers)
+    streamed._content = bytes(body[:stop.end] if stopped else body)
+    if stopped:
+        streamed.headers.pop("Content-Length", None)
+        streamed.headers[http_cache.TRUNCATED_HEADER] = str(len(body))
+    return streamed
+
+
+def _http_get(url: str, stop: StreamStop = None, **kwargs):
+    """
+    GET a page through the HTTP cache inside a tracing span so every scraper request is timed.
+
+    With ``stop`` the page is streamed and cut short once the stop condition
+    is met; record mode always downloads whole pages for the corpus.
+    """
+    fetch = http_client.get
+    if stop is not None and config.SCRAPER_STREAMING and config.HTTP_CACHE_MODE != "record":
+        fetch = partial(_streaming_get, stop=stop)
+    with span("scraper.http", url=url) as http_span:
+        response = http_cache.cached_get(url, fetch, **kwargs)
+        http_span.attributes["status"] = response.status_code
+        http_span.attributes["cache"] = response.headers.get("X-Cache", "MISS")
+        if response.headers.get(http_cache.TRUNCATED_HEADER):
+            http_span.attributes["stopped_early"] = True
+            http_span.attributes["bytes_read"] = int(response.headers[http_cache.TRUNCATED_HEADER])
+        http_span.add_response(response)
+        return response
+
+
+def _fetch_page(url: str, stop: StreamStop, extract, is_complete=bool, **kwargs):
+    """
+    Fetch ``url`` (streamed when ``stop`` is given) and run ``extract`` on it.
+
+    A page that was cut short and still yields nothing is fetched again in
+    full, so a stop condition that fires too early costs a request, not a result.
+    """
+    response = _http_get(url, stop=stop, **kwargs)
+    response.raise_for_status()
+    result = extract(ParsedPage(response.text, response.url))
+    if not is_complete(result) and response.headers.get(http_cache.TRUNCATED_HEADER):
+        logging.warning("Streamed page %s was cut short without a result; fetching it in full.", url)
+        response = _http_get(url, **kwargs)
+        response.raise_for_status()
+        result = extract(ParsedPage(response.text, response.url))
+    return response, result
 
 
 def _find_reference(text: str) -> str:
-    if not text:
-        return ""
-    match = _REFERENCE_PATTERN.search(text)
-    if not match:
-        return ""
-    return _normalize_reference(match.group("book"), match.group("verses"))
+    found = ENGLISH_PARSER.find(text)
+    return found.text if found else ""
 
 
-def _find_osis_reference(soup: BeautifulSoup) -> str:
-    for element in soup.find_all(href=True):
-        match = _OSIS_PATTERN.search(element.get("href", ""))
+def _find_osis_reference(document) -> str:
+    for href in _as_page(document).hrefs:
+        match = _OSIS_PATTERN.search(href)
         if match:
             return match.group("osis").upper()
     return ""
 
 
-def _extract_reference_and_data(html_text: str):
+def _extract_reference_and_data(document):
     """Extract the English reference, page data, source, and OSIS reference."""
+    page = _as_page(document)
     data = {}
     next_data_match = re.search(
         r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>',
-        html_text,
+        page.html,
         re.S,
     )
     if next_data_match:
@@ -90,19 +246,23 @@ def _extract_reference_and_data(html_text: str):
                 reference_title = reference_title.get("title", "")
             reference = _find_reference(str(reference_title))
             if reference:
-                soup = BeautifulSoup(html_text, "html.parser")
-                return reference, data, "__NEXT_DATA__", _find_osis_reference(soup)
+                return reference, data, "__NEXT_DATA__", _find_osis_reference(page)
         except (TypeError, ValueError, json.JSONDecodeError) as error:
             logging.warning("Could not parse Bible.com __NEXT_DATA__: %s", error)
 
-    soup = BeautifulSoup(html_text, "html.parser")
-    osis = _find_osis_reference(soup)
+    soup = page.soup
+    osis = _find_osis_reference(page)
 
     if soup.title:
         reference = _find_reference(soup.title.get_text(" ", strip=True))
         if reference:
             return reference, data, "html-title", osis
 
+    # One scan of the whole text rules out pages with no reference before the per-element walk.
+    page_reference = _find_reference(page.text)
+    if not page_reference:
+        return "", data, "not-found", osis
+
     for element in soup.find_all(["a", "span", "p", "h1", "h2", "h3"]):
         reference = _find_reference(element.get_text(" ", strip=True))
         if reference:
@@ -112,42 +272,74 @@ def _extract_reference_and_data(html_text: str):
                 local_osis = match.group("osis").upper() if match else ""
             return reference, data, "visible-content", local_osis or osis
 
-    reference = _find_reference(soup.get_text(" ", strip=True))
-    if reference:
-        return reference, data, "page-text", osis
+    return page_reference, data, "page-text", osis
 
-    return "", data, "not-found", osis
+
+def _day_of_year(now=None) -> int:
+    return (now or datetime.now(ZoneInfo("Asia/Taipei"))).timetuple().tm_yday
+
+
+def _is_today(now=None) -> bool:
+    """True when ``now`` is unset or falls on today's date in Taipei."""
+    if now is None:
+        return True
+    taipei = ZoneInfo("Asia/Taipei")
+    if now.tzinfo is not None:
+        now = now.astimezone(taipei)
+    return now.date() == datetime.now(taipei).date()
 
 
 def _daily_verse_urls(now=None):
-    taipei_now = now or datetime.now(ZoneInfo("Asia/Taipei"))
-    day_of_year = taipei_now.timetuple().tm_yday
+    """Dated verse-of-the-day pages for ``now``; each serves the same verse, so they may be raced."""
+    day_of_year = _day_of_year(now)
     return [
-        f"https://www.bible.com/zh-TW/verse-of-the-day?day={day_of_year}",
-        f"https://www.bible.com/verse-of-the-day?day={day_of_year}",
-        "https://www.bible.com/zh-TW/verse-of-the-day",
+        f"{config.BIBLE_COM_BASE_URL}/zh-TW/verse-of-the-day?day={day_of_year}",
+        f"{config.BIBLE_COM_BASE_URL}/verse-of-the-day?day={day_of_year}",
     ]
 
 
-def _find_cunp_url(compare_html: str, compare_url: str) -> str:
-    soup = BeautifulSoup(compare_html, "html.parser")
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
-        label = link.get_text(" ", strip=True)
-        if "CUNP" in href.upper() or "新標點和合本" in label or "和合本" in label:
+def _undated_verse_url(now=None):
+    """The undated page, which always serves today's verse; None for any other date."""
+    return f"{config.BIBLE_COM_BASE_URL}/zh-TW/verse-of-the-day" if _is_today(now) else None
+
+
+def _find_cunp_url(document, compare_url: str) -> str:
+    page = _as_page(document)
+    for href in page.hrefs:
+        if "CUNP" in href.upper():
             return urljoin(compare_url, href)
 
-    match = _CUNP_LINK_PATTERN.search(compare_html)
+    # Links labelled 和合本 without CUNP in the href need the parsed tree.
+    for link in page.soup.find_all("a", href=True):
+        label = link.get_text(" ", strip=True)
+        if "新標點和合本" in label or "和合本" in label:
+            return urljoin(compare_url, link.get("href", ""))
+
+    match = _CUNP_LINK_PATTERN.search(page.html)
     return urljoin(compare_url, match.group(0)) if match else ""
 
 
 def _direct_cunp_url(osis_reference: str) -> str:
     """Build the YouVersion CUNP-神 URL using version id 46."""
-    return f"https://www.bible.com/zh-TW/bible/46/{osis_reference}.CUNP-%E7%A5%9E"
+    return f"{config.BIBLE_COM_BASE_URL}/zh-TW/bible/46/{osis_reference}.CUNP-%E7%A5%9E"
+
 
+# The shortest verses (約翰福音 11:35 「耶穌哭了。」) have four characters.
+_MIN_VERSE_CHINESE_CHARS = 4
+
+# Translation names and page chrome that sit next to the verse on Bible.com.
+# A page scrap made only of these is a label, not verse text.
+_PAGE_LABEL_PATTERN = re.compile(
+    r"新標點和合本|和合本修訂版|和合本|新譯本|當代譯本|譯本|聖經|神版|上帝版|對照|比較|分享|閱讀|聆聽"
+)
 
-def _has_chinese_text(value: str, minimum: int = 8) -> bool:
-    return sum("\u4e00" <= char <= "\u9fff" for char in value) >= minimum
+
+def _has_chinese_text(value: str) -> bool:
+    return sum("\u4e00" <= char <= "\u9fff" for char in value) >= _MIN_VERSE_CHINESE_CHARS
+
+
+def _is_page_label(value: str) -> bool:
+    return not any("\u4e00" <= char <= "\u9fff" for char in _PAGE_LABEL_PATTERN.sub("", value))
 
 
 def _clean_cunp_candidate(value: str) -> str:
@@ -167,12 +359,11 @@ def _clean_cunp_candidate(value: str) -> str:
         maxsplit=1,
     )[0]
     value = re.sub(r"^\d+\s*", "", value).strip(" -|\n\t")
-    return value if _has_chinese_text(value) else ""
+    return value if _has_chinese_text(value) and not _is_page_label(value) else ""
 
 
-def _extract_cunp_from_compare_page(compare_html: str) -> str:
-    soup = BeautifulSoup(compare_html, "html.parser")
-    page_text = re.sub(r"\s+", " ", soup.get_text(" ", strip=True))
+def _extract_cunp_from_compare_page(document) -> str:
+    page_text = _as_page(document).text
 
     for match in re.finditer(r"CUNP(?:-神)?", page_text, re.I):
         segment = page_text[match.end():]
@@ -189,8 +380,8 @@ def _extract_cunp_from_compare_page(compare_html: str) -> str:
     return ""
 
 
-def _extract_cunp_text(verse_html: str) -> str:
-    soup = BeautifulSoup(verse_html, "html.parser")
+def _extract_cunp_text(document) -> str:
+    soup = _as_page(document).soup
 
     fragments = []
     for element in soup.select("[data-usfm]"):
@@ -230,39 +421,36 @@ def _extract_cunp_text(verse_html: str) -> str:
     return ""
 
 
-def _fetch_cunp_from_youversion(osis_reference: str) -> str:
-    compare_url = f"https://www.bible.com/zh-TW/bible/compare/{osis_reference}"
-    cunp_url = ""
-
-    try:
-        compare_response = requests.get(compare_url, headers=HEADERS, timeout=15)
-        compare_response.raise_for_status()
+def _fetch_cunp_text(cunp_url: str) -> str:
+    _, verse_text = _fetch_page(cunp_url, _cunp_stream_stop(cunp_url), _extract_cunp_text, headers=HEADERS, timeout=15)
+    if not verse_text:
+        raise ValueError("CUNP verse text was empty on Bible.com")
+    return verse_text
 
-        compare_text = _extract_cunp_from_compare_page(compare_response.text)
-        if compare_text:
-            logging.info("Extracted CUNP verse directly from Bible.com comparison page.")
-            return compare_text
 
-        cunp_url = _find_cunp_url(compare_response.text, compare_response.url)
-    except requests.RequestException as error:
-        logging.warning("Bible.com comparison page request failed: %s", error)
+def _fetch_cunp_from_compare_page(osis_reference: str) -> str:
+    """CUNP text from the comparison page, following its CUNP link when the text is not inline."""
+    compare_url = f"{config.BIBLE_COM_BASE_URL}/zh-TW/bible/compare/{osis_reference}"
+    compare_response = _http_get(compare_url, headers=HEADERS, timeout=15)
+    compare_response.raise_for_status()
 
-    if not cunp_url:
-        cunp_url = _direct_cunp_url(osis_reference)
-        logging.info("CUNP link absent on comparison page; using direct Bible.com CUNP URL.")
+    compare_page = ParsedPage(compare_response.text, compare_response.url)
+    compare_text = _extract_cunp_from_compare_page(compare_page)
+    if compare_text:
+        logging.info("Extracted CUNP verse directly from Bible.com comparison page.")
+        return compare_text
 
-    verse_response = requests.get(cunp_url, headers=HEADERS, timeout=15)
-    verse_response.raise_for_status()
-    verse_text = _extract_cunp_text(verse_response.text)
-    if not verse_text:
-        raise ValueError("CUNP verse text was empty on Bible.com")
-    return verse_text
+    cunp_url = _find_cunp_url(compare_page, compare_response.url)
+    if not cunp_url or cunp_url == _direct_cunp_url(osis_reference):
+        # The direct CUNP source is already fetching this page.
+        raise ValueError("Comparison page has no CUNP text or alternate CUNP link")
+    return _fetch_cunp_text(cunp_url)
 
 
 def _fetch_cuv_fallback(eng_book: str, verses_ref: str) -> str:
     query = f"{eng_book} {verses_ref}"
-    api_url = f"https://bible-api.com/{quote(query)}?translation=cuv"
-    response = requests.get(api_url, timeout=15)
+    api_url = f"{config.BIBLE_API_BASE_URL}/{quote(query)}?translation=cuv"
+    response = _http_get(api_url, timeout=15)
     response.raise_for_status()
     data = response.json()
     text = data.get("text", "").strip()
@@ -271,30 +459,234 @@ def _fetch_cuv_fallback(eng_book: str, verses_ref: str) -> str:
     return text
 
 
+def _resolve_verse_text(osis_reference: str, eng_book: str, verses_ref: str, verse_span) -> tuple:
+    """
+    Query every verse-text source at once and choose by preference, not arrival.
+
+    Bible.com CUNP (comparison page, direct page) ranks above bible-api.com
+    CUV. The first valid CUNP text ends the race immediately; a CUV answer
+    is only used once every CUNP source has failed. Returns (text, source).
+    """
+    sources = []
+    if osis_reference:
+        sources.append(("cunp-compare", 0, _fetch_cunp_from_compare_page, (osis_reference,)))
+        sources.append(("cunp-direct", 0, _fetch_cunp_text, (_direct_cunp_url(osis_reference),)))
+    sources.append(("cuv-api", 1, _fetch_cuv_fallback, (eng_book, verses_ref)))
+
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="verse-text")
+    futures = {
+        executor.submit(contextvars.copy_context().run, fetch, *args): (name, rank)
+        for name, rank, fetch, args in sources
+    }
+    best = None
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, rank = futures[future]
+                try:
+                    text = future.result()
+                except (requests.RequestException, ValueError) as error:
+                    logging.warning("Verse text source %s failed: %s", name, error)
+                    verse_span.retries += 1
+                    continue
+                if not _has_chinese_text(text):
+                    logging.warning("Verse text source %s returned no Chinese text.", name)
+                    continue
+                if best is None or rank < best[0]:
+                    best = (rank, name, text)
+            if best and not any(futures[future][1] < best[0] for future in pending):
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if best is None:
+        return "", ""
+    logging.info("Verse text resolved from %s.", best[1])
+    return best[2], best[1]
+
+
+def _cross_check_in_background(osis_reference: str, eng_book: str, verses_ref: str, local_text: str) -> None:
+    """Compare stored CUNP text with Bible.com off the critical path; mismatches are only logged."""
+    def check():
+        with span("scraper.cross_check", osis=osis_reference) as check_span:
+            network_text, source = _resolve_verse_text(osis_reference, eng_book, verses_ref, check_span)
+        if source.startswith("cunp") and re.sub(r"\s+", "", network_text) != re.sub(r"\s+", "", local_text):
+            logging.warning(
+                "Local Bible store text for %s differs from Bible.com: %r != %r",
+                osis_reference,
+                local_text,
+                network_text,
+            )
+
+    threading.Thread(target=check, name="verse-cross-check", daemon=True).start()
+
+
 def get_daily_verse(now=None):
     """Fetch today's reference, prefer Bible.com CUNP, then fall back to bible-api.com."""
-    ref_title = ""
-    data = {}
-    osis_reference = ""
+    with span("scraper.get_daily_verse") as verse_span:
+        result = _get_daily_verse(now, verse_span)
+        verse_span.attributes["found"] = bool(result)
+        return result
 
-    for url in _daily_verse_urls(now):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=15)
-            response.raise_for_status()
-            ref_title, data, source, osis_reference = _extract_reference_and_data(response.text)
-            if ref_title:
-                logging.info(
-                    "Bible.com reference extracted via %s from %s: %s (osis=%s)",
-                    source,
-                    response.url,
-                    ref_title,
-                    osis_reference or "not-found",
-                )
+
+def _fetch_reference(url: str):
+    """Fetch one verse-of-the-day URL; returns (reference, data, osis) or None when unusable."""
+    try:
+        response, extracted = _fetch_page(
+            url,
+            _votd_stream_stop(),
+            _extract_reference_and_data,
+            is_complete=lambda extracted: bool(extracted[0]),
+            headers=HEADERS,
+            timeout=15,
+        )
+    except requests.RequestException as error:
+        logging.warning("Bible.com request failed for %s: %s", url, error)
+        return None
+
+    ref_title, data, source, osis_reference = extracted
+    if not ref_title:
+        return None
+    logging.info(
+        "Bible.com reference extracted via %s from %s: %s (osis=%s)",
+        source,
+        response.url,
+        ref_title,
+        osis_reference or "not-found",
+    )
+    return ref_title, data, osis_reference
+
+
+def _race_reference_urls(urls: list, verse_span):
+    """
+    Hedged fetch: start the primary URL, add the next alternate whenever the
+    hedge delay passes or an in-flight request fails, and return the first
+    usable reference. Requests still in flight are abandoned, not awaited.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix="verse-hedge")
+    pending = set()
+    remaining = list(urls)
+    try:
+        while remaining or pending:
+            if remaining:
+                url = remaining.pop(0)
+                context = contextvars.copy_context()
+                pending.add(executor.submit(context.run, _fetch_reference, url))
+
+            timeout = config.SCRAPER_HEDGE_DELAY_MS / 1000 if remaining else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result:
+                    verse_span.attributes["hedged_requests"] = len(urls) - len(remaining)
+                    return result
+                verse_span.retries += 1
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _scrape_reference(now, verse_span):
+    urls = _daily_verse_urls(now)
+    result = None
+    if config.SCRAPER_HEDGED_FETCH:
+        result = _race_reference_urls(urls, verse_span)
+    else:
+        for url in urls:
+            result = _fetch_reference(url)
+            if result:
                 break
-        except requests.RequestException as error:
-            logging.warning("Bible.com request failed for %s: %s", url, error)
+            verse_span.retries += 1
+
+    # Never raced against the dated pages: a slow ?day= answer must not let it win.
+    undated_url = _undated_verse_url(now)
+    if not result and undated_url:
+        result = _fetch_reference(undated_url)
+        if not result:
+            verse_span.retries += 1
+    return result
+
+
+def _image_url(data):
+    images = data.get("images", []) if isinstance(data, dict) else []
+    renditions = images[0].get("renditions", []) if images else []
+    image_url = renditions[-1].get("url") if renditions else None
+    if image_url and image_url.startswith("//"):
+        image_url = "https:" + image_url
+    return image_url
+
+
+def _refresh_calendar_day(calendar: VotdCalendar, day_of_year: int, now, entry) -> bool:
+    """Scrape the day and record it when the index lacks it or Bible.com disagrees; True when updated."""
+    with span("scraper.calendar_refresh", day=day_of_year) as refresh_span:
+        result = _scrape_reference(now, refresh_span)
+    if not result:
+        return False
+    ref_title, data, osis_reference = result
+    if entry and (ref_title, osis_reference or entry.get("osis", "")) == (entry["reference"], entry.get("osis", "")):
+        return False
+    if entry:
+        logging.warning(
+            "Verse-of-the-day calendar day %d was %s; Bible.com now says %s. Index updated.",
+            day_of_year,
+            entry["reference"],
+            ref_title,
+        )
+    return calendar.put(day_of_year, ref_title, osis_reference, _image_url(data))
+
+
+def _refresh_calendar_in_background(calendar: VotdCalendar, day_of_year: int, now, entry: dict) -> None:
+    """Scrape the day off the critical path and update the index when Bible.com disagrees."""
+    threading.Thread(
+        target=_refresh_calendar_day,
+        args=(calendar, day_of_year, now, entry),
+        name="votd-calendar-refresh",
+        daemon=True,
+    ).start()
+
+
+def refresh_calendar_day(now=None) -> bool:
+    """
+    Check the calendar entry for ``now``'s day against Bible.com and correct it.
+
+    Meant for runs off the daily critical path (``bot.py pregenerate``), so
+    the daily run can trust a calendar hit without any Bible.com request.
+    Returns True when the index was updated.
+    """
+    calendar = VotdCalendar()
+    if not calendar.path:
+        return False
+    day_of_year = _day_of_year(now)
+    return _refresh_calendar_day(calendar, day_of_year, now, calendar.get(day_of_year))
+
+
+def _get_daily_verse(now, verse_span):
+    day_of_year = _day_of_year(now)
+    calendar = VotdCalendar()
+    entry = calendar.get(day_of_year)
+    if entry:
+        ref_title, osis_reference, image_url = entry["reference"], entry.get("osis", ""), entry.get("image_url")
+        verse_span.attributes["reference_source"] = "calendar"
+        logging.info("Reference for day %d read from the verse-of-the-day calendar: %s", day_of_year, ref_title)
+        if config.VOTD_CALENDAR_REFRESH:
+            _refresh_calendar_in_background(calendar, day_of_year, now, entry)
+    else:
+        ref_title, data, osis_reference = _scrape_reference(now, verse_span) or ("", {}, "")
+        image_url = _image_url(data)
+        if ref_title:
+            verse_span.attributes["reference_source"] = "bible.com"
+            calendar.put(day_of_year, ref_title, osis_reference, image_url)
 
     if not ref_title:
+        if not _is_today(now):
+            logging.error(
+                "No dated verse-of-the-day page answered for day %d (%s); the undated page only "
+                "serves today's verse, so it is not used for another date.",
+                day_of_year,
+                now.date(),
+            )
         logging.error("Could not find today's Bible reference after all fallbacks.")
         return None
 
@@ -307,34 +699,28 @@ def get_daily_verse(now=None):
     verses_ref = match.group(2).strip()
     chi_book = book_mapping.get(eng_book, eng_book)
 
-    verse_text = ""
-    if osis_reference:
-        try:
-            verse_text = _fetch_cunp_from_youversion(osis_reference)
-            logging.info("Fetched CUNP verse from Bible.com.")
-        except (requests.RequestException, ValueError) as error:
-            logging.warning("Bible.com CUNP lookup failed; using CUV fallback: %s", error)
-
+    osis_reference = osis_reference or osis_from_reference(eng_book, verses_ref)
+    store = BibleStore()
+    verse_text, translation = store.lookup_preferred(osis_reference)
+    text_source = f"local-{translation.lower()}" if verse_text else ""
+    if translation == "CUNP":
+        logging.info("Verse text read from the local Bible store (%s).", osis_reference)
+        if config.BIBLE_STORE_VERIFY:
+            _cross_check_in_background(osis_reference, eng_book, verses_ref, verse_text)
+    else:
+        # A locally stored CUV text is only the fallback; Bible.com CUNP is still preferred.
+        network_text, network_source = _resolve_verse_text(osis_reference, eng_book, verses_ref, verse_span)
+        if network_text:
+            verse_text, text_source = network_text, network_source
+            store.learn(osis_reference, verse_text, "CUV" if network_source == "cuv-api" else "CUNP")
     if not verse_text:
-        try:
-            verse_text = _fetch_cuv_fallback(eng_book, verses_ref)
-            logging.info("Fetched CUV verse from bible-api.com fallback.")
-        except (requests.RequestException, ValueError) as error:
-            logging.error("All Chinese verse sources failed: %s", error)
-            return None
+        logging.error("All Chinese verse sources failed.")
+        return None
+    verse_span.attributes["text_source"] = text_source
 
     chapter, verses = verses_ref.split(":", 1)
     formatted_ref = f"{chi_book} {chapter}章{verses}節"
 
-    image_url = None
-    images = data.get("images", []) if isinstance(data, dict) else []
-    if images:
-        renditions = images[0].get("renditions", [])
-        if renditions:
-            image_url = renditions[-1].get("url")
-            if image_url and image_url.startswith("//"):
-                image_url = "https:" + image_url
-
     return {"text": verse_text, "reference": formatted_ref, "image_url": image_url}
 
 
@@ -1,26 +1,36 @@
+import asyncio
+import hashlib
+import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
 import audio_gen
+import fake_services
+import tts_transcript
 
 
 class FakeEdgeCommunicate:
-    def __init__(self, calls, payload=b"edge-audio", error=None, partial=False):
+    def __init__(self, calls, payload=b"edge-audio", error=None, partial=False, words=()):
         self.calls = calls
         self.payload = payload
         self.error = error
         self.partial = partial
+        self.words = words
 
-    async def save(self, path):
+    async def stream(self):
         if self.partial:
-            with open(path, "wb") as audio_file:
-                audio_file.write(b"partial")
+            yield {"type": "audio", "data": b"partial"}
         if self.error:
             raise self.error
-        with open(path, "wb") as audio_file:
-            audio_file.write(self.payload)
+        for offset, word in self.words:
+            yield {"type": "WordBoundary", "offset": offset * 10_000, "duration": 2_000_000, "text": word}
+        half = len(self.payload) // 2
+        yield {"type": "audio", "data": self.payload[:half]}
+        yield {"type": "audio", "data": self.payload[half:]}
 
 
 class FakeOpenAIResponse:
@@ -37,12 +47,18 @@ class FakeOpenAIResponse:
     def iter_content(self, chunk_size=1024):
         yield self.payload
 
+    def close(self):
+        self.closed = True
+
 
 class TestAudioGeneration(unittest.TestCase):
     def setUp(self):
         self.openai_key_patcher = patch.object(audio_gen, "OPENAI_API_KEY", "test-openai-key")
         self.openai_key_patcher.start()
         self.addCleanup(self.openai_key_patcher.stop)
+        cache_patcher = patch.object(audio_gen, "TTS_CACHE_DIR", "")
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
         self.async_sleeps = []
         self.sync_sleeps = []
 
@@ -80,10 +96,42 @@ class TestAudioGeneration(unittest.TestCase):
             self.assertEqual(calls[0]["rate"], "-5%")
             self.assertEqual(calls[0]["volume"], "+0%")
             self.assertEqual(calls[0]["pitch"], "+0Hz")
+            self.assertEqual(calls[0]["boundary"], "WordBoundary")
             self.assertNotIn(audio_gen.TTS_STYLE_INSTRUCTIONS, calls[0]["text"])
             openai.assert_not_called()
             self.assertTrue(os.path.exists(output_path))
 
+    def test_edge_stream_is_written_and_word_boundaries_kept(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "daily_message.mp3")
+            payload = b"\x00" * 6000  # 1 s at Edge's 48 kbps
+            calls = []
+            communicate = FakeEdgeCommunicate(calls, payload=payload, words=[(100, "今日"), (350, "靈修"), (900, "阿們")])
+            constructor = self._edge_constructor_from_sequence([communicate], calls)
+
+            with patch.object(audio_gen.edge_tts, "Communicate", side_effect=constructor), \
+                 patch.object(audio_gen, "prepare_tts_text", side_effect=lambda text: text):
+                audio_gen.generate_audio("今日靈修。\n阿們。", output_path)
+
+            with open(output_path, "rb") as audio_file:
+                self.assertEqual(audio_file.read(), payload)
+            transcript = tts_transcript.load(output_path)
+            self.assertEqual(transcript["duration_ms"], 1000.0)
+            self.assertEqual(transcript["words"], [[100.0, 200.0, 0, "今日"], [350.0, 200.0, 2, "靈修"], [900.0, 200.0, 6, "阿們"]])
+            self.assertEqual(transcript["segments"][0]["sha256"], hashlib.sha256(payload).hexdigest())
+            self.assertEqual(tts_transcript.offset_at(transcript, 5), 900.0)
+
+    def test_openai_audio_leaves_no_stale_transcript(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "daily_message.mp3")
+            tts_transcript.save(output_path, tts_transcript.build("舊的", 10.0, []))
+
+            with patch.object(audio_gen, "EDGE_TTS_ENABLED", False), \
+                 patch.object(audio_gen.http_client, "post", return_value=FakeOpenAIResponse()):
+                self.assertEqual(audio_gen.generate_audio("普通文字", output_path), output_path)
+
+            self.assertIsNone(tts_transcript.load(output_path))
+
     def test_edge_first_failure_second_success_sleeps_two_seconds(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             output_path = os.path.join(temp_dir, "daily_message.mp3")
@@ -152,7 +200,7 @@ class TestAudioGeneration(unittest.TestCase):
             with patch.object(audio_gen.edge_tts, "Communicate", side_effect=constructor), \
                  patch.object(audio_gen.asyncio, "sleep", side_effect=self.fake_async_sleep), \
                  patch.object(audio_gen, "prepare_tts_text", return_value=spoken_text) as normalize, \
-                 patch.object(audio_gen.requests, "post", return_value=response) as post, \
+                 patch.object(audio_gen.http_client, "post", return_value=response) as post, \
                  patch.object(audio_gen.time, "sleep", side_effect=self.sync_sleeps.append):
                 result = audio_gen.generate_audio(original_text, output_path)
 
@@ -190,7 +238,7 @@ class TestAudioGeneration(unittest.TestCase):
             with patch.object(audio_gen.edge_tts, "Communicate", side_effect=constructor), \
                  patch.object(audio_gen.asyncio, "sleep", side_effect=self.fake_async_sleep), \
                  patch.object(
-                     audio_gen.requests,
+                     audio_gen.http_client,
                      "post",
                      side_effect=[response_failure, response_success],
                  ) as post, \
@@ -220,7 +268,7 @@ class TestAudioGeneration(unittest.TestCase):
             with patch.object(audio_gen.edge_tts, "Communicate", side_effect=constructor), \
                  patch.object(audio_gen.asyncio, "sleep", side_effect=self.fake_async_sleep), \
                  patch.object(
-                     audio_gen.requests,
+                     audio_gen.http_client,
                      "post",
                      return_value=openai_response,
                  ), \
@@ -235,5 +283,493 @@ class TestAudioGeneration(unittest.TestCase):
             self.assertFalse(os.path.exists(f"{output_path}.openai.tmp"))
 
 
+class SlowEdgeCommunicate:
+    """Edge stream that waits ``stall`` seconds before its first byte and ``tail`` seconds before its last."""
+
+    def __init__(self, stall=0.0, tail=0.0, payload=b"edge-audio"):
+        self.stall = stall
+        self.tail = tail
+        self.payload = payload
+
+    async def stream(self):
+        await asyncio.sleep(self.stall)
+        yield {"type": "audio", "data": self.payload[:1]}
+        await asyncio.sleep(self.tail)
+        yield {"type": "audio", "data": self.payload[1:]}
+
+
+class TestProviderHedging(unittest.TestCase):
+    def setUp(self):
+        for name, value in (
+            ("OPENAI_API_KEY", "test-openai-key"),
+            ("TTS_CACHE_DIR", ""),
+            ("TTS_HEDGE_FIRST_BYTE_MS", 50),
+        ):
+            patcher = patch.object(audio_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.output_path = os.path.join(self.temp_dir, "daily_message.mp3")
+
+    def _wait_for_quiet_directory(self):
+        """Abandoned providers clean up on their own threads; give them a moment."""
+        for _ in range(100):
+            leftovers = [name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")]
+            if not leftovers:
+                return []
+            threading.Event().wait(0.02)
+        return leftovers
+
+    def test_stalled_edge_is_hedged_and_openai_wins(self):
+        communicate = SlowEdgeCommunicate(stall=5)
+        with patch.object(audio_gen.edge_tts, "Communicate", return_value=communicate), \
+             patch.object(audio_gen.http_client, "post", return_value=FakeOpenAIResponse()) as post:
+            started = time.monotonic()
+            result = audio_gen.generate_audio("得著榮耀", self.output_path)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(result, self.output_path)
+        self.assertLess(elapsed, 2)
+        post.assert_called_once()
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"openai-audio")
+        self.assertIsNone(tts_transcript.load(self.output_path))
+        self.assertEqual(self._wait_for_quiet_directory(), [])
+
+    def test_edge_sending_audio_within_budget_is_not_hedged(self):
+        communicate = SlowEdgeCommunicate(tail=0.2)
+        with patch.object(audio_gen.edge_tts, "Communicate", return_value=communicate), \
+             patch.object(audio_gen.http_client, "post") as post:
+            result = audio_gen.generate_audio("得著榮耀", self.output_path)
+
+        self.assertEqual(result, self.output_path)
+        post.assert_not_called()
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"edge-audio")
+
+    def test_edge_finishing_first_after_hedge_wins_and_openai_stands_down(self):
+        communicate = SlowEdgeCommunicate(stall=0.15)
+        openai_release = threading.Event()
+        self.addCleanup(openai_release.set)
+
+        def slow_post(*args, **kwargs):
+            openai_release.wait(5)
+            return FakeOpenAIResponse()
+
+        with patch.object(audio_gen.edge_tts, "Communicate", return_value=communicate), \
+             patch.object(audio_gen.http_client, "post", side_effect=slow_post) as post:
+            result = audio_gen.generate_audio("得著榮耀", self.output_path)
+            openai_release.set()
+
+        self.assertEqual(result, self.output_path)
+        post.assert_called_once()
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"edge-audio")
+        self.assertIsNotNone(tts_transcript.load(self.output_path))
+        # Once released, the losing OpenAI request must not overwrite Edge's audio.
+        self.assertEqual(self._wait_for_quiet_directory(), [])
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"edge-audio")
+
+    def test_waits_for_the_winner_to_finish_writing_before_returning(self):
+        edge_claimed = threading.Event()
+
+        def edge(spoken_text, output_path):
+            self.assertTrue(audio_gen._claim_output())
+            edge_claimed.set()
+            threading.Event().wait(0.2)
+            with open(output_path, "wb") as audio_file:
+                audio_file.write(b"edge-audio")
+            return True
+
+        def openai(spoken_text, output_path, cache, use_cache=True):
+            # The loser reports first, while the winner is still writing.
+            edge_claimed.wait(5)
+            return audio_gen._claim_output()
+
+        with patch.object(audio_gen, "_generate_edge_audio_sync", side_effect=edge), \
+             patch.object(audio_gen, "_openai_segment", side_effect=openai):
+            winner = audio_gen._race_providers("得著榮耀", self.output_path, audio_gen.tts_cache())
+            exists_at_return = os.path.exists(self.output_path)
+
+        self.assertEqual(winner, "edge")
+        self.assertTrue(exists_at_return)
+
+    def test_edge_attempt_past_its_deadline_is_abandoned(self):
+        communicate = SlowEdgeCommunicate(stall=5)
+        with patch.object(audio_gen, "OPENAI_API_KEY", None), \
+             patch.object(audio_gen, "EDGE_TTS_MAX_ATTEMPTS", 1), \
+             patch.object(audio_gen, "EDGE_TTS_ATTEMPT_TIMEOUT", 0.1), \
+             patch.object(audio_gen.edge_tts, "Communicate", return_value=communicate), \
+             self.assertLogs(level="WARNING") as logs:
+            started = time.monotonic()
+            result = audio_gen.generate_audio("得著榮耀", self.output_path)
+
+        self.assertIsNone(result)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertTrue(any("TimeoutError" in line for line in logs.output))
+        self.assertEqual(self._wait_for_quiet_directory(), [])
+
+
+class TestConcatenateAudio(unittest.TestCase):
+    def test_joins_segments_and_strips_id3_tags(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first_path = os.path.join(temp_dir, "preamble.mp3")
+            second_path = os.path.join(temp_dir, "body.mp3")
+            id3_header = b"ID3\x04\x00\x00\x00\x00\x00\x03abc"
+            with open(first_path, "wb") as audio_file:
+                audio_file.write(b"first-frames")
+            with open(second_path, "wb") as audio_file:
+                audio_file.write(id3_header + b"second-frames" + b"TAG" + b"x" * 125)
+
+            result = audio_gen.concatenate_audio([first_path, second_path], second_path)
+
+            self.assertEqual(result, second_path)
+            with open(second_path, "rb") as audio_file:
+                self.assertEqual(audio_file.read(), b"first-framessecond-frames")
+            self.assertFalse(os.path.exists(f"{second_path}.join.tmp"))
+
+    def test_drops_xing_frame_of_later_segments(self):
+        frame = fake_services.silent_mp3(1)
+        xing_frame = frame[:4 + 9] + b"Xing" + frame[4 + 9 + 4:]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, name) for name in ("a.mp3", "b.mp3", "joined.mp3")]
+            for path in paths[:2]:
+                with open(path, "wb") as audio_file:
+                    audio_file.write(xing_frame + frame * 3)
+
+            audio_gen.concatenate_audio(paths[:2], paths[2])
+
+            with open(paths[2], "rb") as audio_file:
+                self.assertEqual(audio_file.read(), frame * 6)
+
+    def test_merges_transcripts_onto_one_timeline(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, name) for name in ("preamble.mp3", "openai.mp3", "body.mp3")]
+            for path, frames in zip(paths, (10, 25, 5)):
+                with open(path, "wb") as audio_file:
+                    audio_file.write(fake_services.silent_mp3(frames))
+            tts_transcript.save(paths[0], tts_transcript.build("經文。", 240.0, [(0, 1_000_000, "經文")]))
+            tts_transcript.save(paths[2], tts_transcript.build("禱告。", 120.0, [(50_000, 1_000_000, "禱告")]))
+
+            audio_gen.concatenate_audio(paths, paths[2])
+
+            transcript = tts_transcript.load(paths[2])
+            self.assertEqual(transcript["text"], "經文。\n\n禱告。")
+            self.assertEqual(transcript["duration_ms"], 960.0)
+            self.assertEqual(transcript["words"], [[0.0, 100.0, 0, "經文"], [845.0, 100.0, 5, "禱告"]])
+            self.assertEqual([segment["start_ms"] for segment in transcript["segments"]], [0.0, 240.0, 840.0])
+
+    def test_missing_segment_returns_none(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "daily_message.mp3")
+            result = audio_gen.concatenate_audio(
+                [os.path.join(temp_dir, "missing.mp3")],
+                output_path,
+            )
+
+            self.assertIsNone(result)
+            self.assertFalse(os.path.exists(output_path))
+
+
+class TestChunkedAudio(unittest.TestCase):
+    SCRIPT = "第一段第一句。第一段第二句！\n\n第二段很長的一句話，" + "一直說下去" * 6 + "。\n\n第三段。"
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_path = os.path.join(temp_dir.name, "daily_message.mp3")
+        for name, value in (
+            ("TTS_CHUNK_CHARS", 20),
+            ("TTS_CHUNK_CONCURRENCY", 2),
+            ("EDGE_TTS_ENABLED", True),
+            ("TTS_CACHE_DIR", ""),
+        ):
+            patcher = patch.object(audio_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(audio_gen, "prepare_tts_text", side_effect=lambda text: text)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_split_keeps_whole_sentences_within_limit(self):
+        chunks = audio_gen.split_tts_chunks(self.SCRIPT)
+
+        self.assertEqual(chunks[0], "第一段第一句。第一段第二句！")
+        self.assertEqual(chunks[-1], "第三段。")
+        self.assertEqual("".join(chunks), self.SCRIPT.replace("\n", ""))
+        self.assertEqual(audio_gen.split_tts_chunks("短句。\n\n也短。", max_chars=20), ["短句。\n\n也短。"])
+        self.assertEqual(audio_gen.split_tts_chunks("他說：「平安。」然後走了。", max_chars=8), ["他說：「平安。」", "然後走了。"])
+
+    def test_chunks_run_concurrently_and_join_in_order(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        async def fake_edge(spoken_text, output_path):
+            with lock:
+                running.append(spoken_text)
+                peak.append(len(running))
+            await asyncio.sleep(0.05)
+            with open(output_path, "wb") as audio_file:
+                audio_file.write(f"[{spoken_text}]".encode("utf-8"))
+            with lock:
+                running.remove(spoken_text)
+            return True
+
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=fake_edge):
+            result = audio_gen.generate_audio(self.SCRIPT, self.output_path)
+
+        chunks = audio_gen.split_tts_chunks(self.SCRIPT)
+        self.assertEqual(result, self.output_path)
+        self.assertEqual(max(peak), 2)
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read().decode("utf-8"), "".join(f"[{chunk}]" for chunk in chunks))
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), ["daily_message.mp3"])
+
+    async def edge_failing_on_third_paragraph(self, spoken_text, output_path):
+        if "第三段" in spoken_text:
+            return False
+        with open(output_path, "wb") as audio_file:
+            audio_file.write(b"edge")
+        return True
+
+    def test_one_chunk_falling_back_revoices_the_whole_script_with_openai(self):
+        def fake_openai(spoken_text, output_path):
+            with open(output_path, "wb") as audio_file:
+                audio_file.write(b"openai")
+            return True
+
+        chunks = audio_gen.split_tts_chunks(self.SCRIPT)
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=self.edge_failing_on_third_paragraph), \
+             patch.object(audio_gen, "_generate_openai_audio", side_effect=fake_openai) as openai, \
+             self.assertLogs(level="WARNING") as logs:
+            result = audio_gen.generate_audio(self.SCRIPT, self.output_path)
+
+        self.assertEqual(result, self.output_path)
+        self.assertEqual(sorted(call.args[0] for call in openai.call_args_list), sorted(chunks))
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"openai" * len(chunks))
+        self.assertTrue(any("re-synthesizing" in line for line in logs.output))
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), ["daily_message.mp3"])
+
+    def test_failed_revoice_keeps_the_mixed_chunks_with_a_warning(self):
+        def openai_only_for_third_paragraph(spoken_text, output_path):
+            if "第三段" not in spoken_text:
+                return False
+            with open(output_path, "wb") as audio_file:
+                audio_file.write(b"openai")
+            return True
+
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=self.edge_failing_on_third_paragraph), \
+             patch.object(audio_gen, "_generate_openai_audio", side_effect=openai_only_for_third_paragraph), \
+             self.assertLogs(level="WARNING") as logs:
+            result = audio_gen.generate_audio(self.SCRIPT, self.output_path)
+
+        self.assertEqual(result, self.output_path)
+        with open(self.output_path, "rb") as audio_file:
+            self.assertTrue(audio_file.read().endswith(b"edgeopenai"))
+        self.assertTrue(any("mixes Edge and OpenAI" in line for line in logs.output))
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), ["daily_message.mp3"])
+
+    def test_chunk_failing_on_every_provider_fails_the_audio(self):
+        async def fake_edge(spoken_text, output_path):
+            return False
+
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=fake_edge), \
+             patch.object(audio_gen, "_generate_openai_audio", return_value=False), \
+             self.assertLogs(level="ERROR"):
+            self.assertIsNone(audio_gen.generate_audio(self.SCRIPT, self.output_path))
+
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), [])
+
+
+class TestSegmentCache(unittest.TestCase):
+    SCRIPT = "今日靈修。以弗所書三章二十節。\n\n我們一起來禱告：親愛的天父，引導我們。阿們。"
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_path = os.path.join(temp_dir.name, "daily_message.mp3")
+        self.cache_dir = os.path.join(temp_dir.name, "tts-cache")
+        for name, value in (
+            ("TTS_CACHE_DIR", self.cache_dir),
+            ("TTS_CHUNK_CHARS", 20),
+            ("EDGE_TTS_ENABLED", True),
+        ):
+            patcher = patch.object(audio_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(audio_gen, "prepare_tts_text", side_effect=lambda text: text)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.edge_calls = []
+
+    async def fake_edge(self, spoken_text, output_path):
+        self.edge_calls.append(spoken_text)
+        with open(output_path, "wb") as audio_file:
+            audio_file.write(f"[{spoken_text}]".encode("utf-8"))
+        return True
+
+    def generate(self, text, use_cache=True):
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=self.fake_edge):
+            return audio_gen.generate_audio(text, self.output_path, use_cache=use_cache)
+
+    def read_output(self):
+        with open(self.output_path, "rb") as audio_file:
+            return audio_file.read()
+
+    def test_rerun_is_served_from_cache(self):
+        self.generate(self.SCRIPT)
+        first_audio = self.read_output()
+        calls = len(self.edge_calls)
+
+        self.assertEqual(self.generate(self.SCRIPT), self.output_path)
+
+        self.assertEqual(len(self.edge_calls), calls)
+        self.assertEqual(self.read_output(), first_audio)
+
+    def test_cache_bypass_synthesizes_every_chunk_again(self):
+        self.generate(self.SCRIPT)
+        first_calls = list(self.edge_calls)
+        self.edge_calls.clear()
+
+        self.assertEqual(self.generate(self.SCRIPT, use_cache=False), self.output_path)
+
+        self.assertEqual(sorted(self.edge_calls), sorted(first_calls))
+
+    def test_only_new_chunks_are_synthesized(self):
+        self.generate(self.SCRIPT)
+        self.edge_calls.clear()
+
+        self.generate("今日靈修。以弗所書三章二十節。\n\n新的一段話。")
+
+        self.assertEqual(self.edge_calls, ["新的一段話。"])
+
+    def test_key_covers_voice_settings_and_provider(self):
+        edge_key = audio_gen.tts_cache_key("阿們。", "edge")
+        openai_key = audio_gen.tts_cache_key("阿們。", "openai")
+
+        self.assertNotEqual(edge_key, openai_key)
+        self.assertNotEqual(edge_key, audio_gen.tts_cache_key("阿們！", "edge"))
+        with patch.object(audio_gen, "TTS_RATE", "+10%"):
+            self.assertNotEqual(edge_key, audio_gen.tts_cache_key("阿們。", "edge"))
+        with patch.object(audio_gen, "TTS_STYLE_INSTRUCTIONS", "快一點"):
+            self.assertEqual(edge_key, audio_gen.tts_cache_key("阿們。", "edge"))
+            self.assertNotEqual(openai_key, audio_gen.tts_cache_key("阿們。", "openai"))
+
+    def test_cached_openai_fallback_does_not_shadow_edge(self):
+        async def edge_down(spoken_text, output_path):
+            return False
+
+        def fake_openai(spoken_text, output_path):
+            with open(output_path, "wb") as audio_file:
+                audio_file.write(b"openai")
+            return True
+
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=edge_down), \
+             patch.object(audio_gen, "_generate_openai_audio", side_effect=fake_openai):
+            audio_gen.generate_audio("阿們。", self.output_path)
+
+        self.generate("阿們。")
+        self.assertEqual(self.edge_calls, ["阿們。"])
+        self.assertEqual(self.read_output(), "[阿們。]".encode("utf-8"))
+
+        with patch.object(audio_gen, "_generate_edge_audio", side_effect=edge_down), \
+             patch.object(audio_gen, "_generate_openai_audio") as openai:
+            audio_gen.generate_audio("你好。", self.output_path)
+            openai.assert_called_once()
+
+    def test_cache_is_bounded_by_size(self):
+        with patch.object(audio_gen, "TTS_CACHE_MAX_MB", 1):
+            cache = audio_gen.tts_cache()
+        self.assertEqual(cache.max_bytes, 1024 * 1024)
+        self.assertEqual(cache.suffix, ".mp3")
+
+
+class TestSentenceAudio(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.output_path = os.path.join(temp_dir.name, "daily_message.mp3")
+        self.calls = []
+
+    def fake_generate_audio(self, text, output_path):
+        self.calls.append(text)
+        with open(output_path, "wb") as audio_file:
+            audio_file.write(f"[{text}]".encode("utf-8"))
+        return output_path
+
+    def test_sentences_are_synthesized_in_order_and_joined(self):
+        first_started = threading.Event()
+        release = threading.Event()
+
+        def slow_first(text, output_path):
+            if not self.calls:
+                first_started.set()
+                release.wait(5)
+            return self.fake_generate_audio(text, output_path)
+
+        with patch.object(audio_gen, "generate_audio", side_effect=slow_first):
+            speech = audio_gen.SentenceAudio(self.output_path)
+            speech.add("第一句。")
+            self.assertTrue(first_started.wait(5))
+            speech.add("第二句。")
+            speech.add("第三句。")
+            release.set()
+            result = speech.finish()
+
+        self.assertEqual(result, self.output_path)
+        # Sentences queued while the first segment was synthesized become one segment.
+        self.assertEqual(self.calls, ["第一句。", "第二句。\n第三句。"])
+        with open(self.output_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read().decode("utf-8"), "[第一句。][第二句。\n第三句。]")
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.output_path))), ["daily_message.mp3"])
+
+    def test_failed_segment_fails_the_whole_audio(self):
+        def failing(text, output_path):
+            return None if "壞" in text else self.fake_generate_audio(text, output_path)
+
+        with patch.object(audio_gen, "generate_audio", side_effect=failing):
+            speech = audio_gen.SentenceAudio(self.output_path)
+            speech.add("好。")
+            speech._thread.join(0.5)
+            speech.add("壞。")
+            with self.assertLogs(level="ERROR"):
+                self.assertIsNone(speech.finish())
+
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), [])
+
+    def test_segment_raising_fails_the_whole_audio(self):
+        def raising(text, output_path):
+            if "壞" in text:
+                raise RuntimeError("synthesizer crashed")
+            return self.fake_generate_audio(text, output_path)
+
+        with patch.object(audio_gen, "generate_audio", side_effect=raising):
+            speech = audio_gen.SentenceAudio(self.output_path)
+            speech.add("好。")
+            speech._thread.join(0.5)
+            with self.assertLogs(level="ERROR"):
+                speech.add("壞。")
+                speech._thread.join(0.5)
+                speech.add("之後。")
+                self.assertIsNone(speech.finish())
+
+        self.assertTrue(speech.failed)
+        self.assertEqual(self.calls, ["好。"])
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), [])
+
+    def test_cancel_removes_segments(self):
+        with patch.object(audio_gen, "generate_audio", side_effect=self.fake_generate_audio):
+            speech = audio_gen.SentenceAudio(self.output_path)
+            speech.add("第一句。")
+            speech.cancel()
+
+        self.assertEqual(os.listdir(os.path.dirname(self.output_path)), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,182 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import backfill
+import bot
+import http_client
+import tts_transcript
+from run_store import RunStore
+
+
+VERSE = {"reference": "箴言 18章21節", "text": "生死在舌頭的權下。", "image_url": None}
+
+
+def write_audio(text, output_path="daily_message.mp3", use_cache=True):
+    with open(output_path, "wb") as audio_file:
+        audio_file.write(b"mp3 data")
+    return output_path
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = backfill.TokenBucket(2, 2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        self.assertEqual(clock.sleeps, [0.5, 0.5])
+
+
+class TestBackfill(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.base_dir = temp_dir.name
+        self.limits = backfill.ServiceLimits(
+            bible=1,
+            openai=2,
+            tts=2,
+            bucket=backfill.TokenBucket(10_000, 10_000),
+        )
+        self.mocks = {
+            "get_daily_verse": MagicMock(return_value=VERSE),
+            "generate_exposition": MagicMock(return_value="解經"),
+            "generate_audio": MagicMock(side_effect=write_audio),
+            "measure_audio": MagicMock(return_value=(1000, 8)),
+            "upload_audio_to_r2": MagicMock(
+                side_effect=lambda path, publish_date: f"https://audio.example.com/{publish_date}.mp3"
+            ),
+            "save_to_supabase": MagicMock(return_value="record-id"),
+        }
+
+    def _backfill(self, start="2026-01-01", end="2026-01-03", **kwargs):
+        with patch.multiple(bot, **self.mocks):
+            return backfill.backfill_range(
+                start, end, workers=3, base_dir=self.base_dir, limits=self.limits, **kwargs
+            )
+
+    def test_date_range_is_inclusive_and_validated(self):
+        self.assertEqual(
+            backfill.date_range("2026-02-27", "2026-03-01"),
+            ["2026-02-27", "2026-02-28", "2026-03-01"],
+        )
+        with self.assertRaises(ValueError):
+            backfill.date_range("2026-03-01", "2026-02-27")
+
+    def test_backfills_each_date_and_upserts_by_date(self):
+        results = self._backfill()
+
+        self.assertEqual(results, {"2026-01-01": "ok", "2026-01-02": "ok", "2026-01-03": "ok"})
+        days = sorted(call.kwargs["now"].timetuple().tm_yday for call in self.mocks["get_daily_verse"].call_args_list)
+        self.assertEqual(days, [1, 2, 3])
+        saved_dates = sorted(call.kwargs["publish_date"] for call in self.mocks["save_to_supabase"].call_args_list)
+        self.assertEqual(saved_dates, ["2026-01-01", "2026-01-02", "2026-01-03"])
+        save_kwargs = self.mocks["save_to_supabase"].call_args.kwargs
+        self.assertEqual(save_kwargs["podcast_guid"], f"daily-bible-{save_kwargs['publish_date']}")
+        self.assertTrue(save_kwargs["published_at"].endswith("+00:00"))
+
+    def test_rerun_only_repeats_failed_stages(self):
+        self.mocks["generate_exposition"] = MagicMock(return_value=None)
+        first = self._backfill("2026-01-01", "2026-01-01")
+        self.assertEqual(first, {"2026-01-01": "exposition"})
+
+        self.mocks["generate_exposition"] = MagicMock(return_value="解經")
+        self.mocks["get_daily_verse"] = MagicMock(return_value=VERSE)
+        second = self._backfill("2026-01-01", "2026-01-01")
+
+        self.assertEqual(second, {"2026-01-01": "ok"})
+        self.mocks["get_daily_verse"].assert_not_called()
+
+    def test_regenerate_bypasses_the_exposition_and_tts_caches(self):
+        self._backfill("2026-01-01", "2026-01-01", publish=False)
+        for name in ("generate_exposition", "generate_audio"):
+            self.assertTrue(all(call.kwargs["use_cache"] for call in self.mocks[name].call_args_list))
+            self.mocks[name].reset_mock()
+
+        results = self._backfill("2026-01-01", "2026-01-01", publish=False, regenerate=True)
+
+        self.assertEqual(results, {"2026-01-01": "ok"})
+        self.assertEqual(self.mocks["generate_exposition"].call_args.kwargs["use_cache"], False)
+        self.assertEqual(self.mocks["generate_audio"].call_count, 2)
+        self.assertFalse(any(call.kwargs["use_cache"] for call in self.mocks["generate_audio"].call_args_list))
+
+    def test_no_publish_skips_upload_and_supabase(self):
+        results = self._backfill(publish=False)
+
+        self.assertTrue(all(outcome == "ok" for outcome in results.values()))
+        self.mocks["upload_audio_to_r2"].assert_not_called()
+        self.mocks["save_to_supabase"].assert_not_called()
+        self.assertTrue(os.path.exists(os.path.join(self.base_dir, "2026-01-02", "daily_message.mp3")))
+
+    def test_service_concurrency_limit_is_respected(self):
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def scrape(now=None):
+            with lock:
+                active.append(now)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(now)
+            return VERSE
+
+        self.mocks["get_daily_verse"] = MagicMock(side_effect=scrape)
+        results = self._backfill("2026-01-01", "2026-01-06", publish=False)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(max(peak), 1)
+
+
+    def test_every_http_request_takes_a_token(self):
+        acquired = []
+        self.limits.bucket.acquire = lambda: acquired.append(True)
+
+        def scrape(now=None):
+            for _ in range(3):  # hedged reference pages and verse text
+                http_client.throttle()
+            return VERSE
+
+        self.mocks["get_daily_verse"] = MagicMock(side_effect=scrape)
+        self._backfill("2026-01-01", "2026-01-02", publish=False)
+        http_client.throttle()
+
+        self.assertEqual(len(acquired), 6)
+
+    def test_audio_joins_preamble_like_the_daily_run(self):
+        def audio_with_transcript(text, output_path="daily_message.mp3", use_cache=True):
+            tts_transcript.save(output_path, tts_transcript.build(text, 1000.0, [(0, 1, text[:2])]))
+            return write_audio(text, output_path)
+
+        self.mocks["generate_audio"] = MagicMock(side_effect=audio_with_transcript)
+        results = self._backfill("2026-01-01", "2026-01-01", publish=False)
+
+        self.assertEqual(results, {"2026-01-01": "ok"})
+        texts = [call.args[0] for call in self.mocks["generate_audio"].call_args_list]
+        self.assertEqual(texts, [bot.build_audio_preamble(VERSE), "解經"])
+        store = RunStore("2026-01-01", self.base_dir)
+        sections = store.load("audio")["sections"]
+        self.assertEqual([section["title"] for section in sections], ["經文", "靈修"])
+        self.assertFalse(os.path.exists(store.path("preamble.mp3")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import bible_books
+import bible_store
+import build_bible_store
+import config
+import scraper
+from tests.test_scraper import CURRENT_BIBLE_COM_HTML, FakeResponse
+
+
+class TestBibleBooks(unittest.TestCase):
+    def test_parse_osis(self):
+        self.assertEqual(bible_books.parse_osis("EPH.3.20-21"), (49, 3, 20, 21))
+        self.assertEqual(bible_books.parse_osis("1jn.4.16"), (62, 4, 16, 16))
+        self.assertIsNone(bible_books.parse_osis("XYZ.1.1"))
+        self.assertIsNone(bible_books.parse_osis("EPH.3.21-20"))
+
+    def test_osis_from_english_reference(self):
+        self.assertEqual(bible_books.osis_from_reference("Ephesians", "3:20-21"), "EPH.3.20-21")
+        self.assertEqual(bible_books.osis_from_reference("Psalm", "23:1"), "PSA.23.1")
+        self.assertEqual(bible_books.osis_from_reference("Unknown", "1:1"), "")
+
+
+class TestBibleStore(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "bible.sqlite3")
+        self.store = bible_store.BibleStore(self.path)
+
+    def test_range_lookup_joins_verses_in_order(self):
+        self.store.add_verses([(49, 3, 21, "但願他在教會中。"), (49, 3, 20, "神能照着運行。")], "CUNP")
+
+        self.assertEqual(self.store.lookup("EPH.3.20-21"), "神能照着運行。 但願他在教會中。")
+        self.assertEqual(self.store.lookup("EPH.3.20-22"), "")
+        self.assertEqual(self.store.lookup("EPH.3.20", "CUV"), "")
+
+    def test_missing_file_is_not_created_by_lookup(self):
+        self.assertEqual(self.store.lookup_preferred("EPH.3.20"), ("", ""))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_learn_only_single_verses(self):
+        self.assertTrue(self.store.learn("JHN.11.35", "耶穌哭了。", "CUNP"))
+        self.assertFalse(self.store.learn("EPH.3.20-21", "兩節經文", "CUNP"))
+
+        self.assertEqual(self.store.lookup_preferred("JHN.11.35"), ("耶穌哭了。", "CUNP"))
+        self.assertEqual(self.store.count(), 1)
+
+    def test_build_tool_imports_csv(self):
+        csv_path = os.path.join(os.path.dirname(self.path), "verses.csv")
+        with open(csv_path, "w", encoding="utf-8") as csv_file:
+            csv_file.write("book,chapter,verse,text\nEPH,3,20,神能照着運行。\nEphesians,3,21,但願他在教會中。\n")
+
+        with patch("sys.stdout"):
+            self.assertEqual(build_bible_store.main(["--csv", csv_path, "--store", self.path]), 0)
+
+        self.assertEqual(self.store.count("CUNP"), 2)
+
+
+class TestScraperUsesLocalStore(unittest.TestCase):
+    NOW = datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.store = bible_store.BibleStore(os.path.join(temp_dir.name, "bible.sqlite3"))
+        for target, name, value in (
+            (config, "HTTP_CACHE_MODE", "off"),
+            (config, "BIBLE_STORE_PATH", self.store.path),
+            (config, "VOTD_CALENDAR_PATH", ""),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.requested = []
+
+        def get(url, **kwargs):
+            self.requested.append(url)
+            if "verse-of-the-day" in url:
+                return FakeResponse(text=CURRENT_BIBLE_COM_HTML, url=url)
+            if "bible-api.com" in url:
+                return FakeResponse(json_data={"text": "神愛我們的心，我們也知道也信。"}, url=url)
+            return FakeResponse(status=503, url=url)
+
+        patcher = patch("scraper.http_client.get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_local_cunp_text_skips_text_requests(self):
+        self.store.add_verses([(62, 4, 16, "神愛我們的心，我們也知道也信。")], "CUNP")
+
+        result = scraper.get_daily_verse(now=self.NOW)
+
+        self.assertEqual(result["text"], "神愛我們的心，我們也知道也信。")
+        self.assertEqual(len(self.requested), 1)
+
+    def test_network_text_is_learned_for_the_next_run(self):
+        scraper.get_daily_verse(now=self.NOW)
+
+        self.assertEqual(self.store.lookup_preferred("1JN.4.16"), ("神愛我們的心，我們也知道也信。", "CUV"))
+
+    def test_local_cuv_is_used_when_every_network_source_fails(self):
+        self.store.add_verses([(62, 4, 16, "本地和合本經文，神就是愛。")], "CUV")
+
+        with patch.object(scraper, "_resolve_verse_text", return_value=("", "")) as resolve:
+            result = scraper.get_daily_verse(now=self.NOW)
+
+        resolve.assert_called_once()
+        self.assertEqual(result["text"], "本地和合本經文，神就是愛。")
+
+
+if __name__ == "__main__":
+    unittest.main()
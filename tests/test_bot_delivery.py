@@ -0,0 +1,104 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import bot
+import config
+
+
+VERSE = {"reference": "以弗所書 3章20-21節", "text": "神能照着運行在我們心裏的大力。"}
+MESSAGES = [{"type": "text", "text": "經文"}]
+
+
+class TestDeliveryFanOut(unittest.TestCase):
+    def _deliver(self):
+        return bot.deliver_to_channels(
+            VERSE,
+            "解經",
+            MESSAGES,
+            "https://audio.example.com/daily-message.mp3",
+            audio_duration=1000,
+            audio_size_bytes=2000,
+            podcast_guid="daily-bible-2026-10-18",
+            published_at="2026-10-18T01:30:00+00:00",
+            publish_date="2026-10-18",
+        )
+
+    def test_channels_run_concurrently(self):
+        line_started = threading.Event()
+
+        def slow_supabase(*args, **kwargs):
+            # Only returns once LINE has started, which cannot happen if the
+            # channels are delivered one after another.
+            self.assertTrue(line_started.wait(timeout=5))
+            return "record-id"
+
+        def line(messages):
+            line_started.set()
+            return True
+
+        with patch.object(config, "LINE_CHANNEL_ACCESS_TOKEN", "token"), \
+             patch.object(config, "TELEGRAM_CHAT_IDS", ["1", "2"]), \
+             patch.object(bot, "save_to_supabase", side_effect=slow_supabase), \
+             patch.object(bot, "broadcast_message", side_effect=line), \
+             patch.object(bot, "push_to_telegram_chat", return_value=True), \
+             patch.object(bot, "send_web_push_notifications", return_value=3) as web_push:
+            receipts = self._deliver()
+
+        self.assertEqual(receipts["line"], True)
+        self.assertEqual(receipts["telegram"], {"1": True, "2": True})
+        self.assertEqual(receipts["supabase"], "record-id")
+        self.assertEqual(receipts["web_push"], 3)
+        web_push.assert_called_once()
+
+    def test_web_push_waits_for_supabase_record(self):
+        with patch.object(config, "LINE_CHANNEL_ACCESS_TOKEN", "token"), \
+             patch.object(config, "TELEGRAM_CHAT_IDS", []), \
+             patch.object(bot, "save_to_supabase", return_value=None), \
+             patch.object(bot, "broadcast_message", return_value=True), \
+             patch.object(bot, "send_web_push_notifications") as web_push:
+            receipts = self._deliver()
+
+        web_push.assert_not_called()
+        self.assertIsNone(receipts["supabase"])
+        self.assertIsNone(receipts["web_push"])
+
+    def test_failing_channel_does_not_block_others(self):
+        with patch.object(config, "LINE_CHANNEL_ACCESS_TOKEN", "token"), \
+             patch.object(config, "TELEGRAM_CHAT_IDS", ["1"]), \
+             patch.object(bot, "save_to_supabase", return_value="record-id"), \
+             patch.object(bot, "broadcast_message", side_effect=RuntimeError("boom")), \
+             patch.object(bot, "push_to_telegram_chat", return_value=False), \
+             patch.object(bot, "send_web_push_notifications", return_value=0):
+            receipts = self._deliver()
+
+        self.assertIsNone(receipts["line"])
+        self.assertEqual(receipts["telegram"], {"1": False})
+        self.assertEqual(receipts["supabase"], "record-id")
+
+    def test_telegram_fan_out_respects_concurrency_limit(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def push(chat_id, text, audio_url):
+            with lock:
+                in_flight.append(chat_id)
+                peak.append(len(in_flight))
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight.remove(chat_id)
+            return True
+
+        chat_ids = [str(index) for index in range(20)]
+        with patch.object(config, "TELEGRAM_CHAT_IDS", chat_ids), \
+             patch.object(config, "TELEGRAM_PUSH_CONCURRENCY", 4), \
+             patch.object(bot, "push_to_telegram_chat", side_effect=push):
+            results = bot.push_to_all_telegram_chats("text", None)
+
+        self.assertEqual(list(results), chat_ids)
+        self.assertLessEqual(max(peak), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
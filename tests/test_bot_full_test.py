@@ -1,14 +1,14 @@
 import os
 import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import bot
+import config
 
 
 class FakeAudio:
-    def __len__(self):
-        return 12345
+    duration_ms = 12345.0
 
 
 class FakeTelegramResponse:
@@ -45,15 +45,15 @@ class TestFullTestMode(unittest.TestCase):
             audio_path = audio_file.name
 
         try:
-            with patch.object(bot, "RUN_MODE", "full_test"), \
-                 patch.object(bot, "DRY_RUN", False), \
-                 patch.object(bot, "TELEGRAM_BOT_TOKEN", "test-token"), \
-                 patch.object(bot, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
-                 patch.object(bot, "TELEGRAM_CHAT_IDS", []), \
+            with patch.object(config, "RUN_MODE", "full_test"), \
+                 patch.object(config, "DRY_RUN", False), \
+                 patch.object(config, "TELEGRAM_BOT_TOKEN", "test-token"), \
+                 patch.object(config, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
+                 patch.object(config, "TELEGRAM_CHAT_IDS", []), \
                  patch.object(bot, "get_daily_verse", return_value=verse) as get_verse, \
                  patch.object(bot, "generate_exposition", return_value=exposition) as gen_text, \
                  patch.object(bot, "generate_audio", return_value=audio_path) as gen_audio, \
-                 patch("pydub.AudioSegment.from_mp3", return_value=FakeAudio()), \
+                 patch("mp3_frames.probe", return_value=FakeAudio()), \
                  patch.object(
                      bot,
                      "send_full_test_to_telegram",
@@ -63,11 +63,17 @@ class TestFullTestMode(unittest.TestCase):
                 result = bot.run_daily_task()
 
             self.assertTrue(result)
-            get_verse.assert_called_once_with()
+            get_verse.assert_called_once_with(now=None)
             gen_text.assert_called_once_with(verse)
-            gen_audio.assert_called_once_with(
-                "今日靈修。以弗所書 3章20-21節。神能照着運行在我們心裏的大力。。"
-                + exposition
+            self.assertEqual(
+                gen_audio.call_args_list,
+                [
+                    call(
+                        "今日靈修。以弗所書 3章20-21節。神能照着運行在我們心裏的大力。。",
+                        output_path="daily_message.preamble.mp3",
+                    ),
+                    call(exposition),
+                ],
             )
             send_test.assert_called_once_with(
                 "test-chat",
@@ -91,14 +97,14 @@ class TestFullTestMode(unittest.TestCase):
             audio_path = audio_file.name
 
         try:
-            with patch.object(bot, "RUN_MODE", "full_test"), \
-                 patch.object(bot, "DRY_RUN", False), \
-                 patch.object(bot, "TELEGRAM_BOT_TOKEN", "test-token"), \
-                 patch.object(bot, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
+            with patch.object(config, "RUN_MODE", "full_test"), \
+                 patch.object(config, "DRY_RUN", False), \
+                 patch.object(config, "TELEGRAM_BOT_TOKEN", "test-token"), \
+                 patch.object(config, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
                  patch.object(bot, "get_daily_verse", return_value=verse), \
                  patch.object(bot, "generate_exposition", return_value="解經"), \
                  patch.object(bot, "generate_audio", return_value=audio_path), \
-                 patch("pydub.AudioSegment.from_mp3", return_value=FakeAudio()), \
+                 patch("mp3_frames.probe", return_value=FakeAudio()), \
                  patch.object(bot, "send_full_test_to_telegram", return_value=False), \
                  patch.multiple(bot, **formal):
                 result = bot.run_daily_task()
@@ -115,10 +121,10 @@ class TestFullTestMode(unittest.TestCase):
             audio_path = audio_file.name
 
         try:
-            with patch.object(bot, "TELEGRAM_BOT_TOKEN", "test-token"), \
-                 patch.object(bot, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
+            with patch.object(config, "TELEGRAM_BOT_TOKEN", "test-token"), \
+                 patch.object(config, "TELEGRAM_TEST_CHAT_ID", "test-chat"), \
                  patch.object(
-                     bot.requests,
+                     bot.http_client,
                      "post",
                      return_value=FakeTelegramResponse(),
                  ) as post:
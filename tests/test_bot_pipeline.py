@@ -0,0 +1,404 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import bot
+import config
+import tts_transcript
+from run_store import RunStore
+
+
+VERSE = {"reference": "以弗所書 3章20-21節", "text": "神能照着運行在我們心裏的大力。", "image_url": None}
+
+
+class FakeAudio:
+    duration_ms = 12345.0
+
+
+def write_audio(text, output_path="daily_message.mp3"):
+    with open(output_path, "wb") as audio_file:
+        audio_file.write(b"mp3 data")
+    return output_path
+
+
+class TestCheckpointedPipeline(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.store = RunStore("2026-10-18", temp_dir.name)
+
+        for name, value in (
+            ("RUN_MODE", "production"),
+            ("DRY_RUN", False),
+            ("LINE_CHANNEL_ACCESS_TOKEN", "line-token"),
+            ("TELEGRAM_CHAT_IDS", ["chat-a", "chat-b"]),
+        ):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("mp3_frames.probe", return_value=FakeAudio())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, stages=None, **mocks):
+        defaults = {
+            "get_daily_verse": MagicMock(return_value=VERSE),
+            "generate_exposition": MagicMock(return_value="解經"),
+            "generate_audio": MagicMock(side_effect=write_audio),
+            "upload_audio_to_r2": MagicMock(return_value="https://audio.example.com/a.mp3"),
+            "broadcast_message": MagicMock(return_value=True),
+            "push_to_telegram_chat": MagicMock(return_value=True),
+            "save_to_supabase": MagicMock(return_value="record-id"),
+            "send_web_push_notifications": MagicMock(return_value=2),
+        }
+        defaults.update(mocks)
+        with patch.multiple(bot, **defaults):
+            result = bot.run_daily_task(
+                publish_date=self.store.publish_date,
+                store=self.store,
+                stages=stages,
+            )
+        return result, defaults
+
+    def test_first_run_checkpoints_every_stage(self):
+        result, mocks = self._run()
+
+        self.assertTrue(result)
+        self.assertEqual(self.store.completed_stages(), list(bot.PIPELINE_STAGES))
+        self.assertEqual(mocks["generate_audio"].call_count, 2)
+        self.assertEqual(
+            mocks["generate_audio"].call_args.kwargs["output_path"],
+            self.store.audio_path,
+        )
+        with open(self.store.audio_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"mp3 datamp3 data")
+        self.assertFalse(os.path.exists(self.store.path("preamble.mp3")))
+        self.assertEqual(self.store.load("audio")["audio_duration_ms"], 12345)
+        self.assertEqual(
+            self.store.load("deliver")["telegram"],
+            {"chat-a": True, "chat-b": True},
+        )
+
+    def test_rerun_resumes_and_only_retries_failed_deliveries(self):
+        telegram = MagicMock(side_effect=lambda chat_id, text, audio_url: chat_id == "chat-a")
+        self._run(
+            broadcast_message=MagicMock(return_value=False),
+            push_to_telegram_chat=telegram,
+        )
+
+        result, mocks = self._run()
+
+        self.assertTrue(result)
+        for stage_function in (
+            "get_daily_verse",
+            "generate_exposition",
+            "generate_audio",
+            "upload_audio_to_r2",
+            "save_to_supabase",
+            "send_web_push_notifications",
+        ):
+            mocks[stage_function].assert_not_called()
+        mocks["broadcast_message"].assert_called_once()
+        mocks["push_to_telegram_chat"].assert_called_once()
+        self.assertEqual(mocks["push_to_telegram_chat"].call_args.args[0], "chat-b")
+        receipts = self.store.load("deliver")
+        self.assertTrue(receipts["line"])
+        self.assertEqual(receipts["telegram"], {"chat-a": True, "chat-b": True})
+
+    def test_rerun_retries_web_push_that_sent_nothing(self):
+        self._run(send_web_push_notifications=MagicMock(return_value=0))
+
+        result, mocks = self._run()
+
+        self.assertTrue(result)
+        mocks["save_to_supabase"].assert_not_called()
+        mocks["send_web_push_notifications"].assert_called_once()
+        self.assertEqual(self.store.load("deliver")["web_push"], 2)
+
+    def test_rerun_saves_audio_url_missing_from_supabase_record(self):
+        self._run(upload_audio_to_r2=MagicMock(return_value=None))
+        self.assertIsNone(self.store.load("deliver")["supabase_audio_url"])
+
+        result, mocks = self._run()
+
+        self.assertTrue(result)
+        mocks["upload_audio_to_r2"].assert_called_once()
+        self.assertEqual(mocks["save_to_supabase"].call_args.args[2], "https://audio.example.com/a.mp3")
+        mocks["broadcast_message"].assert_not_called()
+        self.assertEqual(self.store.load("deliver")["supabase_audio_url"], "https://audio.example.com/a.mp3")
+
+    def test_selected_stage_reruns_even_when_stored(self):
+        self._run()
+
+        result, mocks = self._run(stages={"exposition"})
+
+        self.assertTrue(result)
+        mocks["get_daily_verse"].assert_not_called()
+        mocks["generate_exposition"].assert_called_once_with(VERSE)
+        mocks["generate_audio"].assert_not_called()
+        mocks["broadcast_message"].assert_not_called()
+
+    def test_preamble_audio_is_synthesized_while_exposition_is_written(self):
+        preamble_started = threading.Event()
+
+        def audio(text, output_path="daily_message.mp3"):
+            if output_path.endswith("preamble.mp3"):
+                preamble_started.set()
+            return write_audio(text, output_path)
+
+        def exposition(verse_data):
+            self.assertTrue(preamble_started.wait(timeout=5))
+            return "解經"
+
+        result, mocks = self._run(
+            generate_audio=MagicMock(side_effect=audio),
+            generate_exposition=MagicMock(side_effect=exposition),
+        )
+
+        self.assertTrue(result)
+        first_call = mocks["generate_audio"].call_args_list[0]
+        self.assertEqual(first_call.args[0], bot.build_audio_preamble(VERSE))
+
+    def test_preamble_failure_aborts(self):
+        def audio(text, output_path="daily_message.mp3"):
+            if output_path.endswith("preamble.mp3"):
+                return None
+            return write_audio(text, output_path)
+
+        result, mocks = self._run(generate_audio=MagicMock(side_effect=audio))
+
+        self.assertFalse(result)
+        self.assertFalse(self.store.has("audio"))
+        mocks["broadcast_message"].assert_not_called()
+
+    def _streaming_mocks(self, finish_result=True):
+        speech = MagicMock()
+        speech.sentences = []
+        speech.add.side_effect = speech.sentences.append
+
+        def finish():
+            return write_audio("".join(speech.sentences), self.store.audio_path) if finish_result else None
+
+        speech.finish.side_effect = finish
+
+        def stream(verse_data, on_sentence):
+            for sentence in ("第一句。", "第二句。"):
+                on_sentence(sentence)
+            return "第一句。第二句。"
+
+        return speech, MagicMock(side_effect=stream)
+
+    def test_streaming_exposition_synthesizes_sentences_as_they_arrive(self):
+        speech, stream = self._streaming_mocks()
+
+        with patch.object(config, "EXPOSITION_STREAMING", True):
+            result, mocks = self._run(
+                stream_exposition=stream,
+                start_sentence_audio=MagicMock(return_value=speech),
+            )
+
+        self.assertTrue(result)
+        self.assertEqual(speech.sentences, ["第一句。", "第二句。"])
+        mocks["generate_exposition"].assert_not_called()
+        self.assertEqual(mocks["generate_audio"].call_count, 1, "only the preamble is synthesized separately")
+        self.assertEqual(self.store.load("exposition"), {"exposition": "第一句。第二句。"})
+        with open(self.store.audio_path, "rb") as audio_file:
+            self.assertEqual(audio_file.read(), b"mp3 datamp3 data")
+
+    def test_streaming_audio_failure_falls_back_to_whole_exposition(self):
+        speech, stream = self._streaming_mocks(finish_result=False)
+
+        with patch.object(config, "EXPOSITION_STREAMING", True), self.assertLogs(level="WARNING"):
+            result, mocks = self._run(
+                stream_exposition=stream,
+                start_sentence_audio=MagicMock(return_value=speech),
+            )
+
+        self.assertTrue(result)
+        self.assertEqual(mocks["generate_audio"].call_args.args[0], "第一句。第二句。")
+
+    def test_failed_stream_cancels_sentence_audio(self):
+        speech, _ = self._streaming_mocks()
+
+        with patch.object(config, "EXPOSITION_STREAMING", True):
+            result, mocks = self._run(
+                stream_exposition=MagicMock(return_value=None),
+                start_sentence_audio=MagicMock(return_value=speech),
+            )
+
+        self.assertFalse(result)
+        speech.cancel.assert_called_once()
+        mocks["broadcast_message"].assert_not_called()
+
+    def test_deliver_only_without_artifacts_aborts(self):
+        result, mocks = self._run(stages={"deliver"})
+
+        self.assertFalse(result)
+        mocks["get_daily_verse"].assert_not_called()
+        mocks["broadcast_message"].assert_not_called()
+
+    def test_pregenerate_stages_content_then_daily_run_only_uploads_and_delivers(self):
+        base_dir = os.path.dirname(self.store.directory)
+        mocks = {
+            "get_daily_verse": MagicMock(return_value=VERSE),
+            "refresh_verse_calendar": MagicMock(return_value=False),
+            "generate_exposition": MagicMock(return_value="解經"),
+            "generate_audio": MagicMock(side_effect=write_audio),
+            "upload_audio_to_r2": MagicMock(),
+            "broadcast_message": MagicMock(),
+        }
+        with patch.multiple(bot, **mocks):
+            self.assertTrue(bot.pregenerate_content(2, "2026-10-18", base_dir))
+            self.assertTrue(bot.pregenerate_content(2, "2026-10-18", base_dir))
+
+        self.assertEqual(mocks["get_daily_verse"].call_count, 2)
+        verse_dates = [call.kwargs["now"] for call in mocks["get_daily_verse"].call_args_list]
+        self.assertEqual([now.timetuple().tm_yday for now in verse_dates], [291, 292])
+        checked_dates = [call.kwargs["now"] for call in mocks["refresh_verse_calendar"].call_args_list]
+        self.assertEqual([now.timetuple().tm_yday for now in checked_dates], [291, 292, 291, 292])
+        mocks["upload_audio_to_r2"].assert_not_called()
+        mocks["broadcast_message"].assert_not_called()
+        self.assertEqual(self.store.completed_stages(), ["verse", "exposition", "audio"])
+
+        result, daily_mocks = self._run()
+
+        self.assertTrue(result)
+        daily_mocks["get_daily_verse"].assert_not_called()
+        daily_mocks["generate_exposition"].assert_not_called()
+        daily_mocks["generate_audio"].assert_not_called()
+        daily_mocks["upload_audio_to_r2"].assert_called_once_with(self.store.audio_path, "2026-10-18")
+        daily_mocks["broadcast_message"].assert_called_once()
+
+    def test_pregenerate_batches_expositions_then_synthesizes_each_date(self):
+        base_dir = os.path.dirname(self.store.directory)
+        RunStore("2026-10-19", base_dir).save("verse", dict(VERSE, reference="詩篇 23章1節"))
+        mocks = {
+            "get_daily_verse": MagicMock(return_value=VERSE),
+            "refresh_verse_calendar": MagicMock(return_value=False),
+            "generate_expositions_in_batch": MagicMock(return_value=["解經一", None, "解經三"]),
+            "generate_exposition": MagicMock(return_value="補寫解經"),
+            "generate_audio": MagicMock(side_effect=write_audio),
+        }
+        with patch.multiple(bot, **mocks):
+            self.assertTrue(bot.pregenerate_content(3, "2026-10-18", base_dir, batch_expositions=True))
+
+        batch_verses = mocks["generate_expositions_in_batch"].call_args.args[0]
+        self.assertEqual([verse["reference"] for verse in batch_verses], [VERSE["reference"], "詩篇 23章1節", VERSE["reference"]])
+        self.assertEqual(mocks["get_daily_verse"].call_count, 2)
+        mocks["generate_exposition"].assert_called_once()
+        self.assertEqual(
+            [RunStore(day, base_dir).load("exposition")["exposition"] for day in ("2026-10-18", "2026-10-19", "2026-10-20")],
+            ["解經一", "補寫解經", "解經三"],
+        )
+        self.assertEqual(self.store.completed_stages(), ["verse", "exposition", "audio"])
+
+    def test_pregenerate_falls_back_when_the_batch_raises(self):
+        base_dir = os.path.dirname(self.store.directory)
+        mocks = {
+            "get_daily_verse": MagicMock(return_value=VERSE),
+            "refresh_verse_calendar": MagicMock(return_value=False),
+            "generate_expositions_in_batch": MagicMock(side_effect=RuntimeError("batch API down")),
+            "generate_exposition": MagicMock(return_value="解經"),
+            "generate_audio": MagicMock(side_effect=write_audio),
+        }
+        with patch.multiple(bot, **mocks), self.assertLogs(level="ERROR"):
+            self.assertTrue(bot.pregenerate_content(2, "2026-10-18", base_dir, batch_expositions=True))
+
+        self.assertEqual(mocks["generate_exposition"].call_count, 2)
+        self.assertEqual(mocks["get_daily_verse"].call_count, 2)
+
+    def test_audio_sections_come_from_word_timings(self):
+        os.makedirs(self.store.directory)
+        preamble = tts_transcript.build("今日靈修。以弗所書。", 2000.0, [(0, 1, "今日"), (5_000_000, 1, "以弗所書")])
+        body_words = [("這段", 0), ("經文", 300), ("提醒", 600), ("我們", 900), ("我們", 2000), ("一起", 2200), ("來", 2400), ("禱告", 2500)]
+        body = tts_transcript.build(
+            "這段經文提醒我們。\n\n我們一起來禱告：主啊。",
+            5000.0,
+            [(offset * 10_000, 1, word) for word, offset in body_words],
+        )
+        tts_transcript.save(self.store.audio_path, tts_transcript.merge([(preamble, 2000.0), (body, 5000.0)]))
+
+        sections = bot.audio_sections(self.store.audio_path)
+
+        self.assertEqual(sections, [
+            {"title": "經文", "start_ms": 0},
+            {"title": "靈修", "start_ms": 2000},
+            {"title": "禱告", "start_ms": 4000},
+        ])
+        self.assertEqual(bot.audio_sections(self.store.path("missing.mp3")), [])
+
+    def test_reflection_starts_after_a_preamble_synthesized_in_chunks(self):
+        os.makedirs(self.store.directory)
+        preamble = tts_transcript.merge([
+            (tts_transcript.build("今日靈修。以弗所書。", 4000.0, [(0, 1, "今日")]), 4000.0),
+            (tts_transcript.build("你們得救是本乎恩。", 5000.0, [(0, 1, "你們")]), 5000.0),
+        ])
+        body = tts_transcript.build("這段經文提醒我們。", 3000.0, [(0, 1, "這段")])
+        tts_transcript.save(self.store.audio_path, tts_transcript.merge([(preamble, 9000.0), (body, 3000.0)]))
+
+        sections = bot.audio_sections(self.store.audio_path, preamble_segments=2)
+
+        self.assertEqual(sections[1], {"title": "靈修", "start_ms": 9000})
+
+    def test_audio_sections_account_for_a_chunked_preamble(self):
+        def audio_with_transcript(text, output_path="daily_message.mp3"):
+            if output_path.endswith("preamble.mp3"):
+                transcript = tts_transcript.merge([
+                    (tts_transcript.build(text[:5], 4000.0, [(0, 1, text[:2])]), 4000.0),
+                    (tts_transcript.build(text[5:], 5000.0, [(0, 1, text[5:7])]), 5000.0),
+                ])
+            else:
+                transcript = tts_transcript.build(text, 1000.0, [(0, 1, text[:2])])
+            tts_transcript.save(output_path, transcript)
+            return write_audio(text, output_path)
+
+        result, _ = self._run(generate_audio=MagicMock(side_effect=audio_with_transcript))
+
+        self.assertTrue(result)
+        self.assertEqual(self.store.load("audio")["sections"][1], {"title": "靈修", "start_ms": 9000})
+
+    def test_audio_artifact_records_sections_and_drops_preamble_transcript(self):
+        def audio_with_transcript(text, output_path="daily_message.mp3"):
+            tts_transcript.save(output_path, tts_transcript.build(text, 1000.0, [(0, 1, text[:2])]))
+            return write_audio(text, output_path)
+
+        result, _ = self._run(generate_audio=MagicMock(side_effect=audio_with_transcript))
+
+        self.assertTrue(result)
+        self.assertEqual(
+            [section["title"] for section in self.store.load("audio")["sections"]],
+            ["經文", "靈修"],
+        )
+        self.assertFalse(os.path.exists(tts_transcript.path_for(self.store.path("preamble.mp3"))))
+
+    def test_prune_removes_only_older_date_directories(self):
+        base_dir = os.path.dirname(self.store.directory)
+        for name in ("2026-10-01", "2026-10-17", "2026-10-18", "notes"):
+            os.makedirs(os.path.join(base_dir, name))
+
+        removed = RunStore.prune("2026-10-17", base_dir)
+
+        self.assertEqual(removed, ["2026-10-01"])
+        self.assertEqual(sorted(os.listdir(base_dir)), ["2026-10-17", "2026-10-18", "notes"])
+
+    def test_parse_args_validates_stages(self):
+        self.assertEqual(bot.parse_args(["--stages", "deliver"]).stages, {"deliver"})
+        self.assertEqual(bot.parse_args(["--fresh"]).stages, set(bot.PIPELINE_STAGES))
+        self.assertIsNone(bot.parse_args([]).stages)
+        with patch("sys.stderr"), self.assertRaises(SystemExit):
+            bot.parse_args(["--stages", "publish"])
+
+    def test_parse_args_pregenerate_command(self):
+        args = bot.parse_args(["pregenerate", "--days", "3", "--run-dir", "/tmp/runs"])
+        self.assertEqual(args.command, "pregenerate")
+        self.assertEqual(args.days, 3)
+        self.assertEqual(args.run_dir, "/tmp/runs")
+        self.assertFalse(args.batch_expositions)
+        self.assertTrue(bot.parse_args(["pregenerate", "--batch-expositions"]).batch_expositions)
+        self.assertEqual(bot.parse_args([]).command, "run")
+
+
+if __name__ == "__main__":
+    unittest.main()
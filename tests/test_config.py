@@ -2,6 +2,7 @@ import os
 import unittest
 from unittest.mock import patch
 
+import config
 from config import positive_int_env
 
 
@@ -23,5 +24,19 @@ class TestConfig(unittest.TestCase):
             self.assertEqual(positive_int_env("TEST_ATTEMPTS", 3), 3)
 
 
+    def test_settings_are_read_lazily_and_validated_on_demand(self):
+        with patch.dict(os.environ, {"TELEGRAM_CHAT_IDS": " 1, ,2 ", "OPENAI_API_KEY": ""}):
+            settings = config.reload_settings()
+            self.addCleanup(config.reload_settings)
+
+            self.assertEqual(config.TELEGRAM_CHAT_IDS, ["1", "2"])
+            self.assertIs(config.get_settings(), settings)
+            self.assertIn("Warning: OPENAI_API_KEY is not set.", settings.validate())
+
+    def test_unknown_setting_raises_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            config.NOT_A_SETTING
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,219 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import content_gen
+from disk_cache import DiskCache
+
+
+VERSE = {"reference": "以弗所書 3章20-21節", "text": "神能照着運行在我們心裏的大力充充足足地成就一切。"}
+
+
+def completion(content):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    response.text = json.dumps(response.json.return_value, ensure_ascii=False)
+    return response
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = temp_dir.name
+
+    def test_round_trip_and_disabled_cache(self):
+        cache = DiskCache(self.directory)
+        self.assertTrue(cache.put("a" * 64, b"value"))
+        self.assertEqual(cache.get("a" * 64), b"value")
+        self.assertIsNone(cache.get("b" * 64))
+
+        disabled = DiskCache("")
+        self.assertFalse(disabled.put("a" * 64, b"value"))
+        self.assertIsNone(disabled.get("a" * 64))
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.directory, max_entries=2)
+        for age, key in ((300, "old"), (200, "read"), (100, "new")):
+            cache.put(key, key.encode())
+            stamp = 1_700_000_000 - age
+            os.utime(cache._path(key), (stamp, stamp))
+        cache.get("read")
+
+        cache.put("newest", b"newest")
+
+        self.assertIsNone(cache.get("old"))
+        self.assertIsNone(cache.get("new"))
+        self.assertEqual(cache.get("read"), b"read")
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_byte_limit(self):
+        cache = DiskCache(self.directory, max_bytes=10)
+        cache.put("first", b"123456")
+        stamp = 1_700_000_000
+        os.utime(cache._path("first"), (stamp, stamp))
+        cache.put("second", b"123456")
+
+        self.assertEqual(cache.stats(), {"entries": 1, "bytes": 6})
+        self.assertIsNone(cache.get("first"))
+
+    def test_key_is_stable_and_order_sensitive(self):
+        self.assertEqual(DiskCache.key_for("gpt-4o", "系統", 0.7), DiskCache.key_for("gpt-4o", "系統", 0.7))
+        self.assertNotEqual(DiskCache.key_for("gpt-4o", "系統", 0.7), DiskCache.key_for("gpt-4o", "系統", 0.8))
+
+
+class TestExpositionCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        for name, value in (
+            ("EXPOSITION_CACHE_DIR", temp_dir.name),
+            ("EXPOSITION_CACHE_BYPASS", False),
+            ("OPENAI_API_KEY", "test-key"),
+        ):
+            patcher = patch.object(content_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(content_gen.http_client, "post", side_effect=[completion("第一篇"), completion("第二篇")])
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_request_is_served_from_cache(self):
+        self.assertEqual(content_gen.generate_exposition(VERSE), "第一篇")
+        self.assertEqual(content_gen.generate_exposition(dict(VERSE)), "第一篇")
+
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_cache_hit_needs_no_api_key(self):
+        content_gen.generate_exposition(VERSE)
+
+        with patch.object(content_gen, "OPENAI_API_KEY", None):
+            self.assertEqual(content_gen.generate_exposition(VERSE), "第一篇")
+
+    def test_different_verse_or_temperature_misses(self):
+        request = content_gen.build_exposition_request(VERSE)
+        warmer = dict(request, temperature=0.9)
+        other_verse = content_gen.build_exposition_request(dict(VERSE, text="耶穌哭了。"))
+
+        keys = {content_gen.exposition_cache_key(item) for item in (request, warmer, other_verse)}
+        self.assertEqual(len(keys), 3)
+        self.assertEqual(
+            content_gen.exposition_cache_key(request),
+            content_gen.exposition_cache_key(dict(request, max_tokens=900)),
+        )
+
+    def test_bypass_calls_api_and_refreshes_entry(self):
+        content_gen.generate_exposition(VERSE)
+
+        self.assertEqual(content_gen.generate_exposition(VERSE, use_cache=False), "第二篇")
+        self.assertEqual(self.post.call_count, 2)
+        with patch.object(content_gen.http_client, "post") as post:
+            self.assertEqual(content_gen.generate_exposition(VERSE), "第二篇")
+        post.assert_not_called()
+
+    def test_bypass_setting(self):
+        content_gen.generate_exposition(VERSE)
+
+        with patch.object(content_gen, "EXPOSITION_CACHE_BYPASS", True):
+            self.assertEqual(content_gen.generate_exposition(VERSE), "第二篇")
+
+    def test_failed_call_is_not_cached(self):
+        self.post.side_effect = [RuntimeError("boom"), completion("第一篇")]
+
+        with self.assertLogs(level="ERROR"):
+            self.assertIsNone(content_gen.generate_exposition(VERSE))
+        self.assertEqual(content_gen.generate_exposition(VERSE), "第一篇")
+
+
+def event_stream(pieces):
+    response = MagicMock(status_code=200)
+    response.iter_lines.return_value = [
+        line
+        for piece in pieces
+        for line in (
+            ("data: " + json.dumps({"choices": [{"delta": {"content": piece}}]}, ensure_ascii=False)).encode("utf-8"),
+            b"",
+        )
+    ] + [b"data: [DONE]"]
+    return response
+
+
+class TestStreamingExposition(unittest.TestCase):
+    PIECES = ["這段經文", "提醒我們。神的能力", "遠超過所求所想！\n\n我們一起來", "禱告：「主啊，", "引導我們。」", "阿們"]
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        for name, value in (
+            ("EXPOSITION_CACHE_DIR", temp_dir.name),
+            ("EXPOSITION_CACHE_BYPASS", False),
+            ("OPENAI_API_KEY", "test-key"),
+        ):
+            patcher = patch.object(content_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_splitter_waits_for_closing_quotes(self):
+        splitter = content_gen.SentenceSplitter()
+
+        self.assertEqual(splitter.feed("他說：「平安。"), [])
+        self.assertEqual(splitter.feed("」然後"), ["他說：「平安。」"])
+        self.assertEqual(splitter.feed("離開\n"), [])
+        self.assertEqual(splitter.flush(), ["然後離開"])
+        self.assertEqual(content_gen.split_sentences("一。二？\n三"), ["一。", "二？", "三"])
+
+    def test_sentences_are_delivered_while_streaming(self):
+        received = []
+        response = event_stream(self.PIECES)
+
+        def on_sentence(sentence):
+            received.append((sentence, response.close.called))
+
+        with patch.object(content_gen.http_client, "post", return_value=response) as post:
+            content = content_gen.stream_exposition(VERSE, on_sentence)
+
+        self.assertEqual(content, "".join(self.PIECES))
+        self.assertEqual([sentence for sentence, _ in received], [
+            "這段經文提醒我們。",
+            "神的能力遠超過所求所想！",
+            "我們一起來禱告：「主啊，引導我們。」",
+            "阿們",
+        ])
+        self.assertFalse(received[0][1], "first sentence must arrive before the stream ends")
+        self.assertTrue(post.call_args.kwargs["stream"])
+        self.assertTrue(post.call_args.kwargs["json"]["stream"])
+
+    def test_streamed_result_shares_the_exposition_cache(self):
+        with patch.object(content_gen.http_client, "post", return_value=event_stream(self.PIECES)):
+            content_gen.stream_exposition(VERSE, lambda sentence: None)
+
+        replayed = []
+        with patch.object(content_gen.http_client, "post") as post:
+            self.assertEqual(content_gen.generate_exposition(VERSE), "".join(self.PIECES))
+            self.assertEqual(content_gen.stream_exposition(VERSE, replayed.append), "".join(self.PIECES))
+        post.assert_not_called()
+        self.assertEqual(len(replayed), 4)
+
+    def test_stream_sends_the_same_request_as_a_whole_completion(self):
+        with patch.object(content_gen.http_client, "post", return_value=completion("整篇。")) as post:
+            content_gen.generate_exposition(VERSE, use_cache=False)
+        with patch.object(content_gen.http_client, "post", return_value=event_stream(self.PIECES)) as stream_post:
+            content_gen.stream_exposition(VERSE, lambda sentence: None, use_cache=False)
+
+        self.assertEqual(stream_post.call_args.args, post.call_args.args)
+        self.assertEqual(stream_post.call_args.kwargs["headers"], post.call_args.kwargs["headers"])
+        self.assertEqual(stream_post.call_args.kwargs["json"], dict(post.call_args.kwargs["json"], stream=True))
+
+    def test_failed_stream_returns_none(self):
+        response = event_stream(["第一句。", "第二"])
+        response.iter_lines.return_value = response.iter_lines.return_value[:2] + [b"data: {broken"]
+
+        with patch.object(content_gen.http_client, "post", return_value=response), self.assertLogs(level="ERROR"):
+            self.assertIsNone(content_gen.stream_exposition(VERSE, lambda sentence: None))
+        response.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import content_gen
+import exposition_batch
+import fake_services
+
+
+VERSES = [
+    {"reference": f"詩篇 23章{verse}節", "text": f"第{verse}節經文。"}
+    for verse in range(1, 8)
+]
+
+
+def completion(body):
+    return {"choices": [{"message": {"content": "講解：" + body["messages"][-1]["content"][-5:]}}]}
+
+
+class FakeBackend:
+    """Finishes after ``polls`` status checks; records every submitted payload."""
+
+    name = "fake"
+
+    def __init__(self, polls=2, state="completed", fail=()):
+        self.polls = polls
+        self.state = state
+        self.fail = set(fail)
+        self.payloads = []
+        self.cancelled = []
+
+    def submit(self, payload):
+        self.payloads.append(payload)
+        return "batch-1"
+
+    def poll(self, job_id):
+        self.polls -= 1
+        return self.state if self.polls <= 0 else "in_progress"
+
+    def cancel(self, job_id):
+        self.cancelled.append(job_id)
+
+    def output(self, job_id):
+        lines = []
+        for line in self.payloads[-1].decode("utf-8").splitlines():
+            request = json.loads(line)
+            if request["body"]["messages"][-1]["content"] in self.fail:
+                lines.append({"custom_id": request["custom_id"], "response": None, "error": {"message": "boom"}})
+            else:
+                lines.append({
+                    "custom_id": request["custom_id"],
+                    "response": {"status_code": 200, "body": completion(request["body"])},
+                    "error": None,
+                })
+        return "\n".join(json.dumps(line, ensure_ascii=False) for line in lines).encode("utf-8")
+
+
+class TestExpositionBatch(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        for name, value in (
+            ("EXPOSITION_CACHE_DIR", temp_dir.name),
+            ("EXPOSITION_CACHE_BYPASS", False),
+            ("OPENAI_API_KEY", "test-key"),
+        ):
+            patcher = patch.object(content_gen, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sleeps = []
+
+    def run_batch(self, verses, backend, **kwargs):
+        return exposition_batch.run_batch(verses, backend=backend, poll_seconds=5, sleep=self.sleeps.append, **kwargs)
+
+    def test_one_submission_fills_the_exposition_cache(self):
+        backend = FakeBackend(polls=3)
+
+        results = self.run_batch(VERSES, backend)
+
+        self.assertEqual(len(backend.payloads), 1)
+        self.assertEqual(len(backend.payloads[0].decode("utf-8").splitlines()), len(VERSES))
+        self.assertEqual(self.sleeps, [5, 5])
+        self.assertTrue(all(results))
+        with patch.object(content_gen.http_client, "post") as post:
+            self.assertEqual([content_gen.generate_exposition(verse) for verse in VERSES], results)
+        post.assert_not_called()
+
+    def test_input_lines_match_the_single_request(self):
+        payload = exposition_batch.build_batch_input({
+            content_gen.exposition_cache_key(content_gen.build_exposition_request(VERSES[0])):
+                content_gen.build_exposition_request(VERSES[0]),
+        })
+
+        line = json.loads(payload)
+        self.assertEqual(line["url"], exposition_batch.BATCH_ENDPOINT)
+        self.assertEqual(line["body"], content_gen.build_exposition_request(VERSES[0]))
+        self.assertEqual(line["custom_id"], content_gen.exposition_cache_key(line["body"]))
+
+    def test_cached_and_duplicate_verses_are_not_submitted(self):
+        self.run_batch(VERSES[:3], FakeBackend())
+        backend = FakeBackend()
+
+        results = self.run_batch(VERSES[:5] + [dict(VERSES[4])], backend)
+
+        self.assertEqual(len(backend.payloads[0].decode("utf-8").splitlines()), 2)
+        self.assertEqual(results[4], results[5])
+        self.assertTrue(all(results))
+
+        nothing_to_do = FakeBackend()
+        self.run_batch(VERSES[:2], nothing_to_do)
+        self.assertEqual(nothing_to_do.payloads, [])
+
+    def test_failed_lines_are_none_and_stay_uncached(self):
+        backend = FakeBackend(fail={content_gen.build_exposition_request(VERSES[1])["messages"][-1]["content"]})
+
+        with self.assertLogs(level="ERROR"):
+            results = self.run_batch(VERSES[:3], backend)
+
+        self.assertIsNone(results[1])
+        self.assertTrue(results[0] and results[2])
+        self.assertEqual(content_gen.exposition_cache().stats()["entries"], 2)
+
+    def test_gives_up_after_timeout(self):
+        clock = iter(range(0, 1000, 10))
+        backend = FakeBackend(polls=100)
+
+        with self.assertLogs(level="ERROR"):
+            results = self.run_batch(VERSES[:2], backend, timeout=30, clock=lambda: next(clock))
+
+        self.assertEqual(results, [None, None])
+        self.assertLessEqual(len(self.sleeps), 4)
+        self.assertEqual(backend.cancelled, ["batch-1"])
+
+    def test_completed_batch_is_not_cancelled(self):
+        backend = FakeBackend()
+
+        self.run_batch(VERSES[:2], backend)
+
+        self.assertEqual(backend.cancelled, [])
+
+    def test_openai_backend_cancels_batch(self):
+        with fake_services.FakeServices() as services, \
+                patch.object(exposition_batch, "OPENAI_API_BASE_URL", f"{services.base_url}/openai/v1"), \
+                patch.object(exposition_batch, "OPENAI_API_KEY", "fake-key"):
+            backend = exposition_batch.OpenAIBatchBackend()
+            payload = exposition_batch.build_batch_input(
+                {"key": content_gen.build_exposition_request(VERSES[0])}
+            )
+            job_id = backend.submit(payload)
+            backend.cancel(job_id)
+
+        self.assertEqual(services.batches[job_id]["status"], "cancelled")
+
+    def test_local_backend_runs_requests_concurrently(self):
+        backend = exposition_batch.LocalBatchBackend(complete=completion, concurrency=3)
+
+        results = self.run_batch(VERSES, backend)
+
+        self.assertEqual(results, [completion(content_gen.build_exposition_request(verse))["choices"][0]["message"]["content"]
+                                   for verse in VERSES])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            exposition_batch.get_backend("carrier-pigeon")
+
+    def test_openai_backend_against_fake_service(self):
+        with fake_services.FakeServices() as services, \
+                patch.object(exposition_batch, "OPENAI_API_BASE_URL", f"{services.base_url}/openai/v1"), \
+                patch.object(exposition_batch, "OPENAI_API_KEY", "fake-key"):
+            results = self.run_batch(VERSES[:3], exposition_batch.OpenAIBatchBackend())
+
+        self.assertEqual(results, [fake_services.FAKE_EXPOSITION] * 3)
+        self.assertEqual(len(services.batches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
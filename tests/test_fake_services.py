@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import requests
+
+import content_gen
+import fake_services
+import config
+import scraper
+
+
+class TestFakeServices(unittest.TestCase):
+    def setUp(self):
+        for target, name, value in (
+            (config, "HTTP_CACHE_MODE", "off"),
+            (config, "BIBLE_STORE_PATH", ""),
+            (config, "VOTD_CALENDAR_PATH", ""),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.services = fake_services.FakeServices(subscribers=3).start()
+        self.addCleanup(self.services.stop)
+        self.base_url = self.services.base_url
+
+    def test_scraper_reads_verse_from_fake_bible_com(self):
+        with patch.object(config, "BIBLE_COM_BASE_URL", f"{self.base_url}/bible-com"):
+            verse = scraper.get_daily_verse(now=datetime(2026, 3, 2))
+
+        self.assertEqual(verse["reference"], "以弗所書 3章20-21節")
+        self.assertIn("超過我們所求所想", verse["text"])
+        self.assertGreaterEqual(self.services.counts["bible-com"], 2)
+
+    def test_exposition_comes_from_fake_openai(self):
+        verse = {"reference": "以弗所書 3章20-21節", "text": "超過我們所求所想的。"}
+        with patch.object(content_gen, "OPENAI_API_KEY", "fake-key"), \
+                patch.object(content_gen, "EXPOSITION_CACHE_DIR", ""), \
+                patch.object(content_gen, "OPENAI_API_BASE_URL", f"{self.base_url}/openai/v1"):
+            exposition = content_gen.generate_exposition(verse)
+
+        self.assertEqual(exposition, fake_services.FAKE_EXPOSITION)
+
+    def test_subscribers_point_at_fake_push_endpoint(self):
+        response = requests.get(f"{self.base_url}/supabase/rest/v1/push_subscribers?select=subscription", timeout=5)
+
+        endpoints = [row["subscription"]["endpoint"] for row in response.json()]
+        self.assertEqual(endpoints, [f"{self.base_url}/push/{index}" for index in range(3)])
+
+    def test_injected_errors_and_rate_limits(self):
+        self.services.behaviors["line"] = fake_services.ServiceBehavior(error_rate=1.0)
+        self.services.behaviors["telegram"] = fake_services.ServiceBehavior(rate_limit_per_second=1)
+
+        self.assertEqual(requests.post(f"{self.base_url}/line/v2/bot/message/broadcast", timeout=5).status_code, 503)
+        statuses = [
+            requests.post(f"{self.base_url}/telegram/botX/sendMessage", timeout=5).status_code for _ in range(2)
+        ]
+        self.assertEqual(statuses, [200, 429])
+
+    def test_speech_is_whole_mp3_frames(self):
+        audio = fake_services.silent_mp3(10)
+
+        self.assertEqual(len(audio), 1440)
+        self.assertEqual(audio[:4], b"\xff\xf3\x64\xc0")
+
+    def test_parse_behavior(self):
+        service, behavior = fake_services.parse_behavior("openai:800:0.05:20")
+
+        self.assertEqual(service, "openai")
+        self.assertEqual(behavior.latency_ms, 800)
+        self.assertEqual(behavior.error_rate, 0.05)
+        self.assertEqual(behavior.rate_limit_per_second, 20)
+        with self.assertRaises(ValueError):
+            fake_services.parse_behavior("unknown:10")
+
+
+if __name__ == "__main__":
+    unittest.main()
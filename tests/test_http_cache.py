@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import config
+import http_cache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"<html>page</html>", headers=None, url="https://www.bible.com/page"):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'}
+        self.url = url
+        self.encoding = "utf-8"
+
+
+class RecordingFetch:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.responses.pop(0)
+
+
+class TestHttpCache(unittest.TestCase):
+    URL = "https://www.bible.com/zh-TW/verse-of-the-day?day=77"
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = temp_dir.name
+
+    def get(self, fetch, mode="on", **kwargs):
+        return http_cache.cached_get(self.URL, fetch, mode=mode, cache_dir=self.cache_dir, **kwargs)
+
+    def test_same_day_rerun_skips_network(self):
+        fetch = RecordingFetch(FakeResponse())
+
+        first = self.get(fetch, timeout=15)
+        second = self.get(fetch, timeout=15)
+
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second.text, "<html>page</html>")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(second.url, "https://www.bible.com/page")
+
+    def test_stale_entry_is_revalidated_with_validators(self):
+        self.get(RecordingFetch(FakeResponse(headers={"ETag": '"v1"', "Last-Modified": "Tue, 17 Mar 2026 00:00:00 GMT"})))
+        fetch = RecordingFetch(FakeResponse(status_code=304, content=b""))
+
+        with patch.object(config, "HTTP_CACHE_MAX_AGE", 0):
+            response = self.get(fetch, headers={"User-Agent": "test"})
+
+        headers = fetch.calls[0][1]["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["If-Modified-Since"], "Tue, 17 Mar 2026 00:00:00 GMT")
+        self.assertEqual(headers["User-Agent"], "test")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<html>page</html>")
+
+    def test_replay_never_fetches(self):
+        self.get(RecordingFetch(FakeResponse()), mode="record")
+        fetch = RecordingFetch()
+
+        self.assertEqual(self.get(fetch, mode="replay").content, b"<html>page</html>")
+        with self.assertRaises(http_cache.CacheMiss):
+            http_cache.cached_get("https://bible-api.com/John", fetch, mode="replay", cache_dir=self.cache_dir)
+        self.assertEqual(fetch.calls, [])
+
+    def test_errors_are_not_cached_and_off_bypasses(self):
+        fetch = RecordingFetch(FakeResponse(status_code=503), FakeResponse(), FakeResponse())
+
+        self.assertEqual(self.get(fetch).status_code, 503)
+        self.assertEqual(self.get(fetch).status_code, 200)
+        self.get(fetch, mode="off")
+
+        self.assertEqual(len(fetch.calls), 3)
+
+    def test_entries_are_keyed_by_taipei_date_and_old_days_pruned(self):
+        with patch.object(http_cache, "_taipei_date", return_value="2026-03-01"):
+            self.get(RecordingFetch(FakeResponse()))
+        fetch = RecordingFetch(FakeResponse())
+
+        with patch.object(http_cache, "_taipei_date", return_value="2026-03-10"):
+            self.get(fetch)
+
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertEqual(os.listdir(self.cache_dir), ["2026-03-10"])
+
+
+if __name__ == "__main__":
+    unittest.main()
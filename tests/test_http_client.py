@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+
+import config
+import fake_services
+import http_client
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        self.services = fake_services.FakeServices().start()
+        self.addCleanup(self.services.stop)
+        http_client.close()
+        http_client.reset_stats()
+        self.addCleanup(http_client.close)
+
+    def test_session_is_shared_and_connections_are_reused(self):
+        session = http_client.get_session()
+        for _ in range(5):
+            response = http_client.post(f"{self.services.base_url}/telegram/botX/sendMessage", json={"chat_id": 1})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertIs(http_client.get_session(), session)
+        self.assertEqual(self.services.connections, 1)
+
+    def test_default_timeout_is_applied(self):
+        with patch.object(config, "HTTP_DEFAULT_TIMEOUT", 7), \
+             patch.object(http_client.get_session(), "request") as request:
+            http_client.get("https://example.com/")
+            http_client.get("https://example.com/", timeout=3)
+
+        self.assertEqual(request.call_args_list[0].kwargs["timeout"], 7)
+        self.assertEqual(request.call_args_list[1].kwargs["timeout"], 3)
+
+    def test_get_is_retried_on_503_but_post_is_not(self):
+        self.services.behaviors["bible-com"] = fake_services.ServiceBehavior(error_rate=1.0)
+        self.services.behaviors["line"] = fake_services.ServiceBehavior(error_rate=1.0)
+
+        with patch("urllib3.util.retry.Retry.sleep"):
+            get_response = http_client.get(f"{self.services.base_url}/bible-com/verse-of-the-day")
+            post_response = http_client.post(f"{self.services.base_url}/line/v2/bot/message/broadcast")
+
+        self.assertEqual(get_response.status_code, 503)
+        self.assertEqual(post_response.status_code, 503)
+        self.assertEqual(self.services.counts["bible-com"], 1 + config.HTTP_MAX_RETRIES)
+        self.assertEqual(self.services.counts["line"], 1)
+
+    def test_metrics_hooks_and_stats_see_every_response(self):
+        seen = []
+        hook = lambda method, url, status, elapsed_ms, bytes_in: seen.append((method, status, bytes_in))
+        http_client.add_metrics_hook(hook)
+        self.addCleanup(http_client.remove_metrics_hook, hook)
+
+        response = http_client.get(f"{self.services.base_url}/bible-api/John%203:16")
+
+        self.assertEqual(seen, [("GET", 200, len(response.content))])
+        host_stats = http_client.stats()[self.services.base_url.split("://", 1)[1]]
+        self.assertEqual(host_stats["requests"], 1)
+        self.assertEqual(host_stats["errors"], 0)
+
+
+    def test_request_gates_run_before_every_request(self):
+        gated = []
+        gate = lambda: gated.append(True)
+        http_client.add_request_gate(gate)
+        self.addCleanup(http_client.remove_request_gate, gate)
+
+        http_client.get(f"{self.services.base_url}/bible-api/John%203:16")
+        http_client.post(f"{self.services.base_url}/telegram/botX/sendMessage", json={"chat_id": 1})
+        http_client.remove_request_gate(gate)
+        http_client.get(f"{self.services.base_url}/bible-api/John%203:16")
+
+        self.assertEqual(len(gated), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import struct
+import tempfile
+import unittest
+
+import bot
+import mp3_frames
+from fake_services import silent_mp3
+
+
+def xing_frame(frames, tag=b"Xing"):
+    frame = bytearray(silent_mp3(1))
+    frame[13:17] = tag
+    frame[17:25] = struct.pack(">II", 0x1, frames)
+    return bytes(frame)
+
+
+def vbri_frame(frames):
+    frame = bytearray(silent_mp3(1))
+    frame[36:40] = b"VBRI"
+    frame[50:54] = struct.pack(">I", frames)
+    return bytes(frame)
+
+
+class TestMp3Frames(unittest.TestCase):
+    def test_parses_mpeg2_layer3_header(self):
+        header = mp3_frames.parse_header(silent_mp3(1))
+
+        self.assertEqual((header.version, header.layer), (2.0, 3))
+        self.assertEqual((header.bitrate, header.sample_rate, header.channels), (48000, 24000, 1))
+        self.assertEqual((header.length, header.samples, header.duration_ms), (144, 576, 24.0))
+
+    def test_parses_mpeg1_header_with_padding(self):
+        # MPEG-1 Layer III, 128 kbps, 44.1 kHz, padded, joint stereo.
+        header = mp3_frames.parse_header(bytes((0xFF, 0xFB, 0x92, 0x40)))
+
+        self.assertEqual((header.bitrate, header.sample_rate, header.channels), (128000, 44100, 2))
+        self.assertEqual(header.length, 418)
+        self.assertEqual(header.side_info_size, 32)
+
+    def test_rejects_invalid_headers(self):
+        for data in (b"\xff\xf3", b"ID3\x04", bytes((0xFF, 0xF3, 0xF4, 0xC0)), bytes((0xFF, 0xEB, 0x64, 0xC0))):
+            with self.subTest(data=data):
+                self.assertIsNone(mp3_frames.parse_header(data))
+
+    def test_iter_frames_skips_tags_and_junk(self):
+        data = b"ID3\x04\x00\x00\x00\x00\x00\x02ab" + silent_mp3(2) + b"\xff\x00junk" + silent_mp3(3)
+
+        frames = list(mp3_frames.iter_frames(data, *mp3_frames.id3_bounds(data)))
+
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(frames[0][0], 12)
+
+    def test_frame_payload_strips_tags_and_info_frame(self):
+        frame = silent_mp3(1)
+        info_frame = frame[:13] + b"Info" + frame[17:]
+        data = b"ID3\x04\x00\x00\x00\x00\x00\x00" + info_frame + frame * 2 + b"TAG" + bytes(125)
+
+        self.assertEqual(mp3_frames.frame_payload(data), frame * 2)
+        self.assertEqual(mp3_frames.frame_payload(b"not an mp3"), b"not an mp3")
+
+
+    def test_measure_scans_frames_without_info_header(self):
+        info = mp3_frames.measure(b"ID3\x04\x00\x00\x00\x00\x00\x00" + silent_mp3(250))
+
+        self.assertEqual(info, mp3_frames.Mp3Info(6000.0, 250, 48000, 24000, 1, "scan"))
+
+    def test_measure_trusts_xing_and_vbri_frame_counts(self):
+        self.assertEqual(mp3_frames.measure(xing_frame(250) + silent_mp3(250)).source, "xing")
+        self.assertEqual(mp3_frames.measure(xing_frame(250, b"Info") + silent_mp3(250)).duration_ms, 6000.0)
+
+        info = mp3_frames.measure(vbri_frame(500) + silent_mp3(250))
+        self.assertEqual((info.source, info.frames, info.duration_ms), ("vbri", 500, 12000.0))
+
+    def test_xing_without_frame_count_falls_back_to_scan(self):
+        frame = bytearray(xing_frame(0))
+        frame[17:21] = struct.pack(">I", 0)
+
+        info = mp3_frames.measure(bytes(frame) + silent_mp3(10))
+
+        self.assertEqual((info.source, info.frames), ("scan", 10))
+
+    def test_probe_reads_file_through_mmap(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "daily_message.mp3")
+            with open(path, "wb") as audio_file:
+                audio_file.write(silent_mp3(125))
+            empty_path = os.path.join(temp_dir, "empty.mp3")
+            open(empty_path, "wb").close()
+
+            self.assertEqual(mp3_frames.probe(path).duration_ms, 3000.0)
+            self.assertEqual(bot.measure_audio(path), (3000, 125 * 144))
+            with self.assertRaises(ValueError):
+                mp3_frames.probe(empty_path)
+
+    def test_measure_rejects_data_without_frames(self):
+        with self.assertRaises(ValueError):
+            mp3_frames.measure(b"not an mp3 at all" * 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
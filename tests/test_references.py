@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch
+
+import references
+import scraper
+from bible_books import BOOKS
+from references import Reference
+
+
+class TestReferences(unittest.TestCase):
+    def test_parses_english_and_chinese_forms(self):
+        for text, expected in (
+            ("Ephesians 3:20–21 (NIV)", Reference(49, 3, ((20, 21),))),
+            ("以弗所書 3章20-21節", Reference(49, 3, ((20, 21),))),
+            ("詩篇23：1", Reference(19, 23, ((1, 1),))),
+            ("psalm 23:1, 3", Reference(19, 23, ((1, 1), (3, 3)))),
+            ("Song  of Solomon 2:4", Reference(22, 2, ((4, 4),))),
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(references.parse(text), expected)
+
+    def test_prefers_longest_book_name(self):
+        self.assertEqual(references.parse("1 John 4:16").book, 62)
+        self.assertEqual(references.parse("3 John 1:4").book, 64)
+        self.assertEqual(references.parse("約翰一書 4:16").book, 62)
+        self.assertEqual(references.parse("約翰福音 3:16").book, 43)
+
+    def test_every_book_name_round_trips(self):
+        for number, _, english, chinese, _ in BOOKS:
+            with self.subTest(book=english):
+                self.assertEqual(references.parse(f"{english} 1:1").book, number)
+                self.assertEqual(references.parse(f"{chinese} 1章1節").book, number)
+
+    def test_formats(self):
+        reference = references.parse("Ephesians 3:20-21")
+
+        self.assertEqual(reference.osis, "EPH.3.20-21")
+        self.assertEqual(reference.english(), "Ephesians 3:20-21")
+        self.assertEqual(reference.chinese(), "以弗所書 3章20-21節")
+        self.assertEqual(references.parse("Psalm 23:1,3").osis, "")
+
+    def test_english_parser_ignores_chinese_names(self):
+        self.assertIsNone(references.ENGLISH_PARSER.find("以弗所書 3章20-21節"))
+        self.assertIsNone(references.parse("Jobs 4:3 and nothing else"))
+
+    def test_parse_many_keeps_input_order(self):
+        texts = ["以弗所書 3章20-21節", "", None, "no reference", "x John 1:1 y", "以弗所書 3章20-21節"]
+
+        parsed = references.parse_many(texts)
+
+        self.assertEqual(parsed, [
+            Reference(49, 3, ((20, 21),)),
+            None,
+            None,
+            None,
+            Reference(43, 1, ((1, 1),)),
+            Reference(49, 3, ((20, 21),)),
+        ])
+
+    def test_parse_many_scans_once(self):
+        texts = [f"以弗所書 3章{verse}節" for verse in range(1, 22)] + ["no reference"] * 100
+        scans = []
+        original = references.PARSER._pattern
+
+        class CountingPattern:
+            def finditer(self, text):
+                scans.append(text)
+                return original.finditer(text)
+
+        with patch.object(references.PARSER, "_pattern", CountingPattern()):
+            parsed = references.parse_many(texts)
+
+        self.assertEqual(len(scans), 1)
+        self.assertEqual([reference.first for reference in parsed[:21]], list(range(1, 22)))
+        self.assertEqual(parsed[21:], [None] * 100)
+
+    def test_scraper_skips_element_walk_when_page_has_no_reference(self):
+        html_text = "<html><body>" + "<p><span>沒有經文</span></p>" * 200 + "</body></html>"
+        page = scraper.ParsedPage(html_text)
+
+        with patch.object(page.soup.__class__, "find_all", side_effect=AssertionError("walked")):
+            self.assertEqual(scraper._extract_reference_and_data(page)[2], "not-found")
+
+
+if __name__ == "__main__":
+    unittest.main()
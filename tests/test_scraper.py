@@ -1,5 +1,8 @@
 import os
 import sys
+import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
 from unittest.mock import patch
@@ -7,7 +10,9 @@ from zoneinfo import ZoneInfo
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+import config
 import scraper
+from tracing import Span
 
 
 CURRENT_BIBLE_COM_HTML = """
@@ -58,7 +63,21 @@ class FakeResponse:
         self._json_data = json_data
         self.url = url
         self.status_code = status
+        self.encoding = "utf-8"
         self.headers = {"Content-Type": "text/html; charset=utf-8"}
+        self.closed = False
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -71,6 +90,16 @@ class FakeResponse:
 
 
 class ScraperTests(unittest.TestCase):
+    def setUp(self):
+        for target, name, value in (
+            (config, "HTTP_CACHE_MODE", "off"),
+            (config, "BIBLE_STORE_PATH", ""),
+            (config, "VOTD_CALENDAR_PATH", ""),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     def test_extracts_reference_and_osis(self):
         reference, data, source, osis = scraper._extract_reference_and_data(
             CURRENT_BIBLE_COM_HTML
@@ -87,6 +116,37 @@ class ScraperTests(unittest.TestCase):
             "https://www.bible.com/zh-TW/verse-of-the-day?day=219",
         )
 
+    def test_undated_page_is_only_used_for_today(self):
+        taipei = ZoneInfo("Asia/Taipei")
+        with patch.object(scraper, "datetime", wraps=datetime) as clock:
+            clock.now.return_value = datetime(2026, 10, 18, 9, 0, tzinfo=taipei)
+            self.assertIsNone(scraper._undated_verse_url(datetime(2026, 8, 7, 10, 0, tzinfo=taipei)))
+            self.assertEqual(
+                scraper._undated_verse_url(datetime(2026, 10, 18, 6, 0, tzinfo=taipei)),
+                "https://www.bible.com/zh-TW/verse-of-the-day",
+            )
+        self.assertTrue(scraper._is_today(None))
+
+    def test_undated_page_is_a_last_resort_after_the_dated_race(self):
+        span = Span("scraper.get_daily_verse")
+        fetched = []
+
+        def fetch(url):
+            fetched.append(url)
+            return ("Today 1:1", {}, "") if "?day=" not in url else None
+
+        with patch.object(config, "SCRAPER_HEDGED_FETCH", True), \
+             patch.object(scraper, "_fetch_reference", side_effect=fetch):
+            past = scraper._scrape_reference(datetime(2020, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei")), span)
+            past_fetched, fetched[:] = list(fetched), []
+            today = scraper._scrape_reference(None, span)
+
+        self.assertIsNone(past)
+        self.assertTrue(all("?day=" in url for url in past_fetched))
+        self.assertEqual(today, ("Today 1:1", {}, ""))
+        self.assertEqual(fetched[-1], "https://www.bible.com/zh-TW/verse-of-the-day")
+        self.assertTrue(all("?day=" in url for url in fetched[:-1]))
+
     def test_finds_cunp_link_from_compare_page(self):
         url = scraper._find_cunp_url(
             COMPARE_HTML,
@@ -118,24 +178,97 @@ class ScraperTests(unittest.TestCase):
             "神愛我們的心，我們也知道也信。 神就是愛；住在愛裏面的，就是住在神裏面，神也住在他裏面。",
         )
 
-    @patch("scraper.requests.get")
-    def test_full_flow_prefers_bible_com_cunp(self, mock_get):
-        daily = FakeResponse(
-            text=CURRENT_BIBLE_COM_HTML,
-            url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+    def test_extracts_shortest_verse_from_page_scraps(self):
+        meta_html = '<html><head><meta property="og:description" content="耶穌哭了。"></head><body></body></html>'
+        compare_html = (
+            "<html><body><main><section>約翰福音 11:35 CUNP-神 (新標點和合本, 神版) 耶穌哭了。 "
+            "分享 閱讀 約翰福音 11</section></main></body></html>"
         )
-        compare = FakeResponse(
-            text=COMPARE_HTML,
-            url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
+
+        self.assertEqual(scraper._extract_cunp_text(meta_html), "耶穌哭了。")
+        self.assertEqual(scraper._extract_cunp_from_compare_page(compare_html), "耶穌哭了。")
+        self.assertEqual(scraper._clean_cunp_candidate("聖經 | YouVersion"), "")
+
+    def test_translation_label_before_the_verse_is_not_verse_text(self):
+        compare_html = (
+            "<html><body><nav>CUNP 新標點和合本 RCUV 和合本修訂版</nav><main>"
+            "<section>約翰福音 11:35 CUNP-神 (新標點和合本, 神版) 耶穌哭了。 分享 閱讀 約翰福音 11</section>"
+            "</main></body></html>"
         )
-        cunp = FakeResponse(
-            text=CUNP_HTML,
-            url="https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E",
+
+        self.assertEqual(scraper._clean_cunp_candidate("新標點和合本"), "")
+        self.assertEqual(scraper._clean_cunp_candidate("和合本修訂版 聖經"), "")
+        self.assertEqual(scraper._extract_cunp_from_compare_page(compare_html), "耶穌哭了。")
+
+    def test_next_data_reference_skips_html_tree(self):
+        html_text = (
+            '<script id="__NEXT_DATA__" type="application/json">'
+            '{"props": {"pageProps": {"referenceTitle": {"title": "1 John 4:16"}}}}</script>'
+            '<a href="/bible/111/1JN.4.16.NIV">1 John 4:16 (NIV)</a>'
         )
-        mock_get.side_effect = [daily, compare, cunp]
+        with patch.object(scraper, "BeautifulSoup") as soup:
+            reference, _, source, osis = scraper._extract_reference_and_data(html_text)
 
-        now = datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
-        result = scraper.get_daily_verse(now=now)
+        soup.assert_not_called()
+        self.assertEqual((reference, source, osis), ("1 John 4:16", "__NEXT_DATA__", "1JN.4.16"))
+
+    def test_compare_page_is_parsed_once(self):
+        page = scraper.ParsedPage(COMPARE_HTML)
+        with patch.object(scraper, "BeautifulSoup", wraps=scraper.BeautifulSoup) as soup:
+            self.assertEqual(scraper._extract_cunp_from_compare_page(page), "")
+            url = scraper._find_cunp_url(page, "https://www.bible.com/zh-TW/bible/compare/1JN.4.16")
+
+        self.assertEqual(soup.call_count, 1)
+        self.assertIn("/zh-TW/bible/46/1JN.4.16.CUNP-", url)
+
+    def route(self, routes, delays=None):
+        """Answer http_client.get by URL, since verse-text sources are fetched concurrently."""
+        delays = delays or {}
+        requested = []
+
+        def get(url, **kwargs):
+            requested.append(url)
+            for fragment, response in routes.items():
+                if fragment in url:
+                    time.sleep(delays.get(fragment, 0))
+                    if isinstance(response, threading.Event):
+                        response.wait(5)
+                        raise scraper.requests.ConnectionError("released")
+                    return response
+            raise scraper.requests.ConnectionError(f"unrouted {url}")
+
+        patcher = patch("scraper.http_client.get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return requested
+
+    def daily_verse(self):
+        return scraper.get_daily_verse(
+            now=datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
+        )
+
+    def test_full_flow_prefers_bible_com_cunp(self):
+        requested = self.route(
+            {
+                "verse-of-the-day": FakeResponse(
+                    text=CURRENT_BIBLE_COM_HTML,
+                    url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+                ),
+                "/bible/compare/1JN.4.16": FakeResponse(
+                    text=COMPARE_HTML,
+                    url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
+                ),
+                "/bible/46/1JN.4.16.CUNP": FakeResponse(
+                    text=CUNP_HTML,
+                    url="https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E",
+                ),
+                "bible-api.com": FakeResponse(json_data={"text": "神就是愛，住在愛裏面的，就是住在神裏面。"}),
+            },
+            # CUV answers first; the CUNP text must still win.
+            delays={"/bible/46/1JN.4.16.CUNP": 0.2},
+        )
+
+        result = self.daily_verse()
 
         self.assertEqual(
             result,
@@ -145,81 +278,244 @@ class ScraperTests(unittest.TestCase):
                 "image_url": None,
             },
         )
-        self.assertEqual(len(mock_get.call_args_list), 3)
-        self.assertIn("/bible/compare/1JN.4.16", mock_get.call_args_list[1].args[0])
+        self.assertTrue(any("/bible/compare/1JN.4.16" in url for url in requested))
 
-    @patch("scraper.requests.get")
-    def test_returns_compare_page_cunp_without_requesting_direct_page(self, mock_get):
-        daily = FakeResponse(
-            text=CURRENT_BIBLE_COM_HTML,
-            url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
-        )
-        compare = FakeResponse(
-            text=COMPARE_WITH_TEXT_HTML,
-            url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
+    def test_returns_compare_page_cunp_without_waiting_for_other_sources(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        self.route(
+            {
+                "verse-of-the-day": FakeResponse(
+                    text=CURRENT_BIBLE_COM_HTML,
+                    url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+                ),
+                "/bible/compare/1JN.4.16": FakeResponse(
+                    text=COMPARE_WITH_TEXT_HTML,
+                    url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
+                ),
+                "/bible/46/1JN.4.16.CUNP": release,
+                "bible-api.com": release,
+            }
         )
-        mock_get.side_effect = [daily, compare]
 
-        result = scraper.get_daily_verse(
-            now=datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
-        )
+        started = time.monotonic()
+        result = self.daily_verse()
 
+        self.assertLess(time.monotonic() - started, 3)
         self.assertEqual(result["reference"], "約翰一書 4章16節")
         self.assertIn("神就是愛", result["text"])
-        self.assertEqual(len(mock_get.call_args_list), 2)
 
-    @patch("scraper.requests.get")
-    def test_uses_direct_cunp_url_when_compare_has_no_link(self, mock_get):
-        daily = FakeResponse(
-            text=CURRENT_BIBLE_COM_HTML,
-            url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
-        )
-        compare = FakeResponse(
-            text=COMPARE_WITHOUT_CUNP_HTML,
-            url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
-        )
-        cunp = FakeResponse(
-            text=CUNP_META_HTML,
-            url="https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E",
+    def test_uses_direct_cunp_url_when_compare_has_no_link(self):
+        requested = self.route(
+            {
+                "verse-of-the-day": FakeResponse(
+                    text=CURRENT_BIBLE_COM_HTML,
+                    url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+                ),
+                "/bible/compare/1JN.4.16": FakeResponse(
+                    text=COMPARE_WITHOUT_CUNP_HTML,
+                    url="https://www.bible.com/zh-TW/bible/compare/1JN.4.16",
+                ),
+                "/bible/46/1JN.4.16.CUNP": FakeResponse(
+                    text=CUNP_META_HTML,
+                    url="https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E",
+                ),
+                "bible-api.com": FakeResponse(status=503),
+            }
         )
-        mock_get.side_effect = [daily, compare, cunp]
 
-        result = scraper.get_daily_verse(
-            now=datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
-        )
+        result = self.daily_verse()
 
         self.assertEqual(result["reference"], "約翰一書 4章16節")
         self.assertIn("神就是愛", result["text"])
-        direct_url = mock_get.call_args_list[2].args[0]
-        self.assertEqual(
-            direct_url,
-            "https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E",
-        )
+        self.assertIn("https://www.bible.com/zh-TW/bible/46/1JN.4.16.CUNP-%E7%A5%9E", requested)
 
-    @patch("scraper.requests.get")
-    def test_falls_back_to_english_api_query_when_all_cunp_requests_fail(self, mock_get):
-        daily = FakeResponse(
-            text=CURRENT_BIBLE_COM_HTML,
-            url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
-        )
-        compare_failure = FakeResponse(status=503)
-        direct_failure = FakeResponse(status=503)
+    def test_falls_back_to_english_api_query_when_all_cunp_requests_fail(self):
         api = FakeResponse(
             json_data={"text": "神愛我們的心，我們也知道也信。"},
             url="https://bible-api.com/1%20John%204%3A16?translation=cuv",
         )
         api.headers = {"Content-Type": "application/json"}
-        mock_get.side_effect = [daily, compare_failure, direct_failure, api]
-
-        result = scraper.get_daily_verse(
-            now=datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
+        requested = self.route(
+            {
+                "verse-of-the-day": FakeResponse(
+                    text=CURRENT_BIBLE_COM_HTML,
+                    url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+                ),
+                "/bible/compare/1JN.4.16": FakeResponse(status=503),
+                "/bible/46/1JN.4.16.CUNP": FakeResponse(status=503),
+                "bible-api.com": api,
+            }
         )
 
+        result = self.daily_verse()
+
         self.assertEqual(result["reference"], "約翰一書 4章16節")
-        fallback_url = mock_get.call_args_list[3].args[0]
+        self.assertEqual(result["text"], "神愛我們的心，我們也知道也信。")
+        fallback_url = next(url for url in requested if "bible-api.com" in url)
         self.assertIn("1%20John%204%3A16", fallback_url)
         self.assertNotIn("%E7%B4%84%E7%BF%B0", fallback_url)
 
+    def test_returns_none_when_no_source_has_chinese_text(self):
+        self.route(
+            {
+                "verse-of-the-day": FakeResponse(
+                    text=CURRENT_BIBLE_COM_HTML,
+                    url="https://www.bible.com/zh-TW/verse-of-the-day?day=219",
+                ),
+                "bible-api.com": FakeResponse(json_data={"text": "God is love."}),
+            }
+        )
+
+        self.assertIsNone(self.daily_verse())
+
+
+class HedgedReferenceFetchTests(unittest.TestCase):
+    URLS = ["https://primary.test", "https://alternate.test", "https://last.test"]
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.span = Span("scraper.get_daily_verse")
+
+    def test_slow_primary_is_hedged_by_alternate(self):
+        def fetch(url):
+            if url == self.URLS[0]:
+                self.release.wait(5)
+                return ("Primary 1:1", {}, "")
+            return ("Alternate 1:1", {}, "ALT.1.1")
+
+        started = time.monotonic()
+        with patch.object(config, "SCRAPER_HEDGE_DELAY_MS", 50), \
+             patch.object(scraper, "_fetch_reference", side_effect=fetch) as fetch_reference:
+            result = scraper._race_reference_urls(self.URLS, self.span)
+
+        self.assertEqual(result, ("Alternate 1:1", {}, "ALT.1.1"))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual([call.args[0] for call in fetch_reference.call_args_list], self.URLS[:2])
+        self.assertEqual(self.span.attributes["hedged_requests"], 2)
+
+    def test_failed_request_starts_next_alternate_without_waiting(self):
+        results = {self.URLS[0]: None, self.URLS[1]: None, self.URLS[2]: ("Last 1:1", {}, "")}
+
+        started = time.monotonic()
+        with patch.object(config, "SCRAPER_HEDGE_DELAY_MS", 5000), \
+             patch.object(scraper, "_fetch_reference", side_effect=results.get):
+            result = scraper._race_reference_urls(self.URLS, self.span)
+
+        self.assertEqual(result, ("Last 1:1", {}, ""))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(self.span.retries, 2)
+
+    def test_returns_none_when_every_url_fails(self):
+        with patch.object(config, "SCRAPER_HEDGE_DELAY_MS", 10), \
+             patch.object(scraper, "_fetch_reference", return_value=None):
+            self.assertIsNone(scraper._race_reference_urls(self.URLS, self.span))
+
+
+class StreamingFetchTests(unittest.TestCase):
+    VOTD_URL = "https://www.bible.com/zh-TW/verse-of-the-day?day=219"
+    CUNP_URL = "https://www.bible.com/zh-TW/bible/46/EPH.3.20-21.CUNP-%E7%A5%9E"
+    FILLER = "<div>" + "x" * 200_000 + "</div>"
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        for target, name, value in (
+            (config, "HTTP_CACHE_MODE", "on"),
+            (config, "HTTP_CACHE_DIR", temp_dir.name),
+            (config, "SCRAPER_STREAMING", True),
+            (config, "SCRAPER_STREAM_CHUNK_BYTES", 1024),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.cache_dir = temp_dir.name
+        self.responses = []
+
+    def serve(self, pages):
+        def get(url, **kwargs):
+            response = FakeResponse(text=pages[url], url=url)
+            response.read = 0
+            original = response.iter_content
+
+            def iter_content(chunk_size=1):
+                for chunk in original(chunk_size):
+                    response.read += len(chunk)
+                    yield chunk
+
+            response.iter_content = iter_content
+            response.stream = kwargs.get("stream", False)
+            self.responses.append(response)
+            return response
+
+        patcher = patch("scraper.http_client.get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stream_stop_finds_markers_split_across_chunks(self):
+        stop = scraper.StreamStop((rb"<script", rb"</script>"))
+        body = bytearray()
+        for chunk in (b"<html><scr", b"ipt>{}</scr", b"ipt><body>"):
+            body += chunk
+            finished = stop.feed(body)
+
+        self.assertTrue(finished)
+        self.assertEqual(bytes(body[:stop.end]), b"<html><script>{}</script>")
+
+    def test_verse_page_download_stops_after_next_data(self):
+        next_data = '{"props": {"pageProps": {"referenceTitle": {"title": "Ephesians 3:20-21"}}}}'
+        self.serve({self.VOTD_URL: (
+            '<html><body><a href="/bible/111/EPH.3.20-21.NIV">Ephesians 3:20-21</a>'
+            f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+            f"{self.FILLER}</body></html>"
+        )})
+
+        result = scraper._fetch_reference(self.VOTD_URL)
+
+        self.assertEqual(result[0], "Ephesians 3:20-21")
+        self.assertEqual(result[2], "EPH.3.20-21")
+        response = self.responses[0]
+        self.assertTrue(response.stream)
+        self.assertTrue(response.closed)
+        self.assertLess(response.read, 4096)
+        self.assertEqual(os.listdir(self.cache_dir), [], "a truncated page must not be cached")
+
+    def test_cunp_page_is_cut_before_the_next_verse(self):
+        self.serve({self.CUNP_URL: (
+            '<html><body><main><span data-usfm="EPH.3.20">20 神能照着運行在我們心裏的大力，</span>'
+            '<span data-usfm="EPH.3.21">21 但願他在教會中，並在基督耶穌裏，得着榮耀。</span>'
+            '<span data-usfm="EPH.3.22">22 這一節不屬於今天的經文。</span>'
+            f"{self.FILLER}</main></body></html>"
+        )})
+
+        text = scraper._fetch_cunp_text(self.CUNP_URL)
+
+        self.assertEqual(text, "神能照着運行在我們心裏的大力， 但願他在教會中，並在基督耶穌裏，得着榮耀。")
+        self.assertLess(self.responses[0].read, 4096)
+
+    def test_page_cut_short_without_result_is_fetched_in_full(self):
+        next_data = '{"props": {"pageProps": {"referenceTitle": {"title": "no reference here"}}}}'
+        self.serve({self.VOTD_URL: (
+            f'<html><body><script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+            '<a href="/bible/111/EPH.3.20-21.NIV">link</a>'
+            f"{self.FILLER}<h2>Ephesians 3:20-21</h2></body></html>"
+        )})
+
+        with self.assertLogs(level="WARNING"):
+            result = scraper._fetch_reference(self.VOTD_URL)
+
+        self.assertEqual(result[0], "Ephesians 3:20-21")
+        self.assertEqual([response.stream for response in self.responses], [True, False])
+
+    def test_record_mode_downloads_whole_pages(self):
+        self.serve({self.VOTD_URL: CURRENT_BIBLE_COM_HTML})
+
+        with patch.object(config, "HTTP_CACHE_MODE", "record"):
+            scraper._fetch_reference(self.VOTD_URL)
+
+        self.assertFalse(self.responses[0].stream)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
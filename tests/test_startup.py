@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _imported_after(statement: str) -> set:
+    completed = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(' '.join(sys.modules))"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(completed.stdout.split())
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_importing_bot_skips_stage_dependencies(self):
+        modules = _imported_after("import bot")
+
+        for heavy in ("bs4", "edge_tts", "pydub", "requests", "scraper", "audio_gen", "content_gen"):
+            self.assertNotIn(heavy, modules)
+
+    def test_importing_bot_and_scraper_leaves_settings_unread(self):
+        completed = subprocess.run(
+            [sys.executable, "-c", "import bot, scraper, config; print(config._settings is None)"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(completed.stdout.strip(), "True")
+
+    def test_importing_config_prints_nothing(self):
+        completed = subprocess.run(
+            [sys.executable, "-c", "import config; config.TELEGRAM_CHAT_IDS"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "TELEGRAM_CHAT_IDS": "", "OPENAI_API_KEY": ""},
+        )
+        self.assertEqual(completed.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
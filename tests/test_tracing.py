@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+import tracing
+
+
+class FakeResponse:
+    def __init__(self, content=None, text=""):
+        if content is not None:
+            self.content = content
+        self.text = text
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        tracing.reset()
+        self.addCleanup(tracing.reset)
+
+    def test_span_records_duration_counters_and_parent(self):
+        with tracing.span("pipeline.run"):
+            with tracing.span("scraper.http", url="https://example.test") as http_span:
+                http_span.retries = 2
+                http_span.bytes_out = 10
+                http_span.add_response(FakeResponse(content=b"12345"))
+                http_span.add_response(FakeResponse(text="經文"))
+
+        spans = {recorded.name: recorded for recorded in tracing.finished_spans()}
+        http_span = spans["scraper.http"]
+        self.assertEqual(http_span.parent, "pipeline.run")
+        self.assertEqual(http_span.retries, 2)
+        self.assertEqual(http_span.bytes_in, 5 + len("經文".encode("utf-8")))
+        self.assertEqual(http_span.bytes_out, 10)
+        self.assertGreaterEqual(http_span.duration_ms, 0)
+        self.assertIsNone(spans["pipeline.run"].parent)
+
+    def test_exceptions_mark_span_as_error_and_propagate(self):
+        with self.assertRaises(RuntimeError):
+            with tracing.span("tts.edge"):
+                raise RuntimeError("edge failure")
+
+        recorded = tracing.finished_spans()[0]
+        self.assertEqual(recorded.status, "error")
+        self.assertEqual(recorded.error, "RuntimeError: edge failure")
+
+    def test_traced_decorator_and_report_summary(self):
+        @tracing.traced("deliver.line")
+        def deliver():
+            return True
+
+        self.assertTrue(deliver())
+        self.assertTrue(deliver())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = os.path.join(temp_dir, "nested", "timing.json")
+            tracing.write_report(report_path)
+            with open(report_path, encoding="utf-8") as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(report["summary"]["deliver.line"]["count"], 2)
+        self.assertEqual(len(report["spans"]), 2)
+        self.assertIn("wall_clock_ms", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import config
+import record_votd_calendar
+import scraper
+import votd_calendar
+from tests.test_scraper import COMPARE_WITH_TEXT_HTML, CURRENT_BIBLE_COM_HTML, FakeResponse
+
+
+class TestVotdCalendar(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "votd_calendar.json")
+
+    def test_put_and_get_round_trip(self):
+        calendar = votd_calendar.VotdCalendar(self.path)
+        self.assertIsNone(calendar.get(45))
+
+        self.assertTrue(calendar.put(45, "Ephesians 3:20-21", "EPH.3.20-21", "https://img.test/1.jpg"))
+        self.assertFalse(calendar.put(45, "Ephesians 3:20-21", "EPH.3.20-21", "https://img.test/1.jpg"))
+
+        entry = votd_calendar.VotdCalendar(self.path).get(45)
+        self.assertEqual(entry["reference"], "Ephesians 3:20-21")
+        self.assertEqual(entry["osis"], "EPH.3.20-21")
+        self.assertIn("recorded", entry)
+
+    def test_unreadable_file_is_an_empty_index(self):
+        with open(self.path, "w", encoding="utf-8") as calendar_file:
+            calendar_file.write("{not json")
+
+        with self.assertLogs(level="WARNING"):
+            calendar = votd_calendar.VotdCalendar(self.path)
+        self.assertEqual(len(calendar), 0)
+
+    def test_disabled_calendar_never_writes(self):
+        calendar = votd_calendar.VotdCalendar("")
+
+        self.assertFalse(calendar.put(1, "John 3:16", "JHN.3.16"))
+        self.assertIsNone(calendar.get(1))
+
+    def test_recorder_skips_known_days(self):
+        votd_calendar.VotdCalendar(self.path).put(1, "John 3:16", "JHN.3.16")
+        fetched = []
+
+        def fetch_reference(url):
+            fetched.append(url)
+            return ("Psalm 23:1", {}, "PSA.23.1")
+
+        with patch.object(scraper, "_fetch_reference", side_effect=fetch_reference), patch("sys.stdout"):
+            code = record_votd_calendar.main(["--days", "1-2", "--delay", "0", "--calendar", self.path])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(fetched), 1)
+        self.assertIn("day=2", fetched[0])
+        self.assertEqual(votd_calendar.VotdCalendar(self.path).get(2)["osis"], "PSA.23.1")
+
+
+class TestScraperUsesCalendar(unittest.TestCase):
+    NOW = datetime(2026, 8, 7, 10, 0, tzinfo=ZoneInfo("Asia/Taipei"))
+    DAY = 219
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "votd_calendar.json")
+        for target, name, value in (
+            (config, "HTTP_CACHE_MODE", "off"),
+            (config, "BIBLE_STORE_PATH", ""),
+            (config, "VOTD_CALENDAR_PATH", self.path),
+            (config, "VOTD_CALENDAR_REFRESH", False),
+        ):
+            patcher = patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.requested = []
+
+        def get(url, **kwargs):
+            self.requested.append(url)
+            if "verse-of-the-day" in url:
+                return FakeResponse(text=CURRENT_BIBLE_COM_HTML, url=url)
+            if "/compare/" in url:
+                return FakeResponse(text=COMPARE_WITH_TEXT_HTML, url=url)
+            return FakeResponse(status=503, url=url)
+
+        patcher = patch("scraper.http_client.get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_records_the_day(self):
+        result = scraper.get_daily_verse(now=self.NOW)
+
+        self.assertEqual(result["reference"], "約翰一書 4章16節")
+        entry = votd_calendar.VotdCalendar(self.path).get(self.DAY)
+        self.assertEqual((entry["reference"], entry["osis"]), ("1 John 4:16", "1JN.4.16"))
+
+    def test_hit_skips_reference_request(self):
+        votd_calendar.VotdCalendar(self.path).put(self.DAY, "1 John 4:16", "1JN.4.16", "https://img.test/1.jpg")
+
+        result = scraper.get_daily_verse(now=self.NOW)
+
+        self.assertEqual(result["reference"], "約翰一書 4章16節")
+        self.assertEqual(result["image_url"], "https://img.test/1.jpg")
+        self.assertFalse([url for url in self.requested if "verse-of-the-day" in url])
+
+    def test_hit_makes_no_bible_com_request_by_default(self):
+        votd_calendar.VotdCalendar(self.path).put(self.DAY, "1 John 4:16", "1JN.4.16")
+
+        with patch.dict(os.environ):
+            os.environ.pop("VOTD_CALENDAR_REFRESH", None)
+            default_refresh = config.Settings().VOTD_CALENDAR_REFRESH
+        self.assertFalse(default_refresh)
+        with patch.object(config, "VOTD_CALENDAR_REFRESH", default_refresh):
+            self.assertIsNotNone(scraper.get_daily_verse(now=self.NOW))
+
+        self.assertFalse([url for url in self.requested if "verse-of-the-day" in url])
+
+    def test_undated_page_is_never_recorded_for_another_date(self):
+        def get(url, **kwargs):
+            self.requested.append(url)
+            if "verse-of-the-day?day=" in url:
+                return FakeResponse(status=503, url=url)
+            return FakeResponse(text=CURRENT_BIBLE_COM_HTML, url=url)
+
+        with patch("scraper.http_client.get", side_effect=get), self.assertLogs(level="ERROR"):
+            self.assertIsNone(scraper.get_daily_verse(now=self.NOW))
+
+        self.assertFalse([url for url in self.requested if url.endswith("/verse-of-the-day")])
+        self.assertIsNone(votd_calendar.VotdCalendar(self.path).get(self.DAY))
+
+    def test_refresh_day_corrects_a_stale_entry_and_records_a_missing_one(self):
+        votd_calendar.VotdCalendar(self.path).put(self.DAY, "1 John 4:16", "1JN.4.15")
+
+        with self.assertLogs(level="WARNING"):
+            self.assertTrue(scraper.refresh_calendar_day(self.NOW))
+        self.assertEqual(votd_calendar.VotdCalendar(self.path).get(self.DAY)["osis"], "1JN.4.16")
+        self.assertFalse(scraper.refresh_calendar_day(self.NOW))
+
+        next_day = self.NOW + timedelta(days=1)
+        self.assertTrue(scraper.refresh_calendar_day(next_day))
+        self.assertEqual(votd_calendar.VotdCalendar(self.path).get(self.DAY + 1)["reference"], "1 John 4:16")
+        self.assertTrue(all("?day=" in url for url in self.requested if "verse-of-the-day" in url))
+
+    def test_background_refresh_corrects_stale_entry(self):
+        votd_calendar.VotdCalendar(self.path).put(self.DAY, "1 John 4:16", "1JN.4.15")
+        started = []
+        original_thread = threading.Thread
+
+        def thread(*args, **kwargs):
+            started.append(original_thread(*args, **kwargs))
+            return started[-1]
+
+        with patch.object(config, "VOTD_CALENDAR_REFRESH", True), \
+             patch.object(scraper.threading, "Thread", side_effect=thread), \
+             self.assertLogs(level="WARNING"):
+            result = scraper.get_daily_verse(now=self.NOW)
+            for refresh in started:
+                refresh.join(5)
+
+        self.assertIsNotNone(result)
+        self.assertEqual(votd_calendar.VotdCalendar(self.path).get(self.DAY)["osis"], "1JN.4.16")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Lightweight timing spans and a machine-readable run report."""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+
+_lock = threading.Lock()
+_finished_spans = []
+_current_span = contextvars.ContextVar("current_span", default=None)
+_run_started = time.perf_counter()
+
+
+class Span:
+    """One timed operation. Callers may update retries, bytes and attributes while it is open."""
+
+    def __init__(self, name: str, parent=None, **attributes):
+        self.name = name
+        self.parent = parent.name if parent else None
+        self.attributes = attributes
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.status = "ok"
+        self.error = None
+        self.thread = threading.current_thread().name
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def add_response(self, response) -> None:
+        """Count a requests-style response body towards bytes_in."""
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            self.bytes_in += len(content)
+        else:
+            self.bytes_in += len((getattr(response, "text", "") or "").encode("utf-8"))
+
+    def finish(self, error: BaseException = None) -> None:
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "parent": self.parent,
+            "start_ms": round((self._start - _run_started) * 1000, 3),
+            "duration_ms": self.duration_ms,
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+            "attributes": self.attributes,
+        }
+
+
+class span:
+    """Context manager recording a Span: ``with span("scraper.http", url=url) as s: ...``."""
+
+    def __init__(self, name: str, **attributes):
+        self._span = Span(name, parent=_current_span.get(), **attributes)
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_span.reset(self._token)
+        self._span.finish(exc_value)
+        with _lock:
+            _finished_spans.append(self._span)
+        return False
+
+
+def traced(name: str):
+    """Decorator form of span for functions that do not need to annotate the span."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    return _current_span.get()
+
+
+def finished_spans() -> list:
+    with _lock:
+        return list(_finished_spans)
+
+
+def reset() -> None:
+    """Forget recorded spans and restart the run clock."""
+    global _run_started
+    with _lock:
+        _finished_spans.clear()
+        _run_started = time.perf_counter()
+
+
+def build_report() -> dict:
+    spans = [recorded.to_dict() for recorded in finished_spans()]
+    summary = {}
+    for recorded in spans:
+        entry = summary.setdefault(
+            recorded["name"],
+            {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "retries": 0, "bytes_in": 0, "bytes_out": 0, "errors": 0},
+        )
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + recorded["duration_ms"], 3)
+        entry["max_ms"] = max(entry["max_ms"], recorded["duration_ms"])
+        entry["retries"] += recorded["retries"]
+        entry["bytes_in"] += recorded["bytes_in"]
+        entry["bytes_out"] += recorded["bytes_out"]
+        entry["errors"] += recorded["status"] == "error"
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "wall_clock_ms": round((time.perf_counter() - _run_started) * 1000, 3),
+        "summary": summary,
+        "spans": sorted(spans, key=lambda recorded: recorded["start_ms"]),
+    }
+
+
+def write_report(path: str) -> dict:
+    """Write the JSON timing report for every span recorded since the last reset."""
+    report = build_report()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as report_file:
+        json.dump(report, report_file, ensure_ascii=False, indent=2)
+    logging.info("Run timing report written to %s (%d spans)", path, len(report["spans"]))
+    return report
@@ -0,0 +1,120 @@
+"""
+Timed transcripts captured while Edge TTS synthesizes.
+
+Edge TTS sends a WordBoundary event (offset and duration in 100 ns ticks)
+for every word it speaks. ``audio_gen`` keeps them next to the MP3 it writes
+as ``<audio>.words.json``:
+
+    {"text": spoken text,
+     "duration_ms": audio length,
+     "words": [[offset_ms, duration_ms, char_pos, word], ...],
+     "segments": [{"start_ms": ..., "start_char": ..., "sha256": ...}, ...]}
+
+``char_pos`` indexes ``text``, so a position in the script maps to a time in
+the audio without transcribing it again. ``merge`` shifts the transcripts of
+joined MP3 files onto one timeline; ``segments`` records where each joined
+piece starts.
+"""
+
+import json
+import logging
+import os
+
+
+SUFFIX = ".words.json"
+TICKS_PER_MS = 10_000
+
+
+def path_for(audio_path: str) -> str:
+    return f"{audio_path}{SUFFIX}"
+
+
+def locate_words(text: str, words) -> list:
+    """``[[offset_ms, duration_ms, char_pos, word], ...]`` from ``(offset_ticks, duration_ticks, word)`` events."""
+    located = []
+    position = 0
+    for offset, duration, word in words:
+        found = text.find(word, position) if word else -1
+        if found >= 0:
+            position = found + len(word)
+        located.append([offset / TICKS_PER_MS, duration / TICKS_PER_MS, found if found >= 0 else position, word])
+    return located
+
+
+def build(text: str, duration_ms: float, words, sha256: str = "") -> dict:
+    return {
+        "text": text,
+        "duration_ms": duration_ms,
+        "words": locate_words(text, words),
+        "segments": [{"start_ms": 0.0, "start_char": 0, "sha256": sha256}],
+    }
+
+
+def load(audio_path: str):
+    """The transcript stored next to ``audio_path``, or None."""
+    try:
+        with open(path_for(audio_path), "r", encoding="utf-8") as transcript_file:
+            return json.load(transcript_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        logging.warning("Ignoring unreadable transcript for %s: %s", audio_path, error)
+        return None
+
+
+def save(audio_path: str, transcript: dict) -> bool:
+    path = path_for(audio_path)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as transcript_file:
+            json.dump(transcript, transcript_file, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as error:
+        logging.warning("Could not write transcript %s: %s", path, error)
+        return False
+    return True
+
+
+def remove(audio_path: str) -> None:
+    try:
+        os.remove(path_for(audio_path))
+    except OSError:
+        pass
+
+
+def merge(parts) -> dict:
+    """
+    One transcript for MP3 pieces played back to back.
+
+    ``parts`` is ``[(transcript or None, duration_ms), ...]``; a piece
+    without a transcript still moves the timeline by its duration.
+    """
+    merged = {"text": "", "duration_ms": 0.0, "words": [], "segments": []}
+    for transcript, duration_ms in parts:
+        if merged["text"]:
+            merged["text"] += "\n"
+        start_ms = merged["duration_ms"]
+        start_char = len(merged["text"])
+        if transcript is None:
+            merged["segments"].append({"start_ms": start_ms, "start_char": start_char, "sha256": ""})
+            merged["duration_ms"] += duration_ms
+            continue
+        merged["text"] += transcript["text"]
+        merged["words"].extend(
+            [offset + start_ms, duration, char_pos + start_char, word]
+            for offset, duration, char_pos, word in transcript["words"]
+        )
+        merged["segments"].extend(
+            dict(segment, start_ms=segment["start_ms"] + start_ms, start_char=segment["start_char"] + start_char)
+            for segment in transcript["segments"]
+        )
+        merged["duration_ms"] += transcript["duration_ms"]
+    return merged
+
+
+def offset_at(transcript: dict, char_pos: int):
+    """Milliseconds at which the first word at or after ``char_pos`` is spoken, or None."""
+    for offset, _, word_pos, _ in transcript["words"]:
+        if word_pos >= char_pos:
+            return offset
+    return None
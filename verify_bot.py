@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import bot
+import config
 
 class TestDailyBibleBot(unittest.TestCase):
 
@@ -10,16 +11,18 @@ class TestDailyBibleBot(unittest.TestCase):
     @patch('bot.broadcast_message')
     @patch('bot.send_web_push_notifications')
     @patch('bot.save_to_supabase')
+    @patch('bot.concatenate_audio', side_effect=lambda paths, output_path: output_path)
     @patch('bot.upload_audio_to_r2')
     @patch('bot.os.path.getsize')
-    @patch('pydub.AudioSegment.from_mp3')
-    @patch('bot.TELEGRAM_CHAT_IDS', [])
-    @patch('bot.DRY_RUN', False)
+    @patch('mp3_frames.probe')
+    @patch("config.TELEGRAM_CHAT_IDS", [])
+    @patch("config.DRY_RUN", False)
     def test_full_flow(
         self,
-        mock_audio_segment,
+        mock_probe,
         mock_getsize,
         mock_upload_r2,
+        mock_concatenate,
         mock_save,
         mock_web_push,
         mock_broadcast,
@@ -41,9 +44,7 @@ class TestDailyBibleBot(unittest.TestCase):
         mock_save.return_value = "record-id"
         
         # Mock Audio Duration
-        mock_audio_obj = MagicMock()
-        mock_audio_obj.__len__.return_value = 60000 # 60 seconds
-        mock_audio_segment.return_value = mock_audio_obj
+        mock_probe.return_value = MagicMock(duration_ms=60000.0)  # 60 seconds
 
         # Run the daily task
         bot.run_daily_task()
@@ -54,8 +55,9 @@ class TestDailyBibleBot(unittest.TestCase):
         # Verify Content Generation called
         mock_content.assert_called_once()
 
-        # Verify Audio Generation called
-        mock_audio.assert_called_once()
+        # Verify preamble and exposition audio generated, then joined
+        self.assertEqual(mock_audio.call_count, 2)
+        mock_concatenate.assert_called_once()
         
         # Verify R2 upload and Supabase metadata save
         mock_upload_r2.assert_called_once()
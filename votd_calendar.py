@@ -0,0 +1,75 @@
+"""
+Day-of-year index of Bible.com's verse of the day.
+
+Bible.com keys the verse of the day by ``?day=N``, so the reference for a
+given day is stable and can be looked up without a request. The index is a
+small JSON file of ``day → reference, OSIS, image`` filled by
+``record_votd_calendar.py`` and by every successful scrape.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import config
+
+
+_write_lock = threading.Lock()
+
+
+class VotdCalendar:
+    """Read and update the index at ``path``; a missing or unreadable file is an empty index."""
+
+    def __init__(self, path: str = None):
+        self.path = config.VOTD_CALENDAR_PATH if path is None else path
+        self._days = self._read() if self.path else {}
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as calendar_file:
+                return json.load(calendar_file).get("days", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as error:
+            logging.warning("Ignoring unreadable verse-of-the-day calendar %s: %s", self.path, error)
+            return {}
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def get(self, day_of_year: int):
+        """``{"reference": "Ephesians 3:20-21", "osis": "EPH.3.20-21", "image_url": ..., "recorded": ...}`` or None."""
+        entry = self._days.get(str(day_of_year))
+        return entry if entry and entry.get("reference") else None
+
+    def put(self, day_of_year: int, reference: str, osis: str = "", image_url: str = None) -> bool:
+        """Record a day; returns True when the index changed and was written."""
+        if not self.path or not reference:
+            return False
+        entry = {"reference": reference, "osis": osis or "", "image_url": image_url}
+        with _write_lock:
+            # Merge with the file as it is now: other runs and threads may have added days.
+            self._days = self._read()
+            current = self._days.get(str(day_of_year))
+            if current and {key: current.get(key) for key in entry} == entry:
+                return False
+            entry["recorded"] = datetime.now(ZoneInfo("Asia/Taipei")).strftime("%Y-%m-%d")
+            self._days[str(day_of_year)] = entry
+            try:
+                self._write()
+            except OSError as error:
+                logging.warning("Could not write verse-of-the-day calendar %s: %s", self.path, error)
+                return False
+        return True
+
+    def _write(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        ordered = {day: self._days[day] for day in sorted(self._days, key=int)}
+        temp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as calendar_file:
+            json.dump({"version": 1, "days": ordered}, calendar_file, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, self.path)